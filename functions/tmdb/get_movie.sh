@@ -12,9 +12,16 @@ tmdb_id="$1"
 access_token="$2"
 
 response_file=$(mktemp)
-http_code=$(curl -s -w "%{http_code}" -o "$response_file" --request GET \
-     --url "https://api.themoviedb.org/3/movie/$tmdb_id" \
-     --header "Authorization: Bearer $access_token")
+# Go through the shared response cache (scripts/http_cache.py) when Python with requests is available
+http_cache_script="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../../scripts/http_cache.py"
+if [[ -f "$http_cache_script" ]] && python3 -c 'import requests' 2>/dev/null; then
+    http_code=$(python3 "$http_cache_script" fetch -o "$response_file" "https://api.themoviedb.org/3/movie/$tmdb_id" \
+         --header "Authorization: Bearer $access_token")
+else
+    http_code=$(curl -s -w "%{http_code}" -o "$response_file" --request GET \
+         --url "https://api.themoviedb.org/3/movie/$tmdb_id" \
+         --header "Authorization: Bearer $access_token")
+fi
 
 if [[ "$http_code" -ge 200 && "$http_code" -lt 300 ]]; then
     jq . < "$response_file"
@@ -4,6 +4,8 @@
 # Usage: download_tpdb_image.sh <url|tpdb_id> <collection_id> <output_directory>
 # Example: download_tpdb_image.sh 123456
 #          download_tpdb_image.sh https://theposterdb.com/api/assets/123456
+# To mirror every poster referenced by the metadata and config files at once,
+# use scripts/mirror_posters.py.
 
 if [ "$#" -ne 3 ]; then
     echo "Usage: $0 <url|tpdb_id> <collection_id> <output_directory>"
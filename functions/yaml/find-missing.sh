@@ -15,6 +15,13 @@ type="$2"
 movie_file="$3"
 show_file="$4"
 
+# Answer from the persistent field index (scripts/metadata_field_index.py) when Python
+# with PyYAML is available, it parses each metadata file once instead of once per query
+index_script="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../../scripts/metadata_field_index.py"
+if [[ -f "$index_script" ]] && python3 -c 'import yaml' 2>/dev/null; then
+    exec python3 "$index_script" find-missing -- "$@"
+fi
+
 # Sanitize key and value to remove dangerous characters
 key=$(echo "$key" | tr -cd '[:alnum:]_.')
 value=$(echo "$value" | tr -cd '[:alnum:] ._-')
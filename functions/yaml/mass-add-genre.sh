@@ -14,6 +14,13 @@ EOF
 script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 repo_root="$(cd "$script_dir/../.." && pwd)"
 
+# Use the concurrent, rate limited runner (scripts/mass_add_genre.py) when Python with PyYAML
+# and requests is available, it takes the same options and writes each metadata file once
+genre_runner_script="$repo_root/scripts/mass_add_genre.py"
+if [[ -f "$genre_runner_script" ]] && python3 -c 'import yaml, requests' 2>/dev/null; then
+    exec python3 "$genre_runner_script" "$@"
+fi
+
 genre=""
 type="all"
 env_file="$repo_root/.env"
@@ -168,10 +175,36 @@ update_genre_sync() {
     yq eval -i ".metadata.${media_id}.\"genre.sync\" = ((.metadata.${media_id}.\"genre.sync\" // []) + [\"${genre}\"] | unique | sort)" "$metadata_file"
 }
 
+# Read single entries through the offset index (scripts/metadata_offset_index.py) when Python
+# with PyYAML is available, it only parses the entry's own block instead of the whole file
+offset_index_script="$repo_root/scripts/metadata_offset_index.py"
+if [[ -f "$offset_index_script" ]] && python3 -c 'import yaml' 2>/dev/null; then
+    use_offset_index=true
+else
+    use_offset_index=false
+fi
+
+get_label_title() {
+    local metadata_file="$1"
+    local media_id="$2"
+
+    if [[ "$use_offset_index" == true ]]; then
+        python3 "$offset_index_script" get "$metadata_file" "$media_id" label_title
+    else
+        yq eval ".metadata.${media_id}.label_title" "$metadata_file"
+    fi
+}
+
 has_genre_locally() {
     local metadata_file="$1"
     local media_id="$2"
 
+    if [[ "$use_offset_index" == true ]]; then
+        python3 "$offset_index_script" get --json "$metadata_file" "$media_id" genre.sync \
+            | jq -e --arg genre "$genre_lookup" '(. // []) | any(ascii_downcase == $genre)' >/dev/null 2>&1
+        return
+    fi
+
     yq eval -e ".metadata.${media_id}.\"genre.sync\" // [] | any((. | downcase) == \"${genre_lookup}\")" "$metadata_file" >/dev/null 2>&1
 }
 
@@ -209,7 +242,7 @@ process_items() {
         fi
 
         processed=$((processed + 1))
-        label_title="$(yq eval ".metadata.${media_id}.label_title" "$metadata_file")"
+        label_title="$(get_label_title "$metadata_file" "$media_id")"
         echo "[${processed}] ${media_type} ${media_id}: ${label_title}"
 
         if has_genre_locally "$metadata_file" "$media_id"; then
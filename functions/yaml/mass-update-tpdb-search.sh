@@ -45,6 +45,38 @@ if [ ! -f "$get_tpdb_search_script" ]; then
     exit 1
 fi
 
+# Read and update single entries through the offset index (scripts/metadata_offset_index.py)
+# when Python with PyYAML is available, it only parses the entry's own block instead of the whole file
+offset_index_script="$script_dir/../../scripts/metadata_offset_index.py"
+if [[ -f "$offset_index_script" ]] && python3 -c 'import yaml' 2>/dev/null; then
+    use_offset_index=true
+else
+    use_offset_index=false
+fi
+
+get_field() {
+    local media_id="$1"
+    local field="$2"
+
+    if [[ "$use_offset_index" == true ]]; then
+        python3 "$offset_index_script" get "$metadata_file" "$media_id" "$field"
+    else
+        yq eval ".metadata.$media_id.$field" "$metadata_file"
+    fi
+}
+
+set_field() {
+    local media_id="$1"
+    local field="$2"
+    local value="$3"
+
+    if [[ "$use_offset_index" == true ]]; then
+        python3 "$offset_index_script" set "$metadata_file" "$media_id" "$field" "$value"
+    else
+        yq eval -i ".metadata.$media_id.$field = \"$value\"" "$metadata_file"
+    fi
+}
+
 # Extract all media IDs from the metadata file
 echo "Extracting ${type} IDs from $metadata_file..."
 media_ids=$(yq eval '.metadata | keys | .[]' "$metadata_file")
@@ -75,7 +107,7 @@ while IFS= read -r media_id; do
     fi
     
     # Get current label_title
-    label_title=$(yq eval ".metadata.$media_id.label_title" "$metadata_file")
+    label_title=$(get_field "$media_id" label_title)
     
     if [ -z "$label_title" ] || [ "$label_title" == "null" ]; then
         echo "  Error: No label_title found for ID $media_id"
@@ -91,7 +123,7 @@ while IFS= read -r media_id; do
     
     if [ $? -eq 0 ] && [ -n "$new_tpdb_search" ]; then
         # Get current tpdb_search
-        current_tpdb_search=$(yq eval ".metadata.$media_id.tpdb_search" "$metadata_file")
+        current_tpdb_search=$(get_field "$media_id" tpdb_search)
         
         if [ "$current_tpdb_search" != "$new_tpdb_search" ]; then
             echo "  Updating tpdb_search:"
@@ -99,7 +131,7 @@ while IFS= read -r media_id; do
             echo "    New: '$new_tpdb_search'"
             
             # Update the tpdb_search field
-            yq eval -i ".metadata.$media_id.tpdb_search = \"$new_tpdb_search\"" "$metadata_file"
+            set_field "$media_id" tpdb_search "$new_tpdb_search"
             updated=$((updated + 1))
         else
             echo "  TPDB search already correct"
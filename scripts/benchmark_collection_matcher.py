@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark the indexed collection matcher against comparing all pairs.
+
+This script builds synthetic Plex and TMDB collection lists (TMDB names with
+"Collection" suffixes, Plex names with accents, punctuation and small edits)
+and times CollectionMatcher from collection_matcher.py against scoring every
+Plex name against every TMDB name, checking that both find the same closest
+name with the same score for every Plex name that has one at or above the
+threshold.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from collection_matcher import (
+    MATCH_THRESHOLD, NEAR_MATCH_THRESHOLD, CollectionMatcher, get_ngrams, get_numbers, get_similarity,
+    normalize_collection_name
+)
+
+
+WORDS = (
+    "alien", "batman", "blade", "bourne", "cars", "dark", "die", "dragon", "dune", "evil", "fast",
+    "final", "furious", "ghost", "godfather", "hard", "harry", "hunger", "ice", "jaws", "john",
+    "jurassic", "kill", "kung", "lord", "mad", "matrix", "max", "mission", "night", "ocean",
+    "pirates", "planet", "potter", "predator", "rambo", "rings", "rocky", "saw", "scream", "shrek",
+    "spider", "star", "story", "terminator", "toy", "trek", "wars", "wick", "world", "x", "zombie",
+    "amélie", "léon", "élite", "señor", "über",
+)
+
+
+def build_synthetic_names(count: int, seed: int) -> tuple:
+    """
+    Build synthetic TMDB and Plex collection names.
+    
+    Args:
+        count: Number of names on each side
+        seed: Random seed so runs are repeatable
+    
+    Returns:
+        Tuple of (tmdb_names, plex_names)
+    """
+    rng = random.Random(seed)
+    tmdb_names = set()
+    while len(tmdb_names) < count:
+        words = [rng.choice(WORDS).title() for _ in range(rng.randint(1, 4))]
+        if rng.random() < 0.2:
+            words.insert(0, "The")
+        suffix = rng.choice((" Collection", " - Collection", " Trilogy", " Saga", ""))
+        tmdb_names.add(' '.join(words) + suffix)
+    tmdb_names = sorted(tmdb_names)
+    
+    plex_names = []
+    for name in rng.sample(tmdb_names, count):
+        for suffix in (" - Collection", " Collection", " Trilogy", " Saga"):
+            name = name.removesuffix(suffix)
+        roll = rng.random()
+        if roll < 0.2:
+            name = name.replace(' ', ': ', 1)
+        elif roll < 0.3:
+            name = name.lower()
+        elif roll < 0.4 and len(name) > 6:
+            # A typo or a missing letter
+            i = rng.randrange(1, len(name) - 1)
+            name = name[:i] + name[i + 1:]
+        elif roll < 0.6:
+            # Unrelated names that should stay unmatched
+            name = f"{rng.choice(WORDS).title()} {rng.randint(1000, 9999)}"
+        plex_names.append(name)
+    return tmdb_names, plex_names
+
+
+def match_all_pairs(plex_names: list, tmdb_names: list, threshold: float) -> dict:
+    """
+    Score every Plex name against every TMDB name.
+    
+    Args:
+        plex_names: Names to look up
+        tmdb_names: Names to match them against
+        threshold: Lowest score worth returning
+    
+    Returns:
+        Dictionary of name -> (closest name or None, score)
+    """
+    normalized = [normalize_collection_name(name) for name in tmdb_names]
+    exact = {}
+    for i, text in enumerate(normalized):
+        exact.setdefault(text, i)
+    ngrams = [get_ngrams(text) for text in normalized]
+    numbers = [get_numbers(text) for text in normalized]
+    
+    matches = {}
+    for name in plex_names:
+        text = normalize_collection_name(name)
+        if text in exact:
+            matches[name] = (tmdb_names[exact[text]], 1.0)
+            continue
+        name_ngrams = get_ngrams(text)
+        name_numbers = get_numbers(text)
+        best_name, best_score = None, 0.0
+        for i, other_ngrams in enumerate(ngrams):
+            if numbers[i] != name_numbers:
+                continue
+            score = get_similarity(name_ngrams, other_ngrams)
+            if score > best_score:
+                best_name, best_score = tmdb_names[i], score
+        matches[name] = (best_name, best_score) if best_score >= threshold else (None, 0.0)
+    return matches
+
+
+def match_indexed(plex_names: list, tmdb_names: list, threshold: float) -> dict:
+    """
+    Match through the n-gram index of CollectionMatcher.
+    
+    Args:
+        plex_names: Names to look up
+        tmdb_names: Names to match them against
+        threshold: Lowest score worth returning
+    
+    Returns:
+        Dictionary of name -> (closest name or None, score)
+    """
+    matcher = CollectionMatcher(tmdb_names)
+    return {name: matcher.match(name, threshold) for name in plex_names}
+
+
+def time_path(match, plex_names: list, tmdb_names: list, threshold: float, repeat: int) -> tuple:
+    """
+    Time a matching function.
+    
+    Args:
+        match: Matching function to time
+        plex_names: Names to look up
+        tmdb_names: Names to match them against
+        threshold: Lowest score worth returning
+        repeat: Number of timed passes (the best one is reported)
+    
+    Returns:
+        Tuple of (best_seconds, matches)
+    """
+    best = None
+    matches = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = match(plex_names, tmdb_names, threshold)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, matches
+
+
+def get_decision(match: tuple):
+    """Closest name if it counts as a match, None otherwise."""
+    return match[0] if match[1] >= MATCH_THRESHOLD else None
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the indexed collection matcher against comparing all pairs"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=3000,
+        help="Number of synthetic collections on each side (default: 3000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed passes per path, best is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=NEAR_MATCH_THRESHOLD,
+        help=f"Lowest score worth returning, as in the missing poster report (default: {NEAR_MATCH_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the synthetic collections (default: 0)"
+    )
+    
+    args = parser.parse_args()
+    
+    tmdb_names, plex_names = build_synthetic_names(args.count, args.seed)
+    print(f"Benchmarking {len(plex_names)} Plex against {len(tmdb_names)} TMDB collections (best of {args.repeat})")
+    
+    pairs_seconds, pairs_matches = time_path(match_all_pairs, plex_names, tmdb_names, args.threshold, args.repeat)
+    indexed_seconds, indexed_matches = time_path(match_indexed, plex_names, tmdb_names, args.threshold, args.repeat)
+    
+    matched = sum(1 for match in indexed_matches.values() if get_decision(match) is not None)
+    print(f"  All pairs:  {pairs_seconds:.3f}s")
+    print(f"  Indexed:    {indexed_seconds:.3f}s")
+    print(f"  Speedup:    {pairs_seconds / indexed_seconds:.2f}x")
+    print(f"  Matched:    {matched}/{len(plex_names)} at a score of {MATCH_THRESHOLD}")
+    
+    mismatches = sum(1 for name in plex_names if pairs_matches[name] != indexed_matches[name])
+    if mismatches:
+        print(f"\nError: {mismatches} name(s) matched differently by the two paths", file=sys.stderr)
+        sys.exit(1)
+    print("\n✓ Both paths found the same closest names and scores")
+
+
+if __name__ == "__main__":
+    main()
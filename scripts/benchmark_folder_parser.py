@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark the media folder name parsing of kometa-post-metadata-info.py.
+
+This script generates synthetic movie, show and season folder names following
+the TRaSH guides naming schemes and times the legacy parsing (a regex search
+for the id, get_media_info() with its replace passes and the repeated lower()
+season checks) against the compiled single-pass parse_media_folder() and
+parse_season_folder(), checking that both extract the same information.
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+
+EXTRA_TAG_PATTERN = re.compile(r'\{(?:imdb|edition)-[^}]*\}')
+TITLE_WORDS = ['The', 'Last', 'Star', 'Night', 'Blade', 'Runner', 'Return', 'King', 'Lost', 'City', 'Dark', 'Knight', 'Love', 'War']
+EDITIONS = ['Extended', "Director's Cut", 'Theatrical', 'IMAX', 'Ultimate Cut']
+
+
+def load_client():
+    """
+    Load kometa-post-metadata-info.py as a module (its file name isn't importable).
+    
+    Returns:
+        The loaded client module
+    """
+    client_path = Path(__file__).resolve().parent / 'kometa-post-metadata-info.py'
+    spec = importlib.util.spec_from_file_location('kometa_post_metadata_info', client_path)
+    client = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(client)
+    return client
+
+
+def legacy_get_media_info(folder: str, match: re.Match) -> tuple:
+    """
+    Original get_media_info(): five replace calls for the id, a second regex for the year, then more replace passes.
+    
+    Args:
+        folder: Folder name
+        match: Match of the {tmdb-}/{tvdb-} tag in the folder name
+    
+    Returns:
+        Tuple of (db_id, title, release_year)
+    """
+    db_id_str       = match.group(0)
+    db_id_str       = db_id_str.replace('{tmdb-', '')
+    db_id_str       = db_id_str.replace('{tvdb-', '')
+    db_id_str       = db_id_str.replace('}', '')
+    db_id           = int(db_id_str)
+    year_match      = re.search(r'\([0-9]{4}\)', folder)
+    year            = year_match.group(0) if year_match is not None else '(Unknown)'
+    release_year    = year.replace('(', '').replace(')', '')
+    title           = folder.replace(match.group(0), '').replace(year, '').strip()
+    title           = title.replace('(', '').replace(')', '').replace('\'', '')
+    return db_id, title, release_year
+
+
+def legacy_parse_folder(folder: str):
+    """
+    Original per-folder parsing in the client's scan loops.
+    
+    Args:
+        folder: Folder name
+    
+    Returns:
+        Tuple of (db_id, title, release_year), or None if the folder has no id
+    """
+    db_match = re.search(r'{t[vm]db-[0-9]+}', folder)
+    if db_match:
+        return legacy_get_media_info(folder, db_match)
+    return None
+
+
+def legacy_parse_season(folder: str):
+    """
+    Original season folder check, lower-casing the name up to three times.
+    
+    Args:
+        folder: Folder name inside a show folder
+    
+    Returns:
+        Season number, or None if the folder isn't a season folder
+    """
+    season_num = -1
+    if folder.lower().startswith('season '):
+        season_num = int(folder.lower().replace('season ', ''))
+    elif folder.lower() == 'specials':
+        season_num = 0
+    return season_num if season_num != -1 else None
+
+
+def build_folder_names(count: int, seed: int) -> tuple:
+    """
+    Build synthetic media and season folder names.
+    
+    Args:
+        count: Number of media folder names to generate
+        seed: Random seed so runs are repeatable
+    
+    Returns:
+        Tuple of (media_folder_names, season_folder_names)
+    """
+    rng = random.Random(seed)
+    media_names = []
+    for index in range(count):
+        title = ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 4)))
+        roll = rng.random()
+        if roll < 0.1:
+            title = f"{title}'s {rng.choice(TITLE_WORDS)}"
+        elif roll < 0.13:
+            title = f"{title} (Part {rng.randint(1, 3)})"
+        name = title
+        if rng.random() < 0.9:
+            name = f"{name} ({rng.randint(1950, 2025)})"
+        
+        if rng.random() < 0.5:
+            if rng.random() < 0.15:
+                name = f"{name} {{imdb-tt{rng.randint(100000, 9999999)}}}"
+            if rng.random() < 0.95:
+                name = f"{name} {{tmdb-{index + 1}}}"
+            if rng.random() < 0.05:
+                name = f"{name} {{edition-{rng.choice(EDITIONS)}}}"
+        elif rng.random() < 0.95:
+            name = f"{name} {{tvdb-{index + 1}}}"
+        media_names.append(name)
+    
+    season_names = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.8:
+            season_names.append(f"{rng.choice(['Season', 'season'])} {rng.randint(1, 30):02d}")
+        elif roll < 0.9:
+            season_names.append(rng.choice(['Specials', 'specials']))
+        else:
+            season_names.append(rng.choice(['Extras', 'Featurettes', 'Behind The Scenes']))
+    return media_names, season_names
+
+
+def time_parser(parse, names: list, repeat: int) -> tuple:
+    """
+    Time a parser over every folder name.
+    
+    Args:
+        parse: Parsing function taking a folder name
+        names: Folder names from build_folder_names()
+        repeat: Number of timed passes (the best one is reported)
+    
+    Returns:
+        Tuple of (best_seconds, parsed_values)
+    """
+    best = None
+    parsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = [parse(name) for name in names]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, parsed
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark legacy and single-pass media folder name parsing"
+    )
+    parser.add_argument(
+        "--names",
+        type=int,
+        default=100000,
+        help="Number of synthetic media and season folder names (default: 100000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timed passes per parser, best is reported (default: 5)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the synthetic folder names (default: 0)"
+    )
+    
+    args = parser.parse_args()
+    
+    client = load_client()
+    media_names, season_names = build_folder_names(args.names, args.seed)
+    print(f"Benchmarking {len(media_names)} media and {len(season_names)} season folder names (best of {args.repeat})")
+    
+    legacy_seconds, legacy_values = time_parser(legacy_parse_folder, media_names, args.repeat)
+    parser_seconds, parsed_media = time_parser(client.parse_media_folder, media_names, args.repeat)
+    parser_values = [(media['db_id'], media['title'], media['release_year']) if media else None
+                     for media in parsed_media]
+    legacy_season_seconds, legacy_seasons = time_parser(legacy_parse_season, season_names, args.repeat)
+    parser_season_seconds, parser_seasons = time_parser(client.parse_season_folder, season_names, args.repeat)
+    
+    print(f"  Media folders, legacy:       {legacy_seconds:.3f}s ({legacy_seconds / len(media_names) * 1e6:.2f}µs/name)")
+    print(f"  Media folders, single-pass:  {parser_seconds:.3f}s ({parser_seconds / len(media_names) * 1e6:.2f}µs/name)")
+    print(f"  Speedup:                     {legacy_seconds / parser_seconds:.2f}x")
+    print(f"  Season folders, legacy:      {legacy_season_seconds:.3f}s")
+    print(f"  Season folders, single-pass: {parser_season_seconds:.3f}s")
+    print(f"  Speedup:                     {legacy_season_seconds / parser_season_seconds:.2f}x")
+    
+    # The legacy parser left {imdb-} and {edition-} tags in the title, the new one strips them
+    mismatches = 0
+    tagged = 0
+    for name, old, new in zip(media_names, legacy_values, parser_values):
+        if old is not None and EXTRA_TAG_PATTERN.search(name):
+            tagged += 1
+            old = (old[0], EXTRA_TAG_PATTERN.sub('', old[1]).strip(), old[2])
+        if old != new:
+            mismatches += 1
+    mismatches += sum(1 for old, new in zip(legacy_seasons, parser_seasons) if old != new)
+    if mismatches:
+        print(f"\nError: {mismatches} folder name(s) parsed differently", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n✓ Both parsers extracted the same information ({tagged} titles had {{imdb-}}/{{edition-}} tags the legacy parser left in)")
+
+
+if __name__ == "__main__":
+    main()
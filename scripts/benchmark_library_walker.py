@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark the media library walk of kometa-post-metadata-info.py.
+
+This script builds a synthetic movie and show library in a temporary directory
+(or uses existing roots given with --movie-dir/--show-dir) and times the legacy
+os.listdir()/os.path.isdir() walk, which lists season folders one show at a time,
+against the scandir-based walker with concurrent season scans, checking that
+both produce the same post data.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_folder_parser import legacy_get_media_info, legacy_parse_season, load_client
+
+
+def legacy_folder_iterator(root_dir):
+    """
+    Original folder_iterator(): os.listdir() plus one os.path.isdir() stat per entry.
+    
+    Args:
+        root_dir: Directory to list
+    
+    Yields:
+        Names of the sub-directories of root_dir
+    """
+    for file in os.listdir(root_dir):
+        if os.path.isdir(f'{root_dir}/{file}'):
+            yield file
+
+
+def legacy_scan(movie_dir: str, show_dir: str) -> dict:
+    """
+    Original module-level walk, listing each show's season folders in turn.
+    
+    Args:
+        movie_dir: Movies root directory
+        show_dir: Shows root directory
+    
+    Returns:
+        Post data dictionary with 'movies' and 'shows' lists
+    """
+    post_data = {
+        'movies': list(),
+        'shows': list()
+    }
+    for folder_name in legacy_folder_iterator(movie_dir):
+        db_match = re.search(r'{t[vm]db-[0-9]+}', folder_name)
+        if db_match:
+            db_id, title, release_year = legacy_get_media_info(folder_name, db_match)
+            post_data['movies'].append({
+                'title': title,
+                'release_year': release_year,
+                'db_id': db_id
+            })
+    for folder_name in legacy_folder_iterator(show_dir):
+        db_match = re.search(r'{t[vm]db-[0-9]+}', folder_name)
+        if db_match:
+            db_id, title, release_year = legacy_get_media_info(folder_name, db_match)
+            show_dict = {
+                'title': title,
+                'release_year': release_year,
+                'db_id': db_id,
+                'seasons': list()
+            }
+            for inner_folder in legacy_folder_iterator(f'{show_dir}/{folder_name}'):
+                season_num = legacy_parse_season(inner_folder)
+                if season_num is not None:
+                    show_dict['seasons'].append({"number": season_num})
+            post_data['shows'].append(show_dict)
+    return post_data
+
+
+def build_synthetic_library(root: Path, movie_count: int, show_count: int, seed: int) -> tuple:
+    """
+    Build a synthetic library named after the TRaSH guides naming scheme.
+    
+    Args:
+        root: Directory to create the library in
+        movie_count: Number of movie folders
+        show_count: Number of show folders
+        seed: Random seed so runs are repeatable
+    
+    Returns:
+        Tuple of (movie_dir, show_dir) paths as strings
+    """
+    rng = random.Random(seed)
+    movie_dir = root / 'movies'
+    show_dir = root / 'shows'
+    for index in range(movie_count):
+        movie = movie_dir / f"Movie {index} ({rng.randint(1950, 2025)}) {{tmdb-{100000 + index}}}"
+        movie.mkdir(parents=True)
+        (movie / f"Movie {index}.mkv").touch()
+    for index in range(show_count):
+        show = show_dir / f"Show {index} ({rng.randint(1950, 2025)}) {{tvdb-{300000 + index}}}"
+        show.mkdir(parents=True)
+        for season_num in range(1, rng.randint(1, 12) + 1):
+            (show / f"Season {season_num:02d}").mkdir()
+        if rng.random() < 0.3:
+            (show / 'Specials').mkdir()
+        (show / 'tvshow.nfo').touch()
+    return str(movie_dir), str(show_dir)
+
+
+def time_scan(scan, repeat: int) -> tuple:
+    """
+    Time a library scan.
+    
+    Args:
+        scan: Function taking no arguments that returns the post data
+        repeat: Number of timed passes (the best one is reported)
+    
+    Returns:
+        Tuple of (best_seconds, post_data)
+    """
+    best = None
+    post_data = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        post_data = scan()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, post_data
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the legacy and scandir-based media library walks"
+    )
+    parser.add_argument(
+        "--movies",
+        type=int,
+        default=5000,
+        help="Number of synthetic movie folders (default: 5000)"
+    )
+    parser.add_argument(
+        "--shows",
+        type=int,
+        default=2000,
+        help="Number of synthetic show folders (default: 2000)"
+    )
+    parser.add_argument(
+        "--movie-dir",
+        help="Benchmark an existing movies root instead of a synthetic library (requires --show-dir)"
+    )
+    parser.add_argument(
+        "--show-dir",
+        help="Benchmark an existing shows root instead of a synthetic library (requires --movie-dir)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=16,
+        help="Number of threads scanning season folders (default: 16)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed passes per walk, best is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the synthetic library (default: 0)"
+    )
+    
+    args = parser.parse_args()
+    
+    if bool(args.movie_dir) != bool(args.show_dir):
+        parser.error("--movie-dir and --show-dir must be used together")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    client = load_client()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.movie_dir:
+            movie_dir, show_dir = args.movie_dir, args.show_dir
+        else:
+            print(f"Building a synthetic library with {args.movies} movies and {args.shows} shows")
+            movie_dir, show_dir = build_synthetic_library(Path(temp_dir), args.movies, args.shows, args.seed)
+        
+        legacy_seconds, legacy_data = time_scan(lambda: legacy_scan(movie_dir, show_dir), args.repeat)
+        walker_seconds, walker_data = time_scan(lambda: {
+            'movies': client.scan_movies(movie_dir),
+            'shows': client.scan_shows(show_dir, workers=args.workers)
+        }, args.repeat)
+    
+    print(f"Walked {len(legacy_data['movies'])} movies and {len(legacy_data['shows'])} shows (best of {args.repeat})")
+    print(f"  Legacy listdir + isdir:   {legacy_seconds:.3f}s")
+    print(f"  scandir, {args.workers:>2} workers:      {walker_seconds:.3f}s")
+    print(f"  Speedup:                  {legacy_seconds / walker_seconds:.2f}x")
+    
+    if legacy_data != walker_data:
+        print("\nError: The two walks produced different post data", file=sys.stderr)
+        sys.exit(1)
+    print("\n✓ Both walks produced identical post data")
+
+
+if __name__ == "__main__":
+    main()
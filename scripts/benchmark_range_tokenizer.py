@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark the One Pace Chapters/Episodes cleaning paths.
+
+This script builds a synthetic One Pace workbook in memory and times the
+legacy multi-pass clean_field()/normalize_range() implementation against the
+single-pass tokenizer in generate_one_pace_metadata.py, checking that both
+produce identical output.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from generate_one_pace_metadata import clean_field
+
+
+def legacy_normalize_range(text: str) -> str:
+    """
+    Original normalize_range(): one re.sub for commas and one for hyphens.
+    
+    Args:
+        text: Text containing ranges
+    
+    Returns:
+        Text with normalized spacing
+    """
+    if not text:
+        return ''
+    text = re.sub(r',\s*', ', ', text)
+    return re.sub(r'(\d)\s*-\s*(\d)', r'\1 - \2', text)
+
+
+def legacy_clean_field(text: str) -> str:
+    """
+    Original clean_field(): whitespace collapse, two prefix strips, then legacy_normalize_range().
+    
+    Args:
+        text: Raw text from CSV
+    
+    Returns:
+        Cleaned text without newlines and prefixes
+    """
+    if not text:
+        return ''
+    text = ' '.join(text.split())
+    text = re.sub(r'(?:^|(?<=,\s))Ch\.\s*', '', text)
+    text = re.sub(r'(?:^|(?<=,\s))Ep\.\s*', '', text)
+    text = legacy_normalize_range(text)
+    return text.strip()
+
+
+def build_synthetic_rows(row_count: int, seed: int) -> list:
+    """
+    Build synthetic arc sheet rows shaped like the One Pace spreadsheet.
+    
+    Args:
+        row_count: Number of rows to generate
+        seed: Random seed so runs are repeatable
+    
+    Returns:
+        List of dictionaries with 'Chapters' and 'Episodes' cells
+    """
+    rng = random.Random(seed)
+    rows = []
+    chapter = 1
+    episode = 1
+    for _ in range(row_count):
+        chapter_span = rng.randint(0, 4)
+        episode_span = rng.randint(0, 3)
+        chapters = f"Ch. {chapter}" if not chapter_span else f"Ch. {chapter}-{chapter + chapter_span}"
+        episodes = f"Ep. {episode}" if not episode_span else f"Ep. {episode}-{episode + episode_span}"
+        
+        # Mix in the irregular cells seen in the real sheets
+        roll = rng.random()
+        if roll < 0.1:
+            episodes = f"{episodes},\n{rng.randint(1, 1100)}"
+        elif roll < 0.15:
+            episodes = f"Episode of East Blue, {rng.randint(1, 1100)} (Intro)"
+        elif roll < 0.2:
+            chapters = f"{chapters}, Ch. {chapter + chapter_span + 2}"
+        elif roll < 0.22:
+            chapters = ''
+        
+        rows.append({'Chapters': chapters, 'Episodes': episodes})
+        chapter += chapter_span + 1
+        episode += episode_span + 1
+    return rows
+
+
+def time_path(clean, rows: list, repeat: int) -> tuple:
+    """
+    Time a cleaning function over every Chapters/Episodes cell.
+    
+    Args:
+        clean: Cleaning function to time
+        rows: Synthetic rows from build_synthetic_rows()
+        repeat: Number of timed passes (the best one is reported)
+    
+    Returns:
+        Tuple of (best_seconds, cleaned_values)
+    """
+    best = None
+    cleaned = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cleaned = [(clean(row['Chapters']), clean(row['Episodes'])) for row in rows]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, cleaned
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark legacy and single-pass One Pace range cleaning"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=50000,
+        help="Number of synthetic spreadsheet rows (default: 50000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of timed passes per path, best is reported (default: 5)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for the synthetic workbook (default: 0)"
+    )
+    
+    args = parser.parse_args()
+    
+    rows = build_synthetic_rows(args.rows, args.seed)
+    cell_count = len(rows) * 2
+    print(f"Benchmarking {cell_count} cells from {len(rows)} synthetic rows (best of {args.repeat})")
+    
+    legacy_seconds, legacy_values = time_path(legacy_clean_field, rows, args.repeat)
+    tokenizer_seconds, tokenizer_values = time_path(clean_field, rows, args.repeat)
+    
+    print(f"  Legacy multi-pass:  {legacy_seconds:.3f}s ({legacy_seconds / cell_count * 1e6:.2f}µs/cell)")
+    print(f"  Single-pass:        {tokenizer_seconds:.3f}s ({tokenizer_seconds / cell_count * 1e6:.2f}µs/cell)")
+    print(f"  Speedup:            {legacy_seconds / tokenizer_seconds:.2f}x")
+    
+    mismatches = sum(1 for old, new in zip(legacy_values, tokenizer_values) if old != new)
+    if mismatches:
+        print(f"\nError: {mismatches} row(s) differ between the two paths", file=sys.stderr)
+        sys.exit(1)
+    print("\n✓ Both paths produced identical output")
+
+
+if __name__ == "__main__":
+    main()
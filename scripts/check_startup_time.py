@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Check the cold-start time of the scripts in scripts/ against per-script budgets.
+
+Each script is started in a fresh interpreter with -X importtime on a trivial
+invocation (usually --help). The imports the script itself triggers, i.e.
+everything imported after site has finished loading, are added up and
+compared with the script's budget. With --timings the slowest of those
+imports are listed too, so a regression can be traced back to the module
+that caused it.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Trivial invocation and import time budget (ms) for each script. Import times
+# vary by 1.5x between runs on the same machine and more between CI runners, so
+# budgets are about 3x the slowest measured run. They are meant to catch eagerly
+# imported heavy dependencies (pandas ~300ms, plexapi ~260ms, ...) rather than
+# small drift.
+STARTUP_BUDGETS = {
+    'benchmark_collection_matcher.py': (['--help'], 40),
+    'benchmark_folder_parser.py': (['--help'], 40),
+    'benchmark_library_walker.py': (['--help'], 40),
+    'benchmark_range_tokenizer.py': (['--help'], 200),
+    'check_startup_time.py': (['--help'], 40),
+    'convert_xlsx_to_csvs.py': (['--help'], 40),
+    'find_missing_franchise_posters.py': ([], 150),
+    'format_metadata_file.py': (['--help'], 120),
+    'generate_one_pace_metadata.py': (['--help'], 150),
+    'http_cache.py': (['--help'], 50),
+    'ingest_metadata_payload.py': (['--help'], 150),
+    'kometa-post-metadata-info.py': (['--help'], 120),
+    'mass_add_genre.py': (['--help'], 100),
+    'metadata_field_index.py': (['--help'], 60),
+    'metadata_offset_index.py': (['--help'], 40),
+    'mirror_posters.py': (['--help'], 100),
+    'one_pace_coverage.py': (['--help'], 200)
+}
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Parse the -X importtime report written to stderr.
+    
+    Args:
+        output: Captured stderr of a python -X importtime run
+    
+    Returns:
+        List of tuples (module, self_us, cumulative_us, depth) in the order the
+        imports finished, where depth 0 is a top-level import
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((stripped, int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def get_script_imports(entries: list) -> list:
+    """
+    Get the top-level imports triggered by the script itself.
+    
+    Args:
+        entries: Parsed importtime entries from parse_importtime()
+    
+    Returns:
+        List of (module, self_us, cumulative_us, depth) entries for top-level
+        imports that finished after site, i.e. after interpreter startup
+    """
+    site_index = next((index for index, entry in enumerate(entries) if entry[0] == 'site' and entry[3] == 0), -1)
+    return [entry for entry in entries[site_index + 1:] if entry[3] == 0]
+
+
+def measure_script(script: str, script_args: list, repeat: int) -> tuple:
+    """
+    Start a script several times and keep its fastest run.
+    
+    Args:
+        script: Script file name in scripts/
+        script_args: Arguments for a trivial invocation of the script
+        repeat: Number of runs
+    
+    Returns:
+        Tuple of (import_ms, wall_ms, imports) for the run with the lowest
+        import time, where imports is the list from get_script_imports()
+    
+    Raises:
+        RuntimeError: If the script didn't produce any import timings
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', str(SCRIPTS_DIR / script), *script_args],
+            cwd=SCRIPTS_DIR.parent,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        
+        entries = parse_importtime(result.stderr)
+        if not entries:
+            raise RuntimeError(f"{script} exited with {result.returncode} without import timings")
+        imports = get_script_imports(entries)
+        import_ms = sum(cumulative_us for _, _, cumulative_us, _ in imports) / 1000
+        if best is None or import_ms < best[0]:
+            best = (import_ms, wall_ms, imports)
+    return best
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Check script cold-start import times against their budgets"
+    )
+    parser.add_argument(
+        "scripts",
+        nargs="*",
+        help="Scripts to check (default: every script with a budget)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of runs per script, the fastest is used (default: 5)"
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="List the slowest imports of each script"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of imports listed per script with --timings (default: 5)"
+    )
+    
+    args = parser.parse_args()
+    
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    
+    unknown = [script for script in args.scripts if script not in STARTUP_BUDGETS]
+    if unknown:
+        parser.error(f"no startup budget for: {', '.join(unknown)}")
+    
+    over_budget = []
+    for script in args.scripts or sorted(STARTUP_BUDGETS):
+        script_args, budget_ms = STARTUP_BUDGETS[script]
+        try:
+            import_ms, wall_ms, imports = measure_script(script, script_args, args.repeat)
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        status = "✓" if import_ms <= budget_ms else "✗"
+        print(f"{status} {script}: {import_ms:.1f}ms imports (budget {budget_ms}ms), {wall_ms:.0f}ms wall")
+        if import_ms > budget_ms:
+            over_budget.append(script)
+        
+        if args.timings:
+            slowest = sorted(imports, key=lambda entry: entry[2], reverse=True)[:args.top]
+            for module, self_us, cumulative_us, _ in slowest:
+                print(f"    {cumulative_us / 1000:8.1f}ms  {module} (self {self_us / 1000:.1f}ms)")
+    
+    if over_budget:
+        print(f"\nError: {len(over_budget)} script(s) over their startup budget: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
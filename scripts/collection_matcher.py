@@ -0,0 +1,280 @@
+"""
+Fuzzy matching of collection names between Plex and TMDB.
+
+Names are normalized before they are compared: transliterated to ASCII with
+Unidecode, lowercased, punctuation collapsed to spaces, '&' spelled out and
+"Collection"/"Trilogy"/"Saga" suffixes and a leading article dropped. Equal
+normalized names match with a score of 1.0. Other names are compared by the
+Dice coefficient of their character trigrams, but only against the
+candidates that share trigrams with them in an inverted index and share
+enough of them to reach the lowest score asked for. Trigrams in more than
+MAX_POSTING_LENGTH names are left out of the index and only looked up when
+a match could come from them alone. The work per name is bounded while
+most trigrams are indexed; when most are frequent, the names under a few
+of them are still scanned, so it grows with the number of names. On the
+synthetic names of benchmark_collection_matcher.py (57 words, so most
+trigrams are frequent) matching down to NEAR_MATCH_THRESHOLD took about
+0.05s at 1k, 0.25s at 4k and 1.2s at 12k names on each side, against 0.13s,
+2.2s and 16s for all pairs. Names only match candidates with the same
+numbers in them, so "Toy Story 2" doesn't match "Toy Story" however close
+their trigrams are.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+
+
+# Constants
+NGRAM_SIZE = 3
+MATCH_THRESHOLD = 0.85  # Scores from here on count as the same collection
+NEAR_MATCH_THRESHOLD = 0.7  # Unmatched names list their closest candidate from here on
+# N-grams shared by more names than this don't narrow down the candidates
+# and are left out of the index
+MAX_POSTING_LENGTH = 200
+
+NON_WORD_PATTERN = re.compile(r'[^a-z0-9]+')
+NUMBER_PATTERN = re.compile(r'\d+')
+NAME_SUFFIX_PATTERN = re.compile(r'(?:\s+(?:collection|trilogy|saga))+$')
+LEADING_ARTICLE_PATTERN = re.compile(r'^(?:the|a|an)\s+(?=\S)')
+
+
+def normalize_collection_name(name: str) -> str:
+    """
+    Normalize a collection name for comparison.
+    
+    Args:
+        name: Collection name from Plex or TMDB
+    
+    Returns:
+        Lowercase ASCII words separated by single spaces, without collection
+        suffixes or a leading article
+    """
+    from unidecode import unidecode
+    
+    text = unidecode(name or '').lower().replace('&', ' and ')
+    text = NON_WORD_PATTERN.sub(' ', text).strip()
+    # Keep names that are nothing but a suffix, like "Collection"
+    text = NAME_SUFFIX_PATTERN.sub('', text) or text
+    return LEADING_ARTICLE_PATTERN.sub('', text)
+
+
+def get_ngrams(text: str, size: int = NGRAM_SIZE) -> frozenset:
+    """
+    Get the character n-grams of a normalized name, padded with a space on each side.
+    
+    Args:
+        text: Normalized name
+        size: N-gram length
+    
+    Returns:
+        Set of n-grams
+    """
+    padded = f" {text} "
+    return frozenset(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+
+
+def get_numbers(text: str) -> tuple:
+    """
+    Get the numbers in a normalized name.
+    
+    Args:
+        text: Normalized name
+    
+    Returns:
+        Sorted tuple of the numbers without leading zeros, empty if there are none
+    """
+    return tuple(sorted(str(int(number)) for number in NUMBER_PATTERN.findall(text)))
+
+
+def get_similarity(ngrams: frozenset, other_ngrams: frozenset) -> float:
+    """
+    Dice coefficient of two n-gram sets.
+    
+    Args:
+        ngrams: N-grams of one name
+        other_ngrams: N-grams of the other name
+    
+    Returns:
+        Score from 0.0 (nothing in common) to 1.0 (same n-grams)
+    """
+    if not ngrams or not other_ngrams:
+        return 0.0
+    return 2 * len(ngrams & other_ngrams) / (len(ngrams) + len(other_ngrams))
+
+
+def get_min_shared(length: int, score: float) -> int:
+    """
+    Fewest n-grams another name has to share with a name to reach a score.
+    
+    A name with m n-grams sharing c of them scores 2c / (length + m), and c is
+    at most m, so the score takes c >= score * length / (2 - score).
+    
+    Args:
+        length: Number of n-grams of the name
+        score: Score to reach
+    
+    Returns:
+        Number of shared n-grams, at least 1
+    """
+    # The small margin keeps float rounding from pushing an exact bound up by one
+    return max(1, math.ceil(score * length / (2 - score) - 1e-9))
+
+
+class CollectionMatcher:
+    """
+    Index of collection names to find the closest match for other names.
+    
+    Builds the normalized names, an exact lookup of them and an inverted index
+    from n-grams to the names containing them once, then answers match()
+    calls from the index. Each call returns the same match as scoring the
+    name against every indexed name and keeping the best one that reaches
+    the threshold.
+    """
+    
+    def __init__(self, names):
+        self.names = list(dict.fromkeys(names))
+        normalized = [normalize_collection_name(name) for name in self.names]
+        self.exact = {}
+        for i, text in enumerate(normalized):
+            self.exact.setdefault(text, i)
+        self.ngrams = [get_ngrams(text) for text in normalized]
+        self.numbers = [get_numbers(text) for text in normalized]
+        
+        postings = defaultdict(list)
+        for i, ngrams in enumerate(self.ngrams):
+            for ngram in ngrams:
+                postings[ngram].append(i)
+        self.index = {ngram: ids for ngram, ids in postings.items() if len(ids) <= MAX_POSTING_LENGTH}
+        # Names under the frequent n-grams are sorted by their number of
+        # n-grams, so the ones too short or too long to match are skipped
+        self.frequent = {}
+        self.frequent_lengths = {}
+        for ngram, ids in postings.items():
+            if len(ids) > MAX_POSTING_LENGTH:
+                ids.sort(key=lambda i: len(self.ngrams[i]))
+                self.frequent[ngram] = ids
+                self.frequent_lengths[ngram] = [len(self.ngrams[i]) for i in ids]
+        self.unindexed = [sum(1 for ngram in ngrams if ngram in self.frequent) for ngrams in self.ngrams]
+    
+    def match(self, name: str, threshold: float = 0.0) -> tuple:
+        """
+        Find the indexed name closest to a name.
+        
+        Args:
+            name: Name to look up
+            threshold: Lowest score worth returning, names that can't reach it
+                are skipped without being scored
+        
+        Returns:
+            Tuple of (closest name, score), or (None, 0.0) if no indexed name
+            with the same numbers shares an n-gram with it and scores at least
+            the threshold
+        """
+        text = normalize_collection_name(name)
+        if text in self.exact:
+            return self.names[self.exact[text]], 1.0
+        
+        ngrams = get_ngrams(text)
+        numbers = get_numbers(text)
+        length = len(ngrams)
+        shared = Counter()
+        unindexed = 0
+        for ngram in ngrams:
+            ids = self.index.get(ngram)
+            if ids:
+                shared.update(ids)
+            elif ngram in self.frequent:
+                unindexed += 1
+        
+        # Candidates that can't share enough n-grams to reach the threshold,
+        # even with all the n-grams left out of the index, are dropped. Those
+        # could all be shared, so 2 (shared + unindexed) / (length + m) is an
+        # upper bound of each remaining score. Candidates are scored from the
+        # highest bound down until no bound can reach the best score, ties go
+        # to the name indexed first.
+        min_shared = get_min_shared(length, threshold) - unindexed
+        heap = []
+        for i, count in shared.items():
+            if count < min_shared:
+                continue
+            bound = 2 * (count + unindexed) / (length + len(self.ngrams[i]))
+            if bound >= threshold:
+                heap.append((-bound, i))
+        heapq.heapify(heap)
+        best_index, best_score = None, threshold
+        while heap:
+            bound, i = heapq.heappop(heap)
+            if -bound < best_score:
+                break
+            if self.numbers[i] != numbers:
+                continue
+            score = get_similarity(ngrams, self.ngrams[i])
+            if score > best_score or (score == best_score and score > 0 and (best_index is None or i < best_index)):
+                best_index, best_score = i, score
+        
+        # Names sharing nothing but n-grams left out of the index weren't
+        # scored. They share at most the unindexed n-grams, so to reach the
+        # best score they share at least get_min_shared() of them, and with
+        # that at least one of the rarest unindexed n-grams past that many.
+        # Only those n-grams' names of a length that can reach the best score
+        # are looked up, and only scored when their own unindexed n-grams could.
+        if unindexed:
+            min_shared = get_min_shared(length, best_score)
+            if unindexed >= min_shared:
+                max_length = math.floor(2 * unindexed / best_score - length + 1e-9) if best_score else math.inf
+                frequent = sorted((ngram for ngram in ngrams if ngram in self.frequent), key=lambda ngram: len(self.frequent[ngram]))
+                others = set()
+                for ngram in frequent[:unindexed - min_shared + 1]:
+                    lengths = self.frequent_lengths[ngram]
+                    others.update(self.frequent[ngram][bisect_left(lengths, min_shared):bisect_right(lengths, max_length)])
+                for i in sorted(others.difference(shared)):
+                    if self.numbers[i] != numbers:
+                        continue
+                    if 2 * min(unindexed, self.unindexed[i]) / (length + len(self.ngrams[i])) < best_score:
+                        continue
+                    score = get_similarity(ngrams, self.ngrams[i])
+                    if score > best_score or (score == best_score and score > 0 and (best_index is None or i < best_index)):
+                        best_index, best_score = i, score
+        if best_index is None:
+            return None, 0.0
+        return self.names[best_index], best_score
+
+
+def match_collections(names, candidates, threshold: float = 0.0) -> dict:
+    """
+    Find the closest candidate for every name.
+    
+    Args:
+        names: Names to look up (e.g. Plex collections)
+        candidates: Names to match them against (e.g. TMDB collections)
+        threshold: Lowest score worth returning
+    
+    Returns:
+        Dictionary of name -> (closest candidate or None, score), None if no
+        candidate reaches the threshold
+    """
+    matcher = CollectionMatcher(candidates)
+    return {name: matcher.match(name, threshold) for name in names}
+
+
+def find_unmatched_collections(names, candidates, threshold: float = MATCH_THRESHOLD,
+                               near_threshold: float = NEAR_MATCH_THRESHOLD) -> dict:
+    """
+    Find the names without a candidate scoring at least the threshold.
+    
+    Args:
+        names: Names to look up (e.g. Plex collections)
+        candidates: Names to match them against (e.g. TMDB collections)
+        threshold: Lowest score that counts as a match
+        near_threshold: Lowest score of a closest candidate worth listing
+            with an unmatched name
+    
+    Returns:
+        Dictionary of unmatched name -> (closest candidate or None, score),
+        None if no candidate scores at least near_threshold
+    """
+    matches = match_collections(names, candidates, min(threshold, near_threshold))
+    return {name: match for name, match in matches.items() if match[1] < threshold}
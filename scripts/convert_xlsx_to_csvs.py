@@ -3,22 +3,253 @@
 Convert Excel (.xlsx) file sheets to individual CSV files.
 
 This script reads an Excel file and exports each sheet as a separate CSV file,
-using the sheet name as the filename.
+using the sheet name as the filename. Sheets whose CSV content hasn't changed
+are left untouched on disk.
+
+By default sheets are loaded into pandas DataFrames. --streaming reads them with
+openpyxl in read-only mode instead and reproduces the pandas export byte for
+byte: the same trimming and header naming (see workbook_sheets.py) and the same
+column types, so numbers in a column with blanks are written as floats ("18.0"),
+pandas' missing value markers ("NA", "N/A", ...) as empty cells and all-date
+columns without their time when it is always midnight.
 """
 
 import argparse
+import csv
+import datetime
+import io
+import math
+import os
+import re
 import sys
 from pathlib import Path
-import pandas as pd
 
 
-def convert_xlsx_to_csvs(input_file: str, output_dir: str) -> None:
+# Constants
+# Strings pandas reads as missing values by default
+NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+})
+TRUE_VALUES = frozenset({'True', 'TRUE', 'true'})
+FALSE_VALUES = frozenset({'False', 'FALSE', 'false'})
+# Numbers pandas parses from text cells (ASCII digits only, surrounding whitespace allowed)
+NUMBER_PATTERN = re.compile(r'[ \t\n\r\f\v]*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?[ \t\n\r\f\v]*')
+INTEGER_PATTERN = re.compile(r'[ \t\n\r\f\v]*[+-]?[0-9]+[ \t\n\r\f\v]*')
+INFINITY_PATTERN = re.compile(r'[ \t\n\r\f\v]*[+-]?inf(?:inity)?[ \t\n\r\f\v]*', re.IGNORECASE)
+INTEGER_RANGE = (-2 ** 63, 2 ** 64)  # int64 and uint64 columns
+
+
+def render_sheet_with_pandas(excel_file, sheet_name: str) -> str:
+    """
+    Render a sheet as CSV text by loading it into a pandas DataFrame.
+    
+    Args:
+        excel_file: Open pandas ExcelFile
+        sheet_name: Name of the sheet to render
+    
+    Returns:
+        CSV text for the sheet
+    """
+    import pandas as pd
+    
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    return df.to_csv(index=False)
+
+
+def is_missing(value) -> bool:
+    """Check whether pandas reads a cell value as missing."""
+    if isinstance(value, float):
+        return math.isnan(value)
+    return isinstance(value, str) and value in NA_VALUES
+
+
+def parse_number(value):
+    """
+    Get the number pandas reads from a cell value.
+    
+    Args:
+        value: Cell value from read_sheet_data() that isn't missing
+    
+    Returns:
+        int, float or bool, or None if pandas wouldn't read the value as a number
+    """
+    if isinstance(value, bool) or isinstance(value, float):
+        return value
+    if isinstance(value, int):
+        # Whole numbers too large for an integer column are read as floats
+        return value if INTEGER_RANGE[0] <= value < INTEGER_RANGE[1] else float(value)
+    if not isinstance(value, str):
+        return None
+    if INTEGER_PATTERN.fullmatch(value):
+        number = int(value)
+        return number if INTEGER_RANGE[0] <= number < INTEGER_RANGE[1] else None
+    if NUMBER_PATTERN.fullmatch(value):
+        number = float(value)
+        return number if not math.isinf(number) else None
+    if INFINITY_PATTERN.fullmatch(value):
+        return float(value)
+    return None
+
+
+def render_column(values: list) -> list:
+    """
+    Render the cells of a column the way a pandas DataFrame column writes them to CSV.
+    
+    pandas gives each column a single type: numbers (ints, or floats as soon
+    as one value is a float or missing), booleans, dates or text.
+    
+    Args:
+        values: Cell values of the column from read_sheet_data(), without the header
+    
+    Returns:
+        List of cell texts
+    """
+    missing = [is_missing(value) for value in values]
+    present = [value for value, is_na in zip(values, missing) if not is_na]
+    
+    numbers = [parse_number(value) for value in present]
+    if None not in numbers:
+        if numbers and all(isinstance(number, bool) for number in numbers) and not any(missing):
+            return [str(value) for value in numbers]
+        if not any(missing) and not any(isinstance(number, float) for number in numbers):
+            return [str(int(number)) for number in numbers]
+        # Text is converted to float directly, so "-0" stays negative zero
+        floats = iter(float(value) if isinstance(value, str) else float(number)
+                      for value, number in zip(present, numbers))
+        return ['' if is_na else repr(next(floats)) for is_na in missing]
+    
+    if all(isinstance(value, datetime.datetime) for value in present):
+        if all(value.time() == datetime.time() for value in present):
+            date_format = '%Y-%m-%d'
+        elif any(value.microsecond for value in present):
+            date_format = '%Y-%m-%d %H:%M:%S.%f'
+        else:
+            date_format = '%Y-%m-%d %H:%M:%S'
+        return ['' if is_na else value.strftime(date_format) for value, is_na in zip(values, missing)]
+    
+    # Text columns keep the first of equal values, so a 1 after a True is written as True
+    interned = {}
+    present = [interned.setdefault(value, value) for value in present]
+    if all(isinstance(value, bool) or value in TRUE_VALUES or value in FALSE_VALUES for value in present):
+        present = iter(present)
+        return ['' if is_na else str(next(present) in (True, *TRUE_VALUES)) for is_na in missing]
+    
+    present = iter(present)
+    return ['' if is_na else str(next(present)) for is_na in missing]
+
+
+def render_sheet_streaming(worksheet) -> str:
+    """
+    Render a sheet as CSV text by streaming its rows, without building a DataFrame.
+    
+    Args:
+        worksheet: openpyxl worksheet from a read-only workbook
+    
+    Returns:
+        CSV text for the sheet, identical to render_sheet_with_pandas()
+    """
+    from workbook_sheets import get_sheet_headers, read_sheet_data
+    
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator=os.linesep)
+    data = read_sheet_data(worksheet)
+    if not data:
+        # An empty DataFrame still writes its (empty) header line
+        return os.linesep
+    
+    writer.writerow([str(header) for header in get_sheet_headers(data[0])])
+    columns = [render_column(list(values)) for values in zip(*data[1:])]
+    writer.writerows(zip(*columns))
+    return output.getvalue()
+
+
+def write_if_changed(csv_path: Path, content: str) -> bool:
+    """
+    Write CSV text to a file unless the file already has identical content.
+    
+    Args:
+        csv_path: Path to the CSV file
+        content: CSV text to write
+    
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    encoded = content.encode('utf-8')
+    if csv_path.exists() and csv_path.stat().st_size == len(encoded) and csv_path.read_bytes() == encoded:
+        return False
+    csv_path.write_bytes(encoded)
+    return True
+
+
+def export_sheets(input_path: Path, sheet_names: list, output_path: Path, streaming: bool) -> list:
+    """
+    Export a group of sheets from an Excel file to CSV files.
+    
+    Each call opens the workbook itself, so groups can be exported in separate processes.
+    
+    Args:
+        input_path: Path to the input .xlsx file
+        sheet_names: Names of the sheets to export
+        output_path: Directory where CSV files will be saved
+        streaming: Whether to stream rows with openpyxl instead of using pandas
+    
+    Returns:
+        List of tuples (sheet_name, csv_path, written) in the order of sheet_names
+    """
+    results = []
+    
+    if streaming:
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(input_path, read_only=True, data_only=True)
+        try:
+            for sheet_name in sheet_names:
+                csv_path = output_path / f"{sheet_name}.csv"
+                written = write_if_changed(csv_path, render_sheet_streaming(workbook[sheet_name]))
+                results.append((sheet_name, csv_path, written))
+        finally:
+            workbook.close()
+        return results
+    
+    import pandas as pd
+    
+    with pd.ExcelFile(input_path) as excel_file:
+        for sheet_name in sheet_names:
+            csv_path = output_path / f"{sheet_name}.csv"
+            written = write_if_changed(csv_path, render_sheet_with_pandas(excel_file, sheet_name))
+            results.append((sheet_name, csv_path, written))
+    return results
+
+
+def get_sheet_names(input_path: Path) -> list:
+    """
+    List the sheet names of an Excel file without reading their contents.
+    
+    Args:
+        input_path: Path to the input .xlsx file
+    
+    Returns:
+        List of sheet names in workbook order
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(input_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def convert_xlsx_to_csvs(input_file: str, output_dir: str, streaming: bool = False, jobs: int = 1) -> None:
     """
     Convert each sheet in an Excel file to a separate CSV file.
     
     Args:
         input_file: Path to the input .xlsx file
         output_dir: Directory where CSV files will be saved
+        streaming: Whether to stream rows with openpyxl instead of loading DataFrames
+        jobs: Number of worker processes to export sheets with
     
     Raises:
         FileNotFoundError: If input file doesn't exist
@@ -34,32 +265,51 @@ def convert_xlsx_to_csvs(input_file: str, output_dir: str) -> None:
     if input_path.suffix.lower() not in ['.xlsx', '.xls']:
         raise ValueError(f"Input file must be an Excel file (.xlsx or .xls): {input_file}")
     
+    if streaming and input_path.suffix.lower() != '.xlsx':
+        raise ValueError(f"Streaming mode only supports .xlsx files: {input_file}")
+    
     # Create output directory if it doesn't exist
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Read all sheets from the Excel file
+    # Read the sheet names from the Excel file
     try:
-        excel_file = pd.ExcelFile(input_path)
+        if input_path.suffix.lower() == '.xlsx':
+            sheet_names = get_sheet_names(input_path)
+        else:
+            import pandas as pd
+            
+            with pd.ExcelFile(input_path) as excel_file:
+                sheet_names = list(excel_file.sheet_names)
     except Exception as e:
         print(f"Error reading Excel file: {e}", file=sys.stderr)
         sys.exit(1)
     
-    print(f"Found {len(excel_file.sheet_names)} sheet(s) in {input_path.name}")
+    print(f"Found {len(sheet_names)} sheet(s) in {input_path.name}")
     
-    # Convert each sheet to CSV
-    for sheet_name in excel_file.sheet_names:
-        # Read the sheet
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-        
-        # Create CSV filename (sanitize sheet name for filesystem)
-        csv_filename = f"{sheet_name}.csv"
-        csv_path = output_path / csv_filename
+    # Convert each sheet to CSV, spreading the sheets across worker processes if requested
+    if jobs > 1 and len(sheet_names) > 1:
+        from concurrent.futures import ProcessPoolExecutor
         
-        # Save to CSV
-        df.to_csv(csv_path, index=False)
-        print(f"  ✓ Exported '{sheet_name}' to {csv_path}")
+        groups = [sheet_names[index::jobs] for index in range(min(jobs, len(sheet_names)))]
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [executor.submit(export_sheets, input_path, group, output_path, streaming) for group in groups]
+            exported = {sheet_name: (csv_path, written)
+                        for future in futures
+                        for sheet_name, csv_path, written in future.result()}
+        results = [(sheet_name, *exported[sheet_name]) for sheet_name in sheet_names]
+    else:
+        results = export_sheets(input_path, sheet_names, output_path, streaming)
     
-    print(f"\nSuccessfully converted {len(excel_file.sheet_names)} sheet(s) to CSV files in {output_path}")
+    written_count = 0
+    for sheet_name, csv_path, written in results:
+        if written:
+            written_count += 1
+            print(f"  ✓ Exported '{sheet_name}' to {csv_path}")
+        else:
+            print(f"  = Unchanged '{sheet_name}' ({csv_path})")
+    
+    print(f"\nSuccessfully converted {len(sheet_names)} sheet(s) to CSV files in {output_path}"
+          f" ({written_count} written, {len(sheet_names) - written_count} unchanged)")
 
 
 def main():
@@ -75,11 +325,25 @@ def main():
         "output",
         help="Directory where CSV files will be saved"
     )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream rows with openpyxl in read-only mode instead of loading pandas DataFrames"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes to export sheets with (default: 1)"
+    )
     
     args = parser.parse_args()
     
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
     try:
-        convert_xlsx_to_csvs(args.input, args.output)
+        convert_xlsx_to_csvs(args.input, args.output, streaming=args.streaming, jobs=args.jobs)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -9,26 +9,34 @@ collection poster coverage.
 Purpose:
 - Connects to a Plex server and extracts franchise collections for movies and TV shows
 - Reads poster mapping configurations from config.yml
-- Compares Plex collections against configured TMDB poster mappings
+- Compares Plex collections against configured TMDB poster mappings, fuzzy matching
+  names so differences in case, punctuation, accents and "Collection"/"Trilogy"/"Saga"
+  suffixes don't count as missing (scripts/collection_matcher.py)
 - Generates markdown reports of missing collection posters for easy review
 - Provides statistics on collection coverage
 
 Dependencies:
-- plexapi: For connecting to and querying Plex server
 - tmdbsimple: For querying The Movie Database API
 - PyYAML: For reading configuration files
-- requests: For HTTP exception handling
+- requests: For querying the Plex API
+- Unidecode: For normalizing collection names before matching
 
 Configuration:
 Requires a config.yml file containing url_poster_mappings with franchise_movie_posters
 and franchise_show_posters sections mapping TMDB collection IDs to poster URLs.
 
 Output:
-- missing_movie_collections.md: List of movie collections lacking poster configs
-- missing_show_collections.md: List of TV show collections lacking poster configs
+- missing_movie_collections.md: List of movie collections lacking poster configs, each
+  with the closest configured TMDB collection and its match score
+- missing_show_collections.md: List of TV show collections lacking poster configs, each
+  with the closest configured TMDB collection and its match score
 - Console statistics showing collection counts and missing poster counts
 
-Usage: python plex.py <plex_url> <plex_token> <tmdb_api_token>
+Usage: python plex.py <plex_url> <plex_token> <tmdb_api_token> [--offline]
+
+TMDB lookups go through the shared HTTP response cache (scripts/http_cache.py),
+so repeated runs only revalidate collections they have seen before. With
+--offline (or HTTP_CACHE_OFFLINE=1) only cached TMDB responses are used.
 
 Example: python plex.py http://localhost:32400 abc123token def456apikey
 """
@@ -40,11 +48,15 @@ Example: python plex.py http://localhost:32400 abc123token def456apikey
 ##################################################################
 
 import yaml
-import tmdbsimple as tmdb
-import requests.exceptions as req_exc
-from plexapi.server import PlexServer
 from urllib.parse import quote_plus
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from collection_matcher import find_unmatched_collections
+
+# tmdbsimple and requests are imported where they are used so the
+# usage message doesn't have to wait for them to load
 
 # Collections to exclude from analysis - these are typically managed differently
 # or don't require custom poster mappings
@@ -64,40 +76,131 @@ bypass_collections = [
 ]
 
 # Mapping to fix discrepancies between Kometa collection names and TMDB collection names
-# This ensures proper matching when collection titles don't exactly align
+# that are too far apart for the fuzzy matcher to find (score below MATCH_THRESHOLD)
 name_replacements = {
     '28 Days/Weeks Later': '28 Days/Weeks/Years Later',
     'Godzilla (MonsterVerse)': 'Godzilla',
     'Berserk: Golden Age Arc': 'Berserk: The Golden Age Arc'
 }
 
-def get_plex_franchise_collections(section: str) -> set:
+# TMDB collection names by media type and ID, kept between runs so only newly
+# added poster mappings have to be looked up
+collection_names_file = 'tmdb-collection-names.json'
+tmdb_workers = 8 # Concurrent TMDB lookups
+tmdb_rate = 20   # TMDB requests per second
+
+plex_page_size = 200      # Collections per Plex API request
+plex_workers = 4          # Library sections scanned at the same time
+plex_timeout = 30         # Seconds to wait on a single Plex API request
+plex_collection_type = 18 # Plex metadata type of collections
+
+def get_plex_container(session, baseurl: str, path: str, params: dict = None) -> dict:
     """
-    Extract franchise collection names from a Plex library section.
+    Request a Plex API endpoint as JSON.
+    
+    Args:
+        session: requests session with the Plex token and JSON Accept header
+        baseurl (str): The Plex server URL
+        path (str): The endpoint path, e.g. '/library/sections'
+        params (dict): Query parameters
+        
+    Returns:
+        dict: The MediaContainer of the response
+        
+    Raises:
+        requests.HTTPError: If the request fails
+    """
+    response = session.get(f"{baseurl.rstrip('/')}{path}", params=params, timeout=plex_timeout)
+    response.raise_for_status()
+    return response.json().get('MediaContainer') or {}
+
+def get_plex_sections(session, baseurl: str) -> list:
+    """
+    List the movie and show library sections of a Plex server by their type.
+    
+    Args:
+        session: requests session with the Plex token and JSON Accept header
+        baseurl (str): The Plex server URL
+        
+    Returns:
+        list: (key, type, title) tuples of the movie and show sections
+    """
+    container = get_plex_container(session, baseurl, '/library/sections')
+    return [(section['key'], section['type'], section.get('title'))
+            for section in container.get('Directory') or []
+            if section.get('type') in ('movie', 'show')]
+
+def get_plex_collection_titles(session, baseurl: str, section_key: str) -> list:
+    """
+    Get the titles of the collections in a library section.
+    
+    Pages through the section's collections plex_page_size at a time and only
+    reads their titles, instead of building a full object for every collection.
+    
+    Args:
+        session: requests session with the Plex token and JSON Accept header
+        baseurl (str): The Plex server URL
+        section_key (str): The key of the library section
+        
+    Returns:
+        list: The collection titles
+    """
+    titles = []
+    start = 0
+    while True:
+        container = get_plex_container(session, baseurl, f'/library/sections/{section_key}/all', {
+            'type': plex_collection_type,
+            'X-Plex-Container-Start': start,
+            'X-Plex-Container-Size': plex_page_size,
+        })
+        items = container.get('Metadata') or container.get('Directory') or []
+        titles.extend(item['title'] for item in items if item.get('title'))
+        start += len(items)
+        total_size = container.get('totalSize')
+        if not items or (total_size is not None and start >= int(total_size)) or len(items) < plex_page_size:
+            return titles
+
+def get_plex_collections_by_type(baseurl: str, token: str) -> dict:
+    """
+    Get the collection titles of every movie and show library on a Plex server.
+    
+    The sections are scanned concurrently, plex_workers at a time.
+    
+    Args:
+        baseurl (str): The Plex server URL
+        token (str): The Plex authentication token
+        
+    Returns:
+        dict: 'movie' and 'show' -> set of collection titles
+    """
+    import requests
+    
+    session = requests.Session()
+    session.headers.update({'X-Plex-Token': token, 'Accept': 'application/json'})
+    
+    collections = {'movie': set(), 'show': set()}
+    sections = get_plex_sections(session, baseurl)
+    with ThreadPoolExecutor(max_workers=plex_workers) as executor:
+        lookups = [(section_type, executor.submit(get_plex_collection_titles, session, baseurl, key))
+                   for key, section_type, _ in sections]
+        for section_type, lookup in lookups:
+            collections[section_type].update(lookup.result())
+    return collections
+
+def get_plex_franchise_collections(plex_collections: set) -> set:
+    """
+    Extract franchise collection names from the collections of a media type.
     
     Filters out collections that end with common suffixes like 'Movies', 'Universe',
     'Series', 'Shows' as these are typically auto-generated or studio collections
     rather than true franchise collections that need custom poster mappings.
     
     Args:
-        section (str): The type of section to process ('movie' or 'show')
+        plex_collections (set): Collection titles from get_plex_collections_by_type()
         
     Returns:
         set: A set of filtered collection names with name replacements applied
-        
-    Raises:
-        ValueError: If section is not 'movie' or 'show'
-    """
-    match section:
-        case "movie":
-            sec_no = 0  # Movies are typically the first section in Plex
-        case "show":
-            sec_no = 1  # TV Shows are typically the second section
-        case _:
-            raise ValueError(f"Unknown section: {section}")
-    
-    # Get all collections from the specified Plex library section
-    plex_collections = set([item.title for item in plex_sections[sec_no].collections()])
+    """
     temp = set()
     
     # Filter collections to only include franchise-type collections
@@ -111,23 +214,38 @@ def get_plex_franchise_collections(section: str) -> set:
             temp.add(name_replacements.get(collection, collection))
     return temp
 
-def get_tmdb_collection_title(type: str, id: int) -> str:
+def clean_collection_title(name: str) -> str:
     """
-    Retrieve the collection title from TMDB using the collection ID.
+    Clean up a TMDB collection name by removing common suffixes like '- Collection'
+    and 'Collection' to match how these collections might be named in Plex.
     
-    Cleans up the title by removing common suffixes like '- Collection' and 'Collection'
-    to match how these collections might be named in Plex.
+    Args:
+        name (str): The collection name from TMDB
+        
+    Returns:
+        str: The cleaned collection title
+    """
+    return (name.replace(' - Collection', '')
+                .replace('Collection', '')
+                .strip())
+
+def get_tmdb_collection_name(type: str, id: int) -> str:
+    """
+    Retrieve the collection name from TMDB using the collection ID.
     
     Args:
         type (str): The media type ('movie' or 'show')
         id (int): The TMDB collection ID
         
     Returns:
-        str: The cleaned collection title
+        str: The collection name as TMDB returns it
         
     Raises:
         Exception: If the collection ID is not found or other errors occur
     """
+    import tmdbsimple as tmdb
+    import requests.exceptions as req_exc
+    
     try:
         match type:
             case "movie":
@@ -141,104 +259,190 @@ def get_tmdb_collection_title(type: str, id: int) -> str:
     except Exception as e:
         raise Exception(f"Error occurred: {e}")
     
-    # Clean up the collection name by removing common TMDB suffixes
-    return (collection.info()
-                      .get('name')
-                      .replace(' - Collection', '')
-                      .replace('Collection', '')
-                      .strip())
+    return collection.info().get('name')
 
-def get_tmdb_collections_from_config(config, poster_type: str, media_type: str) -> set:
+def get_tmdb_collection_title(type: str, id: int) -> str:
+    """
+    Retrieve the cleaned collection title from TMDB using the collection ID.
+    
+    Args:
+        type (str): The media type ('movie' or 'show')
+        id (int): The TMDB collection ID
+        
+    Returns:
+        str: The cleaned collection title
+        
+    Raises:
+        Exception: If the collection ID is not found or other errors occur
+    """
+    return clean_collection_title(get_tmdb_collection_name(type, id))
+
+def load_collection_names(path: str) -> dict:
+    """
+    Load the TMDB collection names saved by previous runs.
+    
+    Args:
+        path (str): Path to the JSON file
+        
+    Returns:
+        dict: Media type -> {TMDB ID (str) -> collection name}, empty if the file
+        doesn't exist or can't be read
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            names = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return names if isinstance(names, dict) else {}
+
+def save_collection_names(path: str, names: dict):
+    """
+    Save the TMDB collection names for the next run.
+    
+    Args:
+        path (str): Path to the JSON file
+        names (dict): Media type -> {TMDB ID (str) -> collection name}
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(names, file, indent=2, sort_keys=True, ensure_ascii=False)
+        file.write('\n')
+
+def get_tmdb_collections_from_config(config, poster_type: str, media_type: str, known_names: dict = None) -> set:
     """
     Extract TMDB collection titles from config for given poster_type and media_type.
     
     Parses the configuration file to extract TMDB collection IDs from poster mappings,
     then fetches the actual collection titles from TMDB API for comparison with Plex.
+    Collections in known_names aren't looked up again, the others are fetched
+    concurrently (tmdb_workers at a time) and added to it. IDs that are no
+    longer mapped are dropped from known_names.
     
     Args:
         config: The loaded YAML configuration containing poster mappings
         poster_type (str): 'franchise_movie_posters' or 'franchise_show_posters'
         media_type (str): 'movie' or 'show'
+        known_names (dict): TMDB ID (str) -> collection name from previous runs,
+            updated in place
         
     Returns:
         tuple: A set of TMDB collection titles and a dict mapping titles to IDs
     """
-    tmdb_collections = set()
-    tmdb_titles_to_id = dict()
+    if known_names is None:
+        known_names = {}
     
-    # Process each poster mapping in the configuration
+    # Extract TMDB collection IDs from the poster mapping keys
+    collection_ids = []
     for url_poster in config['url_poster_mappings'][poster_type].keys():
         try:
-            # Extract TMDB collection ID from the poster mapping key
-            collection_id = int(url_poster.replace('url_poster_', ''))
-            print(f"Grabbing TMDB collection {collection_id}")
-            
-            # Fetch the actual collection title from TMDB
-            title = get_tmdb_collection_title(media_type, collection_id)
-            tmdb_collections.add(title)
-            tmdb_titles_to_id[title] = collection_id
+            collection_ids.append(int(url_poster.replace('url_poster_', '')))
         except ValueError:
-            raise Exception(f"Skipping {url_poster}, not a tmdb_id")
-        except Exception as e:
-            print(e)
+            print(f"Skipping {url_poster}, not a tmdb_id")
+    
+    for stale_id in set(known_names) - {str(collection_id) for collection_id in collection_ids}:
+        del known_names[stale_id]
+    
+    # Fetch the actual collection names of new mappings from TMDB
+    new_ids = [collection_id for collection_id in collection_ids if str(collection_id) not in known_names]
+    with ThreadPoolExecutor(max_workers=tmdb_workers) as executor:
+        lookups = {}
+        for collection_id in new_ids:
+            print(f"Grabbing TMDB collection {collection_id}")
+            lookups[collection_id] = executor.submit(get_tmdb_collection_name, media_type, collection_id)
+        for collection_id, lookup in lookups.items():
+            try:
+                known_names[str(collection_id)] = lookup.result()
+            except Exception as e:
+                print(e)
+    
+    tmdb_collections = set()
+    tmdb_titles_to_id = dict()
+    for collection_id in collection_ids:
+        name = known_names.get(str(collection_id))
+        if not name:
+            continue
+        title = clean_collection_title(name)
+        tmdb_collections.add(title)
+        tmdb_titles_to_id[title] = collection_id
     return tmdb_collections, tmdb_titles_to_id
 
-def write_missing_md_report(missing_collections: set, media_type: str, titles_to_id: dict):
+def write_missing_md_report(missing_collections: dict, media_type: str, titles_to_id: dict):
     """
     Generate a markdown report of missing collection poster mappings.
     
     Creates a markdown file listing all collections that exist in Plex but don't have
     corresponding poster mappings in the configuration. Each entry includes a search
-    link to TMDB to make it easy to find and add the missing collection.
+    link to TMDB to make it easy to find and add the missing collection, followed by
+    the closest configured TMDB collection and its match score so near misses can be
+    told apart from collections that really have no mapping.
     
     Args:
-        missing_collections (set): Set of collection names missing poster mappings
+        missing_collections (dict): Collection names missing poster mappings ->
+            (closest TMDB collection title or None, score) from find_unmatched_collections()
         media_type (str): 'movie' or 'show' - used for filename generation
-        titles_to_id (dict): Mapping of collection titles to TMDB IDs (currently unused)
+        titles_to_id (dict): Mapping of collection titles to TMDB IDs, used to link the closest match
     """
     if len(missing_collections) == 0:
         return
     
     # TMDB search URL base for generating clickable links
     url_base = "https://www.themoviedb.org/search?query="
+    # TMDB page of a collection (movies) or series (shows) by ID
+    item_url_base = "https://www.themoviedb.org/collection/" if media_type == 'movie' else "https://www.themoviedb.org/tv/"
     
     with open(f'missing_{media_type}_collections.md', 'w') as file:
         for collection in sorted(missing_collections):
             # URL-encode the collection name for the search query
             safe_collection = quote_plus(f'{collection} Collection')
-            file.write(f"- [{collection}]({url_base}{safe_collection})\n")
+            closest, score = missing_collections[collection]
+            if closest is None:
+                match = "no close match"
+            else:
+                match = f"closest: [{closest}]({item_url_base}{titles_to_id[closest]}) ({score:.2f})"
+            file.write(f"- [{collection}]({url_base}{safe_collection}) - {match}\n")
 
 
 if __name__ == "__main__":
     # Validate command line arguments
-    if len(sys.argv) != 4:
-        print("Usage: python plex.py <plex_url> <plex_token> <tmdb_api_token>")
+    args = [arg for arg in sys.argv[1:] if arg != '--offline']
+    if len(args) != 3:
+        print("Usage: python plex.py <plex_url> <plex_token> <tmdb_api_token> [--offline]")
         sys.exit(1)
 
+    import tmdbsimple as tmdb
+    from http_cache import ResponseCache, TokenBucket, create_session
+
     # Parse command line arguments
-    baseurl = sys.argv[1]      # Plex server URL (e.g., http://localhost:32400)
-    token = sys.argv[2]        # Plex authentication token
-    tmdb.API_KEY = sys.argv[3] # TMDB API key for collection lookups
+    baseurl = args[0]      # Plex server URL (e.g., http://localhost:32400)
+    token = args[1]        # Plex authentication token
+    tmdb.API_KEY = args[2] # TMDB API key for collection lookups
+
+    # Serve TMDB lookups from the persistent response cache, only cached ones with --offline,
+    # and keep the concurrent lookups under the TMDB rate limit
+    offline = True if '--offline' in sys.argv[1:] else None
+    tmdb.REQUESTS_SESSION = create_session(ResponseCache(offline=offline), TokenBucket(tmdb_rate))
 
-    # Connect to Plex server and get library sections
-    plex = PlexServer(baseurl, token)
-    plex_sections = plex.library.sections()
+    # Get the collections of every movie and show library on the Plex server
+    plex_collections = get_plex_collections_by_type(baseurl, token)
     
     # Extract franchise collections from Plex for both movies and TV shows
-    plex_movie_collections = get_plex_franchise_collections("movie")
-    plex_show_collections = get_plex_franchise_collections("show")
+    plex_movie_collections = get_plex_franchise_collections(plex_collections['movie'])
+    plex_show_collections = get_plex_franchise_collections(plex_collections['show'])
 
     # Load poster mapping configuration from YAML file
     with open('config.yml', 'r') as file:
         config = yaml.safe_load(file)
 
-    # Get TMDB collections that have poster mappings configured
-    tmdb_movie_collections, tmdb_movies_to_id = get_tmdb_collections_from_config(config, 'franchise_movie_posters', 'movie')
-    tmdb_show_collections, tmdb_shows_to_id = get_tmdb_collections_from_config(config, 'franchise_show_posters', 'show')
+    # Get TMDB collections that have poster mappings configured, only looking up new mappings
+    collection_names = load_collection_names(collection_names_file)
+    tmdb_movie_collections, tmdb_movies_to_id = get_tmdb_collections_from_config(
+        config, 'franchise_movie_posters', 'movie', collection_names.setdefault('movie', {}))
+    tmdb_show_collections, tmdb_shows_to_id = get_tmdb_collections_from_config(
+        config, 'franchise_show_posters', 'show', collection_names.setdefault('show', {}))
+    save_collection_names(collection_names_file, collection_names)
 
-    # Find collections that exist in Plex but don't have poster mappings
-    missing_movie_collections = plex_movie_collections - tmdb_movie_collections
-    missing_show_collections = plex_show_collections - tmdb_show_collections
+    # Find collections that exist in Plex but don't have a poster mapping scoring at least MATCH_THRESHOLD
+    missing_movie_collections = find_unmatched_collections(plex_movie_collections, tmdb_movie_collections)
+    missing_show_collections = find_unmatched_collections(plex_show_collections, tmdb_show_collections)
     
     # Generate markdown reports for missing poster mappings
     write_missing_md_report(missing_movie_collections, "movie", tmdb_movies_to_id)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Sort and format metadata files in a single pass.
+
+This script applies the rules of functions/yaml/sort-metadata-file.sh and
+functions/yaml/format-metadata-file.sh (natural sort_title ordering, field
+order, season ordering, sorted genres, null field pruning and quoting) while
+loading and writing each file once, instead of the ~18 yq rewrites the two
+scripts make. With --check, files are only reported, not written.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from metadata_yaml import dump_metadata, load_metadata_file, sort_metadata
+
+
+def format_metadata_file(metadata_file: Path, check: bool = False) -> bool:
+    """
+    Sort and format a metadata file.
+    
+    Args:
+        metadata_file: Path to the metadata file
+        check: Only compare the file with its canonical form, don't write it
+    
+    Returns:
+        True if the file was already canonical, False if it was (or would be) rewritten
+    
+    Raises:
+        FileNotFoundError: If the metadata file doesn't exist
+    """
+    if not metadata_file.exists():
+        raise FileNotFoundError(f"File not found: {metadata_file}")
+    
+    document, styles = load_metadata_file(metadata_file)
+    content = dump_metadata(sort_metadata(document), styles)
+    if metadata_file.read_text(encoding='utf-8') == content:
+        return True
+    if not check:
+        metadata_file.write_text(content, encoding='utf-8')
+    return False
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Sort and format metadata files in a single pass"
+    )
+    parser.add_argument(
+        "files",
+        nargs="+",
+        help="Metadata files to sort and format"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Report files that aren't sorted and formatted without changing them (exits with 1 if any)"
+    )
+    
+    args = parser.parse_args()
+    
+    unformatted = []
+    for file in args.files:
+        try:
+            canonical = format_metadata_file(Path(file), check=args.check)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        if canonical:
+            print(f"  = {file} is already sorted and formatted")
+        elif args.check:
+            print(f"  ✗ {file} is not sorted and formatted")
+            unformatted.append(file)
+        else:
+            print(f"  ✓ Sorted and formatted {file}")
+    
+    if unformatted:
+        print(f"\nError: {len(unformatted)} file(s) need sorting and formatting, run without --check to fix them", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,44 @@
 """
 Generate One Pace metadata YAML structure from CSV files.
 
-This script reads CSV files from data/one-pace/csvs/ and generates
-YAML metadata entries for each arc (season) with its episodes.
+This script reads CSV files from data/one-pace/csvs/ (or the sheets of the
+One Pace workbook directly, with --xlsx) and generates YAML metadata entries
+for each arc (season) with its episodes.
 """
 
 import argparse
 import csv
+import filecmp
+import hashlib
+import json
+import os
+import pickle
 import sys
 from pathlib import Path
 import re
 import yaml
+from array import array
+from bisect import bisect_right
 from collections import OrderedDict
 
+# Use the libyaml C emitter and loader when PyYAML was built with them
+try:
+    from yaml import CDumper as BaseDumper
+except ImportError:
+    from yaml import Dumper as BaseDumper
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 # Constants
 APOSTROPHE_CHARS = ["'", "'", "`"]
 SUFFIX_PATTERNS_TO_REMOVE = r'\s*\((TBR|WIP)\)\s*$'
+ARC_OVERVIEW_SHEET = "Arc Overview"
+MANIFEST_VERSION = 1
+YAML_CACHE_VERSION = 1
+COVERAGE_FIELDS = ('anime_episodes', 'manga_chapters')
 
 
 def normalize_arc_name(arc_name: str, remove_apostrophes: bool = True) -> str:
@@ -37,6 +59,74 @@ def normalize_arc_name(arc_name: str, remove_apostrophes: bool = True) -> str:
     return arc_name
 
 
+# Single-pass tokenizers for Chapters/Episodes cells. Each match is either a
+# "Ch." / "Ep." prefix (at the start or after a comma), a comma, or a number
+# optionally followed by a hyphenated range end (and, rarely, further ends).
+RANGE_NUMBER_PATTERN = r'(?P<start>\d+)(?:\s*-\s*(?P<end>\d+)(?P<chain>(?:\s*-\s*\d+)+)?)?'
+RANGE_TOKEN_PATTERN = re.compile(
+    r'(?P<prefix>(?:^|(?<=,\s))(?:Ch\.\s*(?:Ep\.\s*)?|Ep\.\s*))'
+    r'|(?P<comma>,\s*)'
+    r'|' + RANGE_NUMBER_PATTERN
+)
+RANGE_SPACING_PATTERN = re.compile(
+    r'(?P<comma>,\s*)'
+    r'|' + RANGE_NUMBER_PATTERN
+)
+RANGE_CHAIN_PATTERN = re.compile(r'(\s*-\s*)(\d+)')
+
+
+def tokenize_range(text: str, strip_prefixes: bool = True) -> tuple:
+    """
+    Normalize an episode/chapter range and parse its numbers in a single scan.
+    - Removes "Ch. " and "Ep. " prefixes at the start or after a comma (if strip_prefixes)
+    - Adds spaces around hyphens: "40-41" -> "40 - 41"
+    - Ensures space after commas: "42,22" -> "42, 22"
+    
+    Args:
+        text: Text containing ranges
+        strip_prefixes: Whether to remove "Ch. " and "Ep. " prefixes
+        
+    Returns:
+        Tuple of (normalized_text, ranges) where ranges is a list of
+        (start, end) integer tuples in the order they appear
+    """
+    if not text:
+        return '', []
+    
+    ranges = []
+    
+    def replace_token(match):
+        start = match.group('start')
+        if start is None:
+            return ', ' if match.group('comma') is not None else ''
+        end = match.group('end')
+        if end is None:
+            ranges.append((int(start), int(start)))
+            return start
+        chain = match.group('chain')
+        if chain is None:
+            ranges.append((int(start), int(end)))
+            return f"{start} - {end}"
+        
+        # Chained ranges like "1-23-4" keep the historical spacing: a later
+        # hyphen is left as-is when the single digit before it already closed
+        # the previous range
+        parts = [f"{start} - {end}"]
+        numbers = [int(start), int(end)]
+        previous, previous_closed = end, True
+        for hyphen, number in RANGE_CHAIN_PATTERN.findall(chain):
+            spaced = len(previous) > 1 or not previous_closed
+            parts.append(' - ' if spaced else hyphen)
+            parts.append(number)
+            numbers.append(int(number))
+            previous, previous_closed = number, spaced
+        ranges.append((min(numbers), max(numbers)))
+        return ''.join(parts)
+    
+    pattern = RANGE_TOKEN_PATTERN if strip_prefixes else RANGE_SPACING_PATTERN
+    return pattern.sub(replace_token, text), ranges
+
+
 def normalize_range(text: str) -> str:
     """
     Normalize episode/chapter ranges to have consistent spacing.
@@ -49,17 +139,27 @@ def normalize_range(text: str) -> str:
     Returns:
         Text with normalized spacing
     """
-    if not text:
-        return ''
+    return tokenize_range(text, strip_prefixes=False)[0]
+
+
+def parse_field(text: str) -> tuple:
+    """
+    Clean up CSV field and parse the episode/chapter ranges it covers.
     
-    # First ensure space after commas
-    text = re.sub(r',\s*', ', ', text)
+    Args:
+        text: Raw text from CSV
+        
+    Returns:
+        Tuple of (cleaned_text, ranges) as returned by tokenize_range()
+    """
+    if not text:
+        return '', []
     
-    # Add spaces around hyphens that are between numbers
-    # This pattern looks for digit-hyphen-digit and adds spaces
-    text = re.sub(r'(\d)\s*-\s*(\d)', r'\1 - \2', text)
+    # Remove newlines and extra whitespace, then strip prefixes and normalize
+    # ranges (add spaces around hyphens and after commas) in one pass
+    text, ranges = tokenize_range(' '.join(text.split()))
     
-    return text
+    return text.strip(), ranges
 
 
 def clean_field(text: str) -> str:
@@ -72,22 +172,7 @@ def clean_field(text: str) -> str:
     Returns:
         Cleaned text without newlines and prefixes
     """
-    if not text:
-        return ''
-    
-    # Remove newlines and extra whitespace
-    text = ' '.join(text.split())
-    
-    # Remove "Ch. " prefix (only when it's at the start or after a comma/space)
-    text = re.sub(r'(?:^|(?<=,\s))Ch\.\s*', '', text)
-    
-    # Remove "Ep. " prefix (only when it's at the start or after a comma/space)
-    text = re.sub(r'(?:^|(?<=,\s))Ep\.\s*', '', text)
-    
-    # Normalize ranges (add spaces around hyphens and after commas)
-    text = normalize_range(text)
-    
-    return text.strip()
+    return parse_field(text)[0]
 
 
 def format_episode_title(episode_title: str, anime_episodes: str) -> str:
@@ -101,7 +186,8 @@ def format_episode_title(episode_title: str, anime_episodes: str) -> str:
     Returns:
         Formatted title (e.g., "The Pirate King and the Master Swordsman (2, 19)")
     """
-    # Normalize the anime_episodes to ensure consistent spacing
+    # Normalize the anime_episodes to ensure consistent spacing. Fields cleaned by
+    # clean_field() only change here when they end in a comma ("12," -> "12, ")
     anime_episodes = normalize_range(anime_episodes)
     
     # Add episode range in parentheses if available
@@ -110,126 +196,461 @@ def format_episode_title(episode_title: str, anime_episodes: str) -> str:
     return episode_title
 
 
-def get_episode_range(episodes_dict: dict) -> tuple:
+def build_interval_set(ranges) -> tuple:
+    """
+    Merge (start, end) ranges into a sorted, non-overlapping interval set.
+    
+    Touching ranges are merged too, so "1 - 4, 5" becomes a single interval 1-5.
+    
+    Args:
+        ranges: Iterable of (start, end) integer tuples
+        
+    Returns:
+        Tuple of (starts, ends) arrays, where interval i covers starts[i]..ends[i]
+    """
+    starts = array('l')
+    ends = array('l')
+    for start, end in sorted((min(pair), max(pair)) for pair in ranges):
+        if ends and start <= ends[-1] + 1:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def union_interval_sets(interval_sets) -> tuple:
+    """
+    Merge several interval sets into one.
+    
+    Args:
+        interval_sets: Iterable of (starts, ends) interval sets
+        
+    Returns:
+        Tuple of (starts, ends) arrays covering every input interval
+    """
+    return build_interval_set(pair for starts, ends in interval_sets for pair in zip(starts, ends))
+
+
+def get_episode_coverage(episodes_dict: dict) -> dict:
+    """
+    Parse the anime episodes and manga chapters covered by each episode.
+    
+    Args:
+        episodes_dict: Dictionary of episodes with their data
+        
+    Returns:
+        Dictionary mapping episode numbers to
+        {'anime_episodes': interval_set, 'manga_chapters': interval_set}
+    """
+    coverage = {}
+    for episode_num, ep_data in episodes_dict.items():
+        coverage[episode_num] = {
+            field: build_interval_set(tokenize_range(str(ep_data.get(field) or ''), strip_prefixes=False)[1])
+            for field in COVERAGE_FIELDS
+        }
+    return coverage
+
+
+def get_episode_range(episodes_dict: dict, coverage: dict = None) -> tuple:
     """
     Get the range of anime episodes and manga chapters from all episodes.
     
     Args:
         episodes_dict: Dictionary of episodes with their data
+        coverage: Optional per-episode coverage (see get_episode_coverage()),
+            parsed from episodes_dict if not provided
         
     Returns:
         Tuple of (anime_range, manga_range) as strings
     """
-    all_anime = []
-    all_manga = []
+    if coverage is None:
+        coverage = get_episode_coverage(episodes_dict)
     
-    for ep_data in episodes_dict.values():
-        anime_eps = ep_data.get('anime_episodes', '')
-        manga_chaps = ep_data.get('manga_chapters', '')
-        
-        if anime_eps:
-            all_anime.append(anime_eps)
-        if manga_chaps:
-            all_manga.append(manga_chaps)
+    ranges = []
+    for field in COVERAGE_FIELDS:
+        starts, ends = union_interval_sets(ep_coverage[field] for ep_coverage in coverage.values())
+        ranges.append(f"{starts[0]}-{ends[-1]}" if starts else "")
     
-    # Extract numbers from the episode/chapter strings
-    def extract_numbers(text_list):
-        numbers = []
-        for text in text_list:
-            # Find all numbers in the text (excluding text like "Episode of")
-            matches = re.findall(r'\d+', text)
-            numbers.extend([int(m) for m in matches])
-        return numbers
+    return tuple(ranges)
+
+
+def build_coverage_index(coverage_by_owner: dict) -> tuple:
+    """
+    Build a reverse index from numbers to whatever covers them.
     
-    anime_numbers = extract_numbers(all_anime)
-    manga_numbers = extract_numbers(all_manga)
+    The intervals of every owner are swept into disjoint segments, each labelled
+    with the owners covering it, so a lookup is a single binary search.
     
-    if anime_numbers:
-        anime_range = f"{min(anime_numbers)}-{max(anime_numbers)}"
-    else:
-        anime_range = ""
+    Args:
+        coverage_by_owner: Dictionary mapping an owner (e.g. a season number or a
+            (season_num, episode_num) tuple) to its interval set
+        
+    Returns:
+        Tuple of (starts, ends, owners) where segment i covers starts[i]..ends[i]
+        and owners[i] is a tuple of the owners covering it
+    """
+    events = []
+    for owner, (owner_starts, owner_ends) in coverage_by_owner.items():
+        for start, end in zip(owner_starts, owner_ends):
+            events.append((start, 1, owner))
+            events.append((end + 1, -1, owner))
+    events.sort(key=lambda event: event[0])
+    
+    starts = array('l')
+    ends = array('l')
+    owners = []
+    active = {}
+    for index, (position, change, owner) in enumerate(events):
+        active[owner] = active.get(owner, 0) + change
+        if not active[owner]:
+            del active[owner]
+        
+        # Close off a segment once every event at this position is applied
+        if index + 1 == len(events) or events[index + 1][0] == position or not active:
+            continue
+        segment_owners = tuple(sorted(active))
+        next_position = events[index + 1][0]
+        if owners and owners[-1] == segment_owners and ends[-1] + 1 == position:
+            ends[-1] = next_position - 1
+        else:
+            starts.append(position)
+            ends.append(next_position - 1)
+            owners.append(segment_owners)
     
-    if manga_numbers:
-        manga_range = f"{min(manga_numbers)}-{max(manga_numbers)}"
-    else:
-        manga_range = ""
+    return starts, ends, owners
+
+
+def find_coverage(coverage_index: tuple, number: int) -> tuple:
+    """
+    Find which owners cover a number using an index from build_coverage_index().
     
-    return anime_range, manga_range
+    Args:
+        coverage_index: Tuple of (starts, ends, owners)
+        number: Anime episode or manga chapter number to look up
+        
+    Returns:
+        Tuple of owners covering the number (empty if nothing covers it)
+    """
+    starts, ends, owners = coverage_index
+    index = bisect_right(starts, number) - 1
+    if index >= 0 and number <= ends[index]:
+        return owners[index]
+    return ()
 
 
-def parse_csv_file(csv_path: Path, season_num: int, episode_titles: dict) -> dict:
+def find_coverage_issues(coverage_index: tuple) -> tuple:
     """
-    Parse a One Pace CSV file and extract episode information.
+    Find gaps and overlaps in a coverage index.
+    
+    Args:
+        coverage_index: Tuple of (starts, ends, owners) from build_coverage_index()
+        
+    Returns:
+        Tuple of (gaps, overlaps). gaps is a list of (start, end) ranges nothing
+        covers, between the lowest and highest covered number. overlaps is a list
+        of (start, end, owners) ranges covered by more than one owner.
+    """
+    starts, ends, owners = coverage_index
+    gaps = [(ends[i - 1] + 1, starts[i] - 1) for i in range(1, len(starts)) if starts[i] > ends[i - 1] + 1]
+    overlaps = [(starts[i], ends[i], owners[i]) for i in range(len(starts)) if len(owners[i]) > 1]
+    return gaps, overlaps
+
+
+def iter_csv_rows(csv_path: Path):
+    """
+    Iterate the rows of a CSV file.
     
     Args:
         csv_path: Path to the CSV file
+        
+    Yields:
+        Row dictionaries keyed by column header
+    """
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+
+def load_workbook_sheets(xlsx_path: Path) -> dict:
+    """
+    Read every sheet of the One Pace workbook in a single streaming pass.
+    
+    Args:
+        xlsx_path: Path to the .xlsx workbook
+        
+    Returns:
+        Dictionary mapping sheet names to their list of row dictionaries, in workbook order
+    """
+    from openpyxl import load_workbook
+    from workbook_sheets import iter_sheet_rows
+    
+    workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        return {worksheet.title: list(iter_sheet_rows(worksheet)) for worksheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def hash_rows(rows: list) -> str:
+    """
+    Get the SHA-256 content hash of a sheet's rows.
+    
+    Args:
+        rows: List of row dictionaries
+        
+    Returns:
+        Hex digest of the rows
+    """
+    return hashlib.sha256(json.dumps(rows).encode('utf-8')).hexdigest()
+
+
+def parse_arc_rows(rows, arc_name: str, season_num: int, episode_titles: dict) -> dict:
+    """
+    Parse the rows of a One Pace arc sheet and extract episode information.
+    
+    Args:
+        rows: Iterable of row dictionaries keyed by column header (see
+            iter_csv_rows() and workbook_sheets.iter_sheet_rows())
+        arc_name: Name of the arc the rows belong to
         season_num: Season number for this arc
         episode_titles: Dictionary of episode titles from episodes.yml
         
     Returns:
-        Dictionary with arc information and episodes
+        Dictionary with arc information, episodes and per-episode coverage
+        (see get_episode_coverage())
     """
-    arc_name = csv_path.stem  # Filename without extension
     episodes = {}
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        episode_num = 1
-        for row in reader:
-            # Skip empty rows - handle both 'One Pace Episode' and ' One Pace Episode' (with leading space)
-            # This handles potential inconsistencies in CSV headers
-            one_pace_ep_key = 'One Pace Episode' if 'One Pace Episode' in row else ' One Pace Episode'
-            if not row.get(one_pace_ep_key):
-                continue
-                
-            # Extract and clean episode information
-            one_pace_ep = row.get(one_pace_ep_key, '').strip()
+    coverage = {}
+    
+    episode_num = 1
+    for row in rows:
+        # Skip empty rows - handle both 'One Pace Episode' and ' One Pace Episode' (with leading space)
+        # This handles potential inconsistencies in CSV headers
+        one_pace_ep_key = 'One Pace Episode' if 'One Pace Episode' in row else ' One Pace Episode'
+        if not row.get(one_pace_ep_key):
+            continue
             
-            # Skip episodes with "Forward" in the title (unreleased episodes)
-            if 'Forward' in one_pace_ep:
-                continue
+        # Extract and clean episode information
+        one_pace_ep = row.get(one_pace_ep_key, '').strip()
+        
+        # Skip episodes with "Forward" in the title (unreleased episodes)
+        if 'Forward' in one_pace_ep:
+            continue
+        
+        chapters, chapter_ranges = parse_field(row.get('Chapters', ''))
+        anime_episodes, anime_ranges = parse_field(row.get('Episodes', ''))
+        
+        if one_pace_ep:
+            # Get episode title from episodes.yml
+            season_titles = episode_titles.get(season_num, {})
+            episode_title = season_titles.get(episode_num, one_pace_ep)
+            
+            # Format the episode title with anime episodes
+            formatted_title = format_episode_title(episode_title, anime_episodes)
+            episode_data = {'title': formatted_title}
             
-            chapters = clean_field(row.get('Chapters', ''))
-            anime_episodes = clean_field(row.get('Episodes', ''))
+            # Build episode summary
+            summary_parts = []
+            if anime_episodes:
+                episode_data['anime_episodes'] = anime_episodes
+                summary_parts.append(f"Covers anime episode(s): {anime_episodes}")
             
-            if one_pace_ep:
-                # Get episode title from episodes.yml
-                season_titles = episode_titles.get(season_num, {})
-                episode_title = season_titles.get(episode_num, one_pace_ep)
-                
-                # Format the episode title with anime episodes
-                formatted_title = format_episode_title(episode_title, anime_episodes)
-                episode_data = {'title': formatted_title}
-                
-                # Build episode summary
-                summary_parts = []
-                if anime_episodes:
-                    episode_data['anime_episodes'] = anime_episodes
-                    summary_parts.append(f"Covers anime episode(s): {anime_episodes}")
-                
-                if chapters:
-                    episode_data['manga_chapters'] = chapters
-                    summary_parts.append(f"Covers manga chapter(s): {chapters}")
-                
-                if summary_parts:
-                    episode_data['summary'] = '\n'.join(summary_parts)
-                
-                episodes[episode_num] = episode_data
-                episode_num += 1
+            if chapters:
+                episode_data['manga_chapters'] = chapters
+                summary_parts.append(f"Covers manga chapter(s): {chapters}")
+            
+            if summary_parts:
+                episode_data['summary'] = '\n'.join(summary_parts)
+            
+            episodes[episode_num] = episode_data
+            coverage[episode_num] = {
+                'anime_episodes': build_interval_set(anime_ranges),
+                'manga_chapters': build_interval_set(chapter_ranges)
+            }
+            episode_num += 1
     
     return {
         'arc_name': arc_name,
-        'episodes': episodes
+        'episodes': episodes,
+        'coverage': coverage
     }
 
 
-def load_existing_metadata(metadata_file: Path) -> dict:
+def parse_csv_file(csv_path: Path, season_num: int, episode_titles: dict) -> dict:
+    """
+    Parse a One Pace CSV file and extract episode information.
+    
+    Args:
+        csv_path: Path to the CSV file
+        season_num: Season number for this arc
+        episode_titles: Dictionary of episode titles from episodes.yml
+        
+    Returns:
+        Dictionary with arc information, episodes and per-episode coverage
+        (see get_episode_coverage())
+    """
+    arc_name = csv_path.stem  # Filename without extension
+    return parse_arc_rows(iter_csv_rows(csv_path), arc_name, season_num, episode_titles)
+
+
+def parse_arc_source(source, season_num: int, episode_titles: dict) -> dict:
+    """
+    Parse an arc from either a CSV file or rows already read from a workbook sheet.
+    
+    Args:
+        source: Path to the arc CSV file, or a tuple (sheet_name, rows)
+        season_num: Season number for this arc
+        episode_titles: Dictionary of episode titles from episodes.yml
+        
+    Returns:
+        Dictionary with arc information, episodes and per-episode coverage
+    """
+    if isinstance(source, Path):
+        return parse_csv_file(source, season_num, episode_titles)
+    sheet_name, rows = source
+    return parse_arc_rows(rows, sheet_name, season_num, episode_titles)
+
+
+def parse_arc_sources(arc_jobs: list, episode_titles: dict, jobs: int = 1) -> list:
+    """
+    Parse several One Pace arcs, optionally across a pool of worker processes.
+    
+    Each arc is independent once its season number is known, so the arcs can be
+    parsed in any order. Results are always returned in the order of arc_jobs.
+    
+    Args:
+        arc_jobs: List of tuples (source, season_num), see parse_arc_source()
+        episode_titles: Dictionary of episode titles from episodes.yml
+        jobs: Number of worker processes to use (1 parses in this process)
+        
+    Returns:
+        List of parse_arc_source() results, one per entry in arc_jobs
+    """
+    if jobs <= 1 or len(arc_jobs) <= 1:
+        return [parse_arc_source(source, season_num, episode_titles)
+                for source, season_num in arc_jobs]
+    
+    # Imported here so single-process runs don't pay for loading multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # Only send each worker the titles for the season it is parsing
+    sources = [source for source, _ in arc_jobs]
+    season_nums = [season_num for _, season_num in arc_jobs]
+    season_titles = [{season_num: episode_titles.get(season_num, {})} for season_num in season_nums]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(arc_jobs))) as executor:
+        return list(executor.map(parse_arc_source, sources, season_nums, season_titles))
+
+
+def get_yaml_cache_file(path: Path, cache_dir: Path) -> Path:
+    """
+    Get the cache file that holds the parsed form of a YAML file.
+    
+    Args:
+        path: Path to the YAML file
+        cache_dir: Directory of the parsed YAML cache
+    
+    Returns:
+        Path to the cache file, named after a hash of the resolved YAML path
+    """
+    path_hash = hashlib.sha256(str(path.resolve()).encode('utf-8')).hexdigest()
+    return cache_dir / f"{path_hash[:16]}.pickle"
+
+
+def read_yaml_cache_entry(cache_file: Path) -> dict:
+    """
+    Read a parsed YAML cache entry.
+    
+    Args:
+        cache_file: Path to the cache file
+    
+    Returns:
+        Cache entry dictionary, or an empty dictionary if missing, unreadable or outdated
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            entry = pickle.load(f)
+    except Exception:
+        return {}
+    
+    if not isinstance(entry, dict) or entry.get('version') != YAML_CACHE_VERSION:
+        return {}
+    return entry
+
+
+def write_yaml_cache_entry(cache_file: Path, entry: dict) -> None:
+    """
+    Write a parsed YAML cache entry, replacing the previous one atomically.
+    
+    Args:
+        cache_file: Path to the cache file
+        entry: Cache entry dictionary to write
+    """
+    temp_file = cache_file.with_name(f".{cache_file.name}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_file, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write YAML cache {cache_file}: {e}", file=sys.stderr)
+
+
+def load_yaml_file(path: Path, cache_dir: Path = None):
+    """
+    Parse a YAML file, reusing the cached parse when the file hasn't changed.
+    
+    A cache entry is reused as-is when the file size and mtime still match. If
+    they don't, the file is hashed and the entry is still reused when the
+    content is the same (e.g. after a fresh git checkout), otherwise the file
+    is parsed again with the C loader when available.
+    
+    Args:
+        path: Path to the YAML file
+        cache_dir: Directory of the parsed YAML cache, or None to always parse
+    
+    Returns:
+        Parsed YAML data
+    """
+    if cache_dir is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=SafeLoader)
+    
+    stat = path.stat()
+    resolved_path = str(path.resolve())
+    cache_file = get_yaml_cache_file(path, cache_dir)
+    entry = read_yaml_cache_entry(cache_file)
+    if entry.get('path') != resolved_path:
+        entry = {}
+    
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['data']
+    
+    content = path.read_bytes()
+    content_hash = hashlib.sha256(content).hexdigest()
+    if entry and entry['hash'] == content_hash:
+        data = entry['data']
+    else:
+        data = yaml.load(content.decode('utf-8'), Loader=SafeLoader)
+    
+    write_yaml_cache_entry(cache_file, {
+        'version': YAML_CACHE_VERSION,
+        'path': resolved_path,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': content_hash,
+        'data': data
+    })
+    return data
+
+
+def load_existing_metadata(metadata_file: Path, cache_dir: Path = None) -> dict:
     """
     Load parent-level metadata from existing one-pace.yml file.
     
     Args:
         metadata_file: Path to existing metadata YAML file
+        cache_dir: Directory of the parsed YAML cache, or None to always parse
         
     Returns:
         Dictionary with parent metadata (without seasons)
@@ -240,8 +661,7 @@ def load_existing_metadata(metadata_file: Path) -> dict:
         return {}
     
     try:
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            existing = yaml.safe_load(f)
+        existing = load_yaml_file(metadata_file, cache_dir)
             
         if existing and 'metadata' in existing and 'One Pace' in existing['metadata']:
             parent_metadata = existing['metadata']['One Pace'].copy()
@@ -255,12 +675,13 @@ def load_existing_metadata(metadata_file: Path) -> dict:
     return {}
 
 
-def load_arc_summaries(summaries_file: Path) -> dict:
+def load_arc_summaries(summaries_file: Path, cache_dir: Path = None) -> dict:
     """
     Load arc summaries from summaries.yml file.
     
     Args:
         summaries_file: Path to summaries YAML file
+        cache_dir: Directory of the parsed YAML cache, or None to always parse
         
     Returns:
         Dictionary mapping arc names to their summaries
@@ -270,8 +691,7 @@ def load_arc_summaries(summaries_file: Path) -> dict:
         return {}
     
     try:
-        with open(summaries_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        data = load_yaml_file(summaries_file, cache_dir)
             
         if data and 'arcs' in data:
             # Return a dict mapping arc names to summaries
@@ -283,12 +703,13 @@ def load_arc_summaries(summaries_file: Path) -> dict:
     return {}
 
 
-def load_episode_titles(episodes_file: Path) -> dict:
+def load_episode_titles(episodes_file: Path, cache_dir: Path = None) -> dict:
     """
     Load episode titles from episodes.yml file.
     
     Args:
         episodes_file: Path to episodes YAML file
+        cache_dir: Directory of the parsed YAML cache, or None to always parse
         
     Returns:
         Dictionary mapping season numbers to episode titles
@@ -299,8 +720,7 @@ def load_episode_titles(episodes_file: Path) -> dict:
         return {}
     
     try:
-        with open(episodes_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        data = load_yaml_file(episodes_file, cache_dir)
             
         if not data:
             return {}
@@ -312,12 +732,13 @@ def load_episode_titles(episodes_file: Path) -> dict:
     return {}
 
 
-def load_saga_data(sagas_file: Path) -> dict:
+def load_saga_data(sagas_file: Path, cache_dir: Path = None) -> dict:
     """
     Load saga information from sagas.yml file.
     
     Args:
         sagas_file: Path to sagas YAML file
+        cache_dir: Directory of the parsed YAML cache, or None to always parse
         
     Returns:
         Dictionary mapping arc names to their saga information (name and background URL)
@@ -327,8 +748,7 @@ def load_saga_data(sagas_file: Path) -> dict:
         return {}
     
     try:
-        with open(sagas_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        data = load_yaml_file(sagas_file, cache_dir)
             
         if not data or 'sagas' not in data:
             return {}
@@ -348,7 +768,107 @@ def load_saga_data(sagas_file: Path) -> dict:
     return {}
 
 
-def build_metadata_structure(arcs_data: list, start_season: int, existing_metadata_file: Path, summaries_file: Path, sagas_file: Path, arc_overview_data: dict) -> dict:
+def load_existing_seasons(metadata_file: Path, cache_dir: Path = None) -> dict:
+    """
+    Load the generated seasons from an existing one-pace.yml file.
+    
+    Args:
+        metadata_file: Path to existing metadata YAML file
+        cache_dir: Directory of the parsed YAML cache, or None to always parse
+    
+    Returns:
+        Dictionary mapping season numbers to their season metadata
+    """
+    if not metadata_file.exists():
+        return {}
+    
+    try:
+        existing = load_yaml_file(metadata_file, cache_dir)
+        
+        if existing and 'metadata' in existing and 'One Pace' in existing['metadata']:
+            return existing['metadata']['One Pace'].get('seasons') or {}
+    except Exception as e:
+        print(f"Warning: Could not read existing seasons: {e}", file=sys.stderr)
+    
+    return {}
+
+
+def hash_file(path: Path) -> str:
+    """
+    Get the SHA-256 content hash of a file.
+    
+    Args:
+        path: Path to the file to hash
+    
+    Returns:
+        Hex digest of the file contents, or an empty string if the file doesn't exist
+    """
+    if not path.exists():
+        return ''
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def get_arc_fingerprint(csv_hash: str, season_num: int, season_titles: dict, overview_info: dict) -> str:
+    """
+    Build a fingerprint of every per-arc input that feeds into a generated season.
+    
+    Args:
+        csv_hash: Content hash of the arc CSV file
+        season_num: Season number the arc was parsed with (used for episode titles)
+        season_titles: Episode titles for this season from episodes.yml
+        overview_info: Anime episode and manga chapter ranges from Arc Overview.csv
+    
+    Returns:
+        Hex digest identifying this combination of inputs
+    """
+    payload = json.dumps(
+        [csv_hash, season_num, season_titles, overview_info],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_manifest(manifest_file: Path) -> dict:
+    """
+    Load the incremental regeneration manifest.
+    
+    Args:
+        manifest_file: Path to the manifest JSON file
+    
+    Returns:
+        Manifest dictionary, or an empty dictionary if missing, unreadable or outdated
+    """
+    if not manifest_file.exists():
+        return {}
+    
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read manifest file: {e}", file=sys.stderr)
+        return {}
+    
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_manifest(manifest_file: Path, manifest: dict) -> None:
+    """
+    Write the incremental regeneration manifest.
+    
+    Args:
+        manifest_file: Path to the manifest JSON file
+        manifest: Manifest dictionary to write
+    """
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def build_metadata_structure(arcs_data: list, start_season: int, existing_metadata_file: Path, summaries_file: Path, sagas_file: Path, arc_overview_data: dict, reused_seasons: dict = None, season_coverage: dict = None, cache_dir: Path = None) -> dict:
     """
     Build the complete metadata structure as a dictionary.
     
@@ -359,31 +879,39 @@ def build_metadata_structure(arcs_data: list, start_season: int, existing_metada
         summaries_file: Path to summaries YAML file
         sagas_file: Path to sagas YAML file
         arc_overview_data: Dictionary of arc data from Arc Overview.csv
-        
+        reused_seasons: Optional dictionary of already generated season metadata,
+            keyed by season number, to use as-is instead of rebuilding
+        season_coverage: Optional dictionary of per-episode coverage already parsed
+            for each season, keyed by season number
+        cache_dir: Optional directory of the parsed YAML cache for the input files
+    
     Returns:
         Dictionary representing the complete YAML structure
+        
+    Raises:
+        ValueError: If an arc name matches more than one summary or saga entry
     """
     # Load arc summaries and saga data
-    arc_summaries = load_arc_summaries(summaries_file)
-    arc_to_saga = load_saga_data(sagas_file)
+    arc_summaries = load_arc_summaries(summaries_file, cache_dir)
+    arc_to_saga = load_saga_data(sagas_file, cache_dir)
+    reused_seasons = reused_seasons or {}
+    season_coverage = season_coverage or {}
+    
+    # Index the summary and saga arc names once instead of retrying spellings per arc
+    summary_index = build_arc_name_index(arc_summaries)
+    saga_index = build_arc_name_index(arc_to_saga)
     
     seasons = {}
     
     for season_num, (arc_name, episodes) in enumerate(arcs_data, start=start_season):
-        # Try to find the summary for this arc
-        # Remove "(WIP)" suffix when looking up summary
-        lookup_name = re.sub(SUFFIX_PATTERNS_TO_REMOVE, '', arc_name)
-        
-        # Normalize apostrophes for lookup (remove them)
-        lookup_name_normalized = normalize_arc_name(lookup_name)
+        # Seasons whose inputs haven't changed are carried over from the existing file
+        if season_num in reused_seasons:
+            seasons[season_num] = reused_seasons[season_num]
+            continue
         
-        # Try exact match first, then normalized match, then try without trailing 's'
-        arc_summary = arc_summaries.get(lookup_name)
-        if not arc_summary:
-            arc_summary = arc_summaries.get(lookup_name_normalized)
-        if not arc_summary and lookup_name_normalized.endswith('s'):
-            # Try without the trailing 's' (e.g., "Straw Hats" -> "Straw Hat")
-            arc_summary = arc_summaries.get(lookup_name_normalized[:-1])
+        # Try to find the summary for this arc (ignoring suffixes, apostrophes and plurals)
+        summary_name = resolve_arc_name(summary_index, arc_name)
+        arc_summary = arc_summaries.get(summary_name) if summary_name else None
         
         # Get episode/chapter ranges from Arc Overview if available
         overview_info = arc_overview_data.get(arc_name, {})
@@ -392,7 +920,7 @@ def build_metadata_structure(arcs_data: list, start_season: int, existing_metada
         
         # If not in overview, fall back to calculating from episodes
         if not anime_range or not manga_range:
-            calculated_anime, calculated_manga = get_episode_range(episodes)
+            calculated_anime, calculated_manga = get_episode_range(episodes, season_coverage.get(season_num))
             if not anime_range:
                 anime_range = calculated_anime
             if not manga_range:
@@ -418,12 +946,8 @@ def build_metadata_structure(arcs_data: list, start_season: int, existing_metada
         season_metadata['url_poster'] = f'https://raw.githubusercontent.com/chase-roohms/kometa-configs/main/assets/one-pace/seasons/{season_num}.png'
         
         # Add saga information if available
-        # Try to find saga info using the same lookup variations as summaries
-        saga_info = arc_to_saga.get(lookup_name)
-        if not saga_info:
-            saga_info = arc_to_saga.get(lookup_name_normalized)
-        if not saga_info and lookup_name_normalized.endswith('s'):
-            saga_info = arc_to_saga.get(lookup_name_normalized[:-1])
+        saga_name = resolve_arc_name(saga_index, arc_name)
+        saga_info = arc_to_saga.get(saga_name) if saga_name else None
         
         # Add url_background and saga in the correct order
         if saga_info:
@@ -439,7 +963,7 @@ def build_metadata_structure(arcs_data: list, start_season: int, existing_metada
         seasons[season_num] = season_metadata
     
     # Load parent metadata from existing file
-    parent_metadata = load_existing_metadata(existing_metadata_file)
+    parent_metadata = load_existing_metadata(existing_metadata_file, cache_dir)
     
     # If we couldn't load existing metadata, use defaults
     if not parent_metadata:
@@ -479,6 +1003,32 @@ def build_metadata_structure(arcs_data: list, start_season: int, existing_metada
     return metadata
 
 
+def parse_arc_overview(rows) -> dict:
+    """
+    Get the ordered list of arcs from the Arc Overview sheet rows along with their episode/chapter ranges.
+    
+    Args:
+        rows: Iterable of Arc Overview row dictionaries keyed by column header
+        
+    Returns:
+        Dictionary mapping arc names to their anime episode and manga chapter ranges
+    """
+    arc_data = {}
+    
+    for row in rows:
+        arc_name = row.get('Arcs', '').strip()
+        # Skip the "Totals" row - it's a summary row, not an arc
+        if arc_name and arc_name != 'Totals':
+            anime_episodes = row.get('Anime Episodes', '').strip()
+            manga_chapters = row.get('Manga Chapters', '').strip()
+            arc_data[arc_name] = {
+                'anime_episodes': anime_episodes,
+                'manga_chapters': manga_chapters
+            }
+    
+    return arc_data
+
+
 def get_arc_order(csv_dir: Path) -> dict:
     """
     Get the ordered list of arcs from Arc Overview.csv along with their episode/chapter ranges.
@@ -489,29 +1039,84 @@ def get_arc_order(csv_dir: Path) -> dict:
     Returns:
         Dictionary mapping arc names to their anime episode and manga chapter ranges
     """
-    overview_path = csv_dir / "Arc Overview.csv"
-    arc_data = {}
+    overview_path = csv_dir / f"{ARC_OVERVIEW_SHEET}.csv"
     
     if overview_path.exists():
-        with open(overview_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                arc_name = row.get('Arcs', '').strip()
-                # Skip the "Totals" row - it's a summary row, not an arc
-                if arc_name and arc_name != 'Totals':
-                    anime_episodes = row.get('Anime Episodes', '').strip()
-                    manga_chapters = row.get('Manga Chapters', '').strip()
-                    arc_data[arc_name] = {
-                        'anime_episodes': anime_episodes,
-                        'manga_chapters': manga_chapters
-                    }
+        return parse_arc_overview(iter_csv_rows(overview_path))
     
-    return arc_data
+    return {}
 
 
-def find_csv_file(csv_dir: Path, arc_name: str) -> Path:
+def get_arc_lookup_key(arc_name: str) -> str:
     """
-    Find the CSV file for a given arc name, trying multiple variations.
+    Reduce an arc name to the key used to match it across files.
+    
+    Removes (TBR)/(WIP) suffixes, apostrophes and a trailing 's', so that
+    spellings like "The Adventures of the Straw Hats (TBR)" and
+    "The Adventures of the Straw Hat" share a key.
+    
+    Args:
+        arc_name: Arc name to reduce
+        
+    Returns:
+        Lookup key for the arc name
+    """
+    key = normalize_arc_name(re.sub(SUFFIX_PATTERNS_TO_REMOVE, '', arc_name))
+    if key.endswith('s'):
+        key = key[:-1]
+    return key
+
+
+def build_arc_name_index(arc_names) -> dict:
+    """
+    Build an index of arc names by their lookup key.
+    
+    Args:
+        arc_names: Iterable of arc names (CSV file stems, summary or saga keys)
+        
+    Returns:
+        Dictionary mapping lookup keys to the list of arc names sharing that key
+    """
+    index = {}
+    for arc_name in arc_names:
+        names = index.setdefault(get_arc_lookup_key(arc_name), [])
+        if arc_name not in names:
+            names.append(arc_name)
+    return index
+
+
+def resolve_arc_name(index: dict, arc_name: str) -> str:
+    """
+    Resolve an arc name against an index built by build_arc_name_index().
+    
+    An exact spelling is preferred, then the name without its (TBR)/(WIP) suffix,
+    then without apostrophes. Otherwise the lookup key must match exactly one name.
+    
+    Args:
+        index: Arc name index from build_arc_name_index()
+        arc_name: Arc name to resolve
+        
+    Returns:
+        The matching indexed arc name, or None if there is no match
+        
+    Raises:
+        ValueError: If the arc name matches more than one indexed name
+    """
+    candidates = index.get(get_arc_lookup_key(arc_name), [])
+    if len(candidates) <= 1:
+        return candidates[0] if candidates else None
+    
+    stripped_name = re.sub(SUFFIX_PATTERNS_TO_REMOVE, '', arc_name)
+    for variation in (arc_name, stripped_name, normalize_arc_name(stripped_name)):
+        if variation in candidates:
+            return variation
+    
+    raise ValueError(f"Arc name '{arc_name}' is ambiguous, it matches: {', '.join(candidates)}")
+
+
+def find_csv_file(csv_dir: Path, arc_name: str, csv_index: dict = None) -> Path:
+    """
+    Find the CSV file for a given arc name.
     
     This handles cases where arc names may have different apostrophes, suffixes,
     or pluralization differences.
@@ -519,55 +1124,161 @@ def find_csv_file(csv_dir: Path, arc_name: str) -> Path:
     Args:
         csv_dir: Directory containing CSV files
         arc_name: Name of the arc to find
+        csv_index: Optional arc name index of the CSV file stems in csv_dir,
+            built from a directory listing if not provided
         
     Returns:
         Path to the CSV file
         
     Raises:
         FileNotFoundError: If no matching CSV file is found
+        ValueError: If more than one CSV file matches the arc name
     """
-    # Remove both (TBR) and (WIP) suffixes when looking for CSV files
-    csv_arc_name = re.sub(SUFFIX_PATTERNS_TO_REMOVE, '', arc_name)
-    
-    # Normalize different types of apostrophes and quotes
-    csv_arc_name_normalized = normalize_arc_name(csv_arc_name)
-    
-    # Try multiple variations to find the CSV file
-    variations = [csv_arc_name, csv_arc_name_normalized]
-    
-    # Try without trailing 's' (e.g., "Straw Hats" -> "Straw Hat")
-    if csv_arc_name_normalized.endswith('s'):
-        csv_arc_name_singular = csv_arc_name_normalized[:-1]
-        variations.append(csv_arc_name_singular)
+    if csv_index is None:
+        csv_index = build_arc_name_index(f.stem for f in csv_dir.glob("*.csv"))
     
-    for variation in variations:
-        csv_path = csv_dir / f"{variation}.csv"
-        if csv_path.exists():
-            return csv_path
+    csv_name = resolve_arc_name(csv_index, arc_name)
+    if csv_name:
+        return csv_dir / f"{csv_name}.csv"
     
     # If we get here, no file was found
     error_msg = f"CSV file not found for arc '{arc_name}'\n"
-    error_msg += f"  Tried: {', '.join(f'{v}.csv' for v in variations)}"
+    error_msg += f"  Looked for: {get_arc_lookup_key(arc_name)}.csv (ignoring apostrophes, (TBR)/(WIP) and plurals)"
     raise FileNotFoundError(error_msg)
 
 
-def configure_yaml_multiline_strings():
+def str_representer(dumper, data):
     """
-    Configure PyYAML to use literal style for multiline strings.
+    Represent multiline strings in literal style.
     
     This preserves newlines without blank lines, making the output more readable.
-    Also configures OrderedDict to be represented as regular YAML mappings.
     """
-    def str_representer(dumper, data):
-        if '\n' in data:
-            return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-        return dumper.represent_scalar('tag:yaml.org,2002:str', data)
+    if '\n' in data:
+        return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data)
+
+
+def ordered_dict_representer(dumper, data):
+    """Represent OrderedDict as a regular YAML mapping."""
+    return dumper.represent_mapping('tag:yaml.org,2002:map', data.items())
+
+
+class MetadataDumper(BaseDumper):
+    """YAML dumper for the metadata file, using the C emitter when libyaml is available."""
+
+
+MetadataDumper.add_representer(str, str_representer)
+MetadataDumper.add_representer(OrderedDict, ordered_dict_representer)
+
+
+def serialize_yaml_node(dumper, node) -> None:
+    """
+    Emit a represented YAML node as a series of events.
     
-    def ordered_dict_representer(dumper, data):
-        return dumper.represent_mapping('tag:yaml.org,2002:map', data.items())
+    Args:
+        dumper: Open MetadataDumper to emit events to
+        node: Node produced by the dumper's representer
+    """
+    if isinstance(node, yaml.ScalarNode):
+        implicit = (
+            node.tag == dumper.resolve(yaml.ScalarNode, node.value, (True, False)),
+            node.tag == dumper.resolve(yaml.ScalarNode, node.value, (False, True))
+        )
+        dumper.emit(yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
+    elif isinstance(node, yaml.SequenceNode):
+        implicit = node.tag == dumper.resolve(yaml.SequenceNode, node.value, True)
+        dumper.emit(yaml.SequenceStartEvent(None, node.tag, implicit, flow_style=node.flow_style))
+        for item in node.value:
+            serialize_yaml_node(dumper, item)
+        dumper.emit(yaml.SequenceEndEvent())
+    else:
+        implicit = node.tag == dumper.resolve(yaml.MappingNode, node.value, True)
+        dumper.emit(yaml.MappingStartEvent(None, node.tag, implicit, flow_style=node.flow_style))
+        for key, value in node.value:
+            serialize_yaml_node(dumper, key)
+            serialize_yaml_node(dumper, value)
+        dumper.emit(yaml.MappingEndEvent())
+
+
+def emit_yaml_value(dumper, data) -> None:
+    """
+    Represent a single value and emit it, without keeping its nodes around afterwards.
     
-    yaml.add_representer(str, str_representer)
-    yaml.add_representer(OrderedDict, ordered_dict_representer)
+    Args:
+        dumper: Open MetadataDumper to emit events to
+        data: Value to emit
+    """
+    serialize_yaml_node(dumper, dumper.represent_data(data))
+    dumper.represented_objects = {}
+    dumper.object_keeper = []
+    dumper.alias_key = None
+
+
+def emit_yaml_mapping(dumper, data: dict, depth: int) -> None:
+    """
+    Emit a mapping one entry at a time, streaming nested mappings up to depth levels down.
+    
+    Args:
+        dumper: Open MetadataDumper to emit events to
+        data: Mapping to emit
+        depth: Number of mapping levels to stream before representing values whole
+    """
+    dumper.emit(yaml.MappingStartEvent(None, 'tag:yaml.org,2002:map', True, flow_style=False))
+    for key, value in data.items():
+        emit_yaml_value(dumper, key)
+        if depth > 1 and isinstance(value, dict) and value:
+            emit_yaml_mapping(dumper, value, depth - 1)
+        else:
+            emit_yaml_value(dumper, value)
+    dumper.emit(yaml.MappingEndEvent())
+
+
+def write_metadata_file(metadata_structure: dict, output_path: Path) -> bool:
+    """
+    Write the metadata YAML file, streaming one season at a time.
+    
+    The file is written to a temporary path first and only moved into place if
+    its content differs from the existing file, so unchanged output keeps its mtime.
+    
+    Args:
+        metadata_structure: Metadata structure from build_metadata_structure()
+        output_path: Path to the output YAML file
+        
+    Returns:
+        True if the file was written, False if the existing file was already identical
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(f".{output_path.name}.tmp")
+    
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            # Write the yaml-language-server comment at the top
+            f.write('# yaml-language-server: $schema=https://json-schema.org/draft-07/schema\n')
+            
+            dumper = MetadataDumper(
+                f,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+                width=80  # Wrap long lines at 80 characters for readability
+            )
+            dumper.emit(yaml.StreamStartEvent())
+            dumper.emit(yaml.DocumentStartEvent(explicit=False))
+            # metadata -> One Pace -> seasons -> each season
+            emit_yaml_mapping(dumper, metadata_structure, depth=4)
+            dumper.emit(yaml.DocumentEndEvent(explicit=False))
+            dumper.emit(yaml.StreamEndEvent())
+            dumper.dispose()
+        
+        if output_path.exists() and filecmp.cmp(temp_path, output_path, shallow=False):
+            temp_path.unlink()
+            return False
+        
+        os.replace(temp_path, output_path)
+        return True
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
 
 
 def main():
@@ -580,6 +1291,10 @@ def main():
         default="data/one-pace/csvs",
         help="Directory containing CSV files (default: data/one-pace/csvs)"
     )
+    parser.add_argument(
+        "--xlsx",
+        help="Read the arc sheets straight from the One Pace workbook (.xlsx) instead of --csv-dir"
+    )
     parser.add_argument(
         "--output",
         default="metadata/one-pace.yml",
@@ -606,84 +1321,212 @@ def main():
         default="data/one-pace/episodes.yml",
         help="Episodes YAML file (default: data/one-pace/episodes.yml)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse arc sheets (default: 1)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rebuild seasons whose inputs changed since the last incremental run"
+    )
+    parser.add_argument(
+        "--manifest",
+        default="data/one-pace/manifest.json",
+        help="Content hash manifest used by --incremental (default: data/one-pace/manifest.json)"
+    )
+    parser.add_argument(
+        "--yaml-cache",
+        default="data/one-pace/.yaml-cache",
+        help="Directory caching the parsed YAML input files (default: data/one-pace/.yaml-cache)"
+    )
+    parser.add_argument(
+        "--no-yaml-cache",
+        action="store_true",
+        help="Always parse the YAML input files instead of using --yaml-cache"
+    )
     
     args = parser.parse_args()
     
-    csv_dir = Path(args.csv_dir)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
     
-    if not csv_dir.exists():
+    csv_dir = Path(args.csv_dir)
+    cache_dir = None if args.no_yaml_cache else Path(args.yaml_cache)
+    sheets = None
+    
+    if args.xlsx:
+        # Stream every sheet straight out of the workbook, skipping the CSV export
+        xlsx_path = Path(args.xlsx)
+        if not xlsx_path.exists():
+            print(f"Error: Workbook not found: {xlsx_path}", file=sys.stderr)
+            sys.exit(1)
+        sheets = load_workbook_sheets(xlsx_path)
+        arc_sheet_names = [name for name in sheets if name != ARC_OVERVIEW_SHEET]
+    elif not csv_dir.exists():
         print(f"Error: CSV directory not found: {csv_dir}", file=sys.stderr)
         sys.exit(1)
+    else:
+        arc_sheet_names = [f.stem for f in csv_dir.glob("*.csv") if f.stem != ARC_OVERVIEW_SHEET]
     
     # Load episode titles from episodes.yml
     episodes_file = Path(args.episodes)
-    episode_titles = load_episode_titles(episodes_file)
+    episode_titles = load_episode_titles(episodes_file, cache_dir)
     
     # Get arc data from Arc Overview
-    arc_overview_data = get_arc_order(csv_dir)
+    if sheets is not None:
+        arc_overview_data = parse_arc_overview(sheets.get(ARC_OVERVIEW_SHEET, []))
+    else:
+        arc_overview_data = get_arc_order(csv_dir)
     
     if not arc_overview_data:
-        print("Warning: Could not read Arc Overview.csv, using alphabetical order", file=sys.stderr)
-        # Fallback to all CSV files except Arc Overview
-        csv_files = [f for f in csv_dir.glob("*.csv") if f.stem != "Arc Overview"]
-        arc_order = [f.stem for f in sorted(csv_files)]
+        print("Warning: Could not read Arc Overview, using alphabetical order", file=sys.stderr)
+        # Fallback to all arc sheets except Arc Overview
+        arc_order = sorted(arc_sheet_names)
     else:
         arc_order = list(arc_overview_data.keys())
     
-    arcs_data = []
+    # Determine the source metadata file (use existing output file if it exists)
+    output_path = Path(args.output)
+    existing_metadata_file = output_path if output_path.exists() else Path("metadata/one-pace.yml")
+    summaries_file = Path(args.summaries)
+    sagas_file = Path(args.sagas)
     
-    # Process each arc in order
+    # In incremental mode, arcs are only reused if the shared inputs and the
+    # previously generated file are exactly what the manifest recorded
+    manifest_file = Path(args.manifest)
+    input_hashes = {
+        'episodes': hash_file(episodes_file),
+        'summaries': hash_file(summaries_file),
+        'sagas': hash_file(sagas_file)
+    }
+    previous_arcs = {}
+    existing_seasons = {}
+    if args.incremental:
+        manifest = load_manifest(manifest_file)
+        if (manifest.get('start_season') == args.start_season and
+            manifest.get('output') == hash_file(existing_metadata_file) and
+            manifest.get('inputs', {}).get('summaries') == input_hashes['summaries'] and
+            manifest.get('inputs', {}).get('sagas') == input_hashes['sagas']):
+            previous_arcs = manifest.get('arcs', {})
+            existing_seasons = load_existing_seasons(existing_metadata_file, cache_dir)
+        else:
+            print("Incremental manifest is missing or outdated, rebuilding all arcs")
+    
+    arcs_data = []
+    arc_records = {}
+    reused_seasons = {}
+    season_coverage = {}
+    rebuilt_arcs = []
+    
+    # Locate each arc's sheet (from a single listing) and fingerprint its inputs
+    sheet_index = build_arc_name_index(arc_sheet_names)
+    arc_inputs = []
     for season_num, arc_name in enumerate(arc_order, start=args.start_season):
         try:
-            csv_path = find_csv_file(csv_dir, arc_name)
-        except FileNotFoundError as e:
+            if sheets is not None:
+                sheet_name = resolve_arc_name(sheet_index, arc_name)
+                if not sheet_name:
+                    raise ValueError(f"Sheet not found for arc '{arc_name}' in {args.xlsx}")
+                source = (sheet_name, sheets[sheet_name])
+                source_hash = hash_rows(sheets[sheet_name])
+            else:
+                source = find_csv_file(csv_dir, arc_name, sheet_index)
+                source_hash = hash_file(source)
+        except (FileNotFoundError, ValueError) as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(1)
         
+        # Remove (TBR) from arc name for metadata, but keep (WIP)
+        clean_arc_name = re.sub(r'\s*\(TBR\)\s*$', '', arc_name)
+        fingerprint = get_arc_fingerprint(
+            source_hash,
+            season_num,
+            episode_titles.get(season_num, {}),
+            arc_overview_data.get(clean_arc_name, {})
+        )
+        arc_inputs.append((season_num, arc_name, clean_arc_name, source, fingerprint))
+    
+    # Parse every arc that can't be reused up front, spread across --jobs processes
+    parse_indexes = [index for index, (_, arc_name, _, _, fingerprint) in enumerate(arc_inputs)
+                     if previous_arcs.get(arc_name, {}).get('fingerprint') != fingerprint]
+    parsed_arcs = dict(zip(parse_indexes, parse_arc_sources(
+        [(arc_inputs[index][3], arc_inputs[index][0]) for index in parse_indexes],
+        episode_titles,
+        args.jobs
+    )))
+    
+    # Process each arc in order
+    for index, (season_num, arc_name, clean_arc_name, source, fingerprint) in enumerate(arc_inputs):
+        output_season = args.start_season + len(arcs_data)
+        
+        # Reuse the previously generated season if none of its inputs changed
+        previous = previous_arcs.get(arc_name, {})
+        if previous.get('fingerprint') == fingerprint:
+            if previous.get('season') is None:
+                print(f"Unchanged: {arc_name}")
+                print(f"  Warning: No episodes found in {arc_name}, skipping", file=sys.stderr)
+                arc_records[arc_name] = {'fingerprint': fingerprint, 'season': None}
+                continue
+            existing_season = existing_seasons.get(output_season)
+            if (previous.get('season') == output_season and
+                existing_season and existing_season.get('title') == clean_arc_name):
+                print(f"Unchanged: {arc_name}")
+                reused_seasons[output_season] = existing_season
+                arcs_data.append((clean_arc_name, existing_season.get('episodes', {})))
+                arc_records[arc_name] = {'fingerprint': fingerprint, 'season': output_season}
+                continue
+        
         print(f"Processing: {arc_name}")
+        rebuilt_arcs.append(arc_name)
         
-        arc_data = parse_csv_file(csv_path, season_num, episode_titles)
+        if index in parsed_arcs:
+            arc_data = parsed_arcs[index]
+        else:
+            # A reusable arc whose season moved or went missing from the existing file
+            arc_data = parse_arc_source(source, season_num, episode_titles)
         
         if not arc_data['episodes']:
             print(f"  Warning: No episodes found in {arc_name}, skipping", file=sys.stderr)
+            arc_records[arc_name] = {'fingerprint': fingerprint, 'season': None}
             continue
         
-        # Remove (TBR) from arc name for metadata, but keep (WIP)
-        clean_arc_name = re.sub(r'\s*\(TBR\)\s*$', '', arc_name)
         arcs_data.append((clean_arc_name, arc_data['episodes']))
+        season_coverage[output_season] = arc_data['coverage']
+        arc_records[arc_name] = {'fingerprint': fingerprint, 'season': output_season}
         print(f"  ✓ Found {len(arc_data['episodes'])} episodes")
     
-    # Determine the source metadata file (use existing output file if it exists)
-    output_path = Path(args.output)
-    existing_metadata_file = output_path if output_path.exists() else Path("metadata/one-pace.yml")
-    summaries_file = Path(args.summaries)
-    sagas_file = Path(args.sagas)
-    
     # Build the metadata structure
-    metadata_structure = build_metadata_structure(arcs_data, args.start_season, existing_metadata_file, summaries_file, sagas_file, arc_overview_data)
-    
-    # Configure PyYAML to use literal style for multiline strings (preserves newlines without blank lines)
-    configure_yaml_multiline_strings()
+    try:
+        metadata_structure = build_metadata_structure(arcs_data, args.start_season, existing_metadata_file, summaries_file, sagas_file, arc_overview_data, reused_seasons, season_coverage, cache_dir)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     
-    # Write output using PyYAML
+    # Write output using PyYAML, leaving the file untouched if nothing changed
     output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = write_metadata_file(metadata_structure, output_path)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        # Write the yaml-language-server comment at the top
-        f.write('# yaml-language-server: $schema=https://json-schema.org/draft-07/schema\n')
-        
-        yaml.dump(
-            metadata_structure,
-            f,
-            default_flow_style=False,
-            allow_unicode=True,
-            sort_keys=False,
-            width=80  # Wrap long lines at 80 characters for readability
-        )
+    if args.incremental:
+        save_manifest(manifest_file, {
+            'version': MANIFEST_VERSION,
+            'start_season': args.start_season,
+            'inputs': input_hashes,
+            'output': hash_file(output_path),
+            'arcs': arc_records
+        })
     
     print(f"\n✓ Successfully generated metadata for {len(arcs_data)} arcs")
-    print(f"  Output written to: {output_path}")
+    if args.incremental:
+        print(f"  Rebuilt {len(rebuilt_arcs)} arc(s): {', '.join(rebuilt_arcs) if rebuilt_arcs else 'none'}")
+        print(f"  Reused {len(arc_order) - len(rebuilt_arcs)} unchanged arc(s)")
+        print(f"  Manifest written to: {manifest_file}")
+    if written:
+        print(f"  Output written to: {output_path}")
+    else:
+        print(f"  Output unchanged, left {output_path} as is")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for TMDb, TVDb and TPDb API responses.
+
+Responses are stored by method and URL (authentication query parameters and
+headers aren't part of the key) with the time they were fetched. A cached
+response younger than its provider's TTL is served from disk. An older one
+is revalidated with If-None-Match/If-Modified-Since, and a 304 only
+refreshes its timestamp. The cache is bounded in size and evicts the least
+recently used responses first. In offline mode (--offline or
+HTTP_CACHE_OFFLINE=1) only cached responses are served, whatever their age.
+
+The fetch command mimics `curl -s -w "%{http_code}" -o FILE` so the shell
+functions can use the cache as a drop-in for their curl call. TokenBucket
+and parse_retry_after() are the rate limiting helpers shared by the API
+clients.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Constants
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = REPO_ROOT / ".http-cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+EVICT_TARGET = 0.9  # Evict down to this fraction of the maximum size
+DAY = 24 * 60 * 60
+DEFAULT_TTL = DAY
+PROVIDER_TTLS = {
+    'api.themoviedb.org': 7 * DAY,
+    'api4.thetvdb.com': 7 * DAY,
+    'theposterdb.com': DAY,
+}
+REQUEST_TIMEOUT = 30
+SECRET_QUERY_PARAMS = {'api_key', 'apikey', 'token'}
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+ENTRY_SUFFIX = '.cache'
+
+
+def parse_retry_after(value: str):
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value: Header value, either seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate to one provider.
+    
+    Tokens refill at `rate` per second up to `capacity`. pause() empties the
+    bucket and holds every caller until the pause is over, which is how a
+    Retry-After from one request slows down all workers.
+    """
+    
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.updated:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    # Paused, updated is when the pause ends
+                    wait = self.updated - now
+            time.sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """Hold all callers for the given number of seconds."""
+        with self.lock:
+            self.tokens = 0.0
+            self.updated = max(self.updated, time.monotonic() + seconds)
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode for responses that aren't cached."""
+
+
+class CachedResponse:
+    """
+    A response served from or stored in the cache.
+    
+    Has the status_code, headers, content, text and json() that callers use
+    from requests responses, plus from_cache and stored_at.
+    """
+    
+    def __init__(self, status_code: int, headers: dict, content: bytes, stored_at: float = None, from_cache: bool = False):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at if stored_at is not None else time.time()
+        self.from_cache = from_cache
+    
+    @property
+    def text(self) -> str:
+        """Body decoded as UTF-8."""
+        return self.content.decode('utf-8', errors='replace')
+    
+    def json(self):
+        """Body decoded as JSON."""
+        return json.loads(self.content)
+
+
+def get_cache_url(url: str) -> str:
+    """
+    Get the URL a response is cached under, without authentication query parameters.
+    
+    Args:
+        url: Request URL including its query string
+    
+    Returns:
+        URL with SECRET_QUERY_PARAMS removed and the remaining parameters sorted
+    """
+    parts = urlsplit(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in SECRET_QUERY_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def get_ttl(url: str) -> float:
+    """
+    Get how long a response stays fresh before it is revalidated.
+    
+    Args:
+        url: Request URL
+    
+    Returns:
+        TTL in seconds of the URL's provider, DEFAULT_TTL for other hosts
+    """
+    host = (urlsplit(url).hostname or '').lower()
+    for provider_host, ttl in PROVIDER_TTLS.items():
+        if host == provider_host or host.endswith(f".{provider_host}"):
+            return ttl
+    return DEFAULT_TTL
+
+
+def is_enabled(value) -> bool:
+    """Check an environment flag like HTTP_CACHE_OFFLINE."""
+    return str(value or '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class ResponseCache:
+    """
+    Size-bounded, least recently used response cache in a directory.
+    
+    Each response is one file named by the SHA-256 of its method and cache
+    URL: a JSON header line followed by the body. A file's modification time
+    is when it was last served, which is the order eviction follows. The
+    cache is safe to share between threads and between processes.
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = None):
+        self.cache_dir = Path(cache_dir or os.environ.get('HTTP_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.offline = is_enabled(os.environ.get('HTTP_CACHE_OFFLINE')) if offline is None else offline
+        self.total_size = None  # Counted on the first store
+        self.lock = threading.Lock()
+    
+    def get_path(self, method: str, url: str) -> Path:
+        """Get the file a response is cached in."""
+        key = hashlib.sha256(f"{method.upper()} {get_cache_url(url)}".encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}{ENTRY_SUFFIX}"
+    
+    def lookup(self, method: str, url: str):
+        """
+        Read a cached response.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+        
+        Returns:
+            CachedResponse, or None if the response isn't cached (or the entry is unreadable)
+        """
+        path = self.get_path(method, url)
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(header['status'], header['headers'], content, header['stored_at'], from_cache=True)
+    
+    def touch(self, method: str, url: str) -> None:
+        """Mark a cached response as recently used."""
+        try:
+            os.utime(self.get_path(method, url))
+        except OSError:
+            pass
+    
+    def store(self, method: str, url: str, response: CachedResponse) -> None:
+        """
+        Write a response to the cache, evicting old responses if it grows too large.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            response: Response to store
+        """
+        path = self.get_path(method, url)
+        header = {
+            'method': method.upper(),
+            'url': get_cache_url(url),
+            'status': response.status_code,
+            'headers': response.headers,
+            'stored_at': response.stored_at,
+        }
+        data = json.dumps(header).encode('utf-8') + b'\n' + response.content
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            previous_size = path.stat().st_size
+        except OSError:
+            previous_size = 0
+        temp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+        os.replace(temp_file, path)
+        
+        with self.lock:
+            if self.total_size is None:
+                self.total_size = self.get_size()
+            else:
+                self.total_size += len(data) - previous_size
+            if self.total_size > self.max_bytes:
+                self.evict(int(self.max_bytes * EVICT_TARGET))
+    
+    def iter_entries(self):
+        """Yield the DirEntry of every cached response."""
+        if not self.cache_dir.is_dir():
+            return
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    yield entry
+    
+    def get_size(self) -> int:
+        """Get the total size of the cached responses in bytes."""
+        return sum(entry.stat().st_size for entry in self.iter_entries())
+    
+    def evict(self, target_bytes: int) -> int:
+        """
+        Delete the least recently used responses until the cache fits the target size.
+        
+        Args:
+            target_bytes: Size to shrink the cache to
+        
+        Returns:
+            Number of responses deleted
+        """
+        entries = []
+        for entry in self.iter_entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in entries:
+            if total_size <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            deleted += 1
+        self.total_size = total_size
+        return deleted
+    
+    def fetch(self, url: str, send, method: str = 'GET', ttl: float = None) -> CachedResponse:
+        """
+        Get a response from the cache, revalidating or fetching it when needed.
+        
+        Args:
+            url: Request URL including its query string
+            send: Callable making the request, called with the conditional
+                headers to add and returning a requests response
+            method: HTTP method
+            ttl: Seconds a cached response stays fresh (default: the provider's TTL)
+        
+        Returns:
+            CachedResponse (from_cache is True if no full response was downloaded)
+        
+        Raises:
+            CacheMiss: In offline mode, if the response isn't cached
+        """
+        cached = self.lookup(method, url)
+        if cached is not None:
+            age = time.time() - cached.stored_at
+            if self.offline or age < (get_ttl(url) if ttl is None else ttl):
+                self.touch(method, url)
+                return cached
+        if self.offline:
+            raise CacheMiss(f"{get_cache_url(url)} is not cached (offline)")
+        
+        conditional_headers = {}
+        if cached is not None:
+            if cached.headers.get('ETag'):
+                conditional_headers['If-None-Match'] = cached.headers['ETag']
+            if cached.headers.get('Last-Modified'):
+                conditional_headers['If-Modified-Since'] = cached.headers['Last-Modified']
+        
+        response = send(conditional_headers)
+        if response.status_code == 304 and cached is not None:
+            cached.stored_at = time.time()
+            self.store(method, url, cached)
+            return cached
+        
+        headers = {name: response.headers[name] for name in STORED_HEADERS if response.headers.get(name)}
+        result = CachedResponse(response.status_code, headers, response.content)
+        if response.status_code == 200:
+            self.store(method, url, result)
+        return result
+    
+    def clear(self) -> int:
+        """
+        Delete every cached response.
+        
+        Returns:
+            Number of responses deleted
+        """
+        with self.lock:
+            deleted = self.evict(0)
+        return deleted
+
+
+def create_session(cache: ResponseCache = None, bucket: TokenBucket = None):
+    """
+    Create a requests session whose GET requests go through the cache.
+    
+    Meant for libraries that accept a session, like tmdbsimple's
+    REQUESTS_SESSION. Offline cache misses raise requests.ConnectionError.
+    The session is safe to share between threads.
+    
+    Args:
+        cache: Cache to use (default: a ResponseCache with the default settings)
+        bucket: Rate limit for the requests that reach the network, cache hits don't count
+    
+    Returns:
+        requests.Session
+    """
+    import http.client
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.structures import CaseInsensitiveDict
+    
+    cache = cache or ResponseCache()
+    
+    class CachingAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            if request.method != 'GET':
+                if bucket is not None:
+                    bucket.acquire()
+                return super().send(request, **kwargs)
+            
+            def send_request(conditional_headers):
+                request.headers.update(conditional_headers)
+                if bucket is not None:
+                    bucket.acquire()
+                return HTTPAdapter.send(self, request, **kwargs)
+            
+            try:
+                cached = cache.fetch(request.url, send_request)
+            except CacheMiss as e:
+                raise requests.ConnectionError(str(e), request=request) from e
+            response = requests.Response()
+            response.status_code = cached.status_code
+            response.reason = http.client.responses.get(cached.status_code, '')
+            response.headers = CaseInsensitiveDict(cached.headers)
+            response._content = cached.content
+            response.encoding = 'utf-8'
+            response.url = request.url
+            response.request = request
+            return response
+    
+    session = requests.Session()
+    adapter = CachingAdapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def parse_header(text: str) -> tuple:
+    """
+    Parse a curl-style "Name: value" header argument.
+    
+    Args:
+        text: Header argument
+    
+    Returns:
+        Tuple of (name, value)
+    
+    Raises:
+        argparse.ArgumentTypeError: If the argument has no colon
+    """
+    name, separator, value = text.partition(':')
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f"invalid header '{text}', expected 'Name: value'")
+    return name.strip(), value.strip()
+
+
+def fetch_command(args) -> None:
+    """Run the fetch command, exiting like curl -s -w "%{http_code}" would be checked."""
+    cache = ResponseCache(args.cache_dir, offline=True if args.offline else None)
+    request_headers = dict(args.header or [])
+    
+    def send(conditional_headers):
+        import requests
+        
+        return requests.get(args.url, headers={**request_headers, **conditional_headers}, timeout=REQUEST_TIMEOUT)
+    
+    try:
+        response = cache.fetch(args.url, send, ttl=args.ttl)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if args.output:
+            print("000")
+        sys.exit(1)
+    
+    if args.output:
+        with open(args.output, 'wb') as f:
+            f.write(response.content)
+        print(response.status_code)
+        return
+    
+    sys.stdout.buffer.write(response.content)
+    sys.stdout.flush()
+    if not 200 <= response.status_code < 300:
+        print(f"Error: HTTP {response.status_code}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Persistent response cache for TMDb, TVDb and TPDb lookups"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=f"Cache directory (default: $HTTP_CACHE_DIR or {DEFAULT_CACHE_DIR.name} in the repository root)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    fetch_parser = subparsers.add_parser("fetch", help="GET a URL through the cache")
+    fetch_parser.add_argument("url", help="URL to fetch")
+    fetch_parser.add_argument(
+        "-H", "--header",
+        action="append",
+        type=parse_header,
+        help="Request header ('Name: value'), can be repeated"
+    )
+    fetch_parser.add_argument(
+        "-o", "--output",
+        help="Write the body to this file and print the HTTP status code instead"
+    )
+    fetch_parser.add_argument("--ttl", type=float, help="Seconds a cached response stays fresh (default: per provider)")
+    fetch_parser.add_argument("--offline", action="store_true", help="Only serve cached responses")
+    
+    subparsers.add_parser("stats", help="Print the number and size of the cached responses")
+    subparsers.add_parser("clear", help="Delete every cached response")
+    
+    args = parser.parse_args()
+    
+    if args.command == 'fetch':
+        fetch_command(args)
+        return
+    
+    cache = ResponseCache(args.cache_dir)
+    if args.command == 'stats':
+        entries = list(cache.iter_entries())
+        size = sum(entry.stat().st_size for entry in entries)
+        print(f"{len(entries)} cached responses, {size / (1024 * 1024):.1f} MiB in {cache.cache_dir}")
+    else:
+        print(f"✓ Deleted {cache.clear()} cached responses from {cache.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Merge a manual-metadata-sync payload into the movie and show metadata files.
+
+This script reads the JSON payload posted by kometa-post-metadata-info.py
+({"movies": [...], "shows": [...]}), loads movie-metadata.yml and
+show-metadata.yml through their offset index, adds the new items (and the
+missing seasons of existing shows) with the same validation and
+sort_title/tpdb_search derivation as functions/yaml/insert-media-item.sh, and
+writes each file once, splicing in only the entries that changed.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from metadata_offset_index import OffsetIndexedMetadata
+from metadata_yaml import get_sort_title, get_tpdb_search, validate_media_item
+
+
+def build_media_item(media_type: str, title: str, release_year: str, seasons: list) -> dict:
+    """
+    Build a new metadata entry in the field order of insert-media-item.sh.
+    
+    Args:
+        media_type: "movie" or "show"
+        title: Label title of the item
+        release_year: Release year of the item
+        seasons: Season numbers (shows only)
+    
+    Returns:
+        Metadata entry dictionary
+    """
+    item = {
+        'label_title': title,
+        'sort_title': get_sort_title(title),
+        'release_year': release_year,
+        'url_poster': '',
+        'tpdb_search': get_tpdb_search(title, media_type),
+        'genre.sync': []
+    }
+    if media_type == 'show' and seasons:
+        item['seasons'] = {season: {'url_poster': ''} for season in sorted(seasons)}
+    return item
+
+
+def get_season_numbers(media_item: dict) -> list:
+    """
+    Get the season numbers of a payload item.
+    
+    Args:
+        media_item: Show from the payload
+    
+    Returns:
+        List of season numbers, empty if the item has no seasons
+    """
+    return [int(season['number']) for season in media_item.get('seasons') or []]
+
+
+def ingest_media_items(metadata: dict, media_type: str, media_items: list) -> dict:
+    """
+    Merge payload items of one type into a metadata mapping.
+    
+    Args:
+        metadata: Entries of the metadata file (OffsetIndexedMetadata or a dictionary), updated in place
+        media_type: "movie" or "show"
+        media_items: Payload items with db_id, title, release_year (and seasons for shows)
+    
+    Returns:
+        Dictionary with 'added', 'seasons' (seasons added to existing shows)
+        and 'skipped' (invalid items) counts
+    """
+    counts = {'added': 0, 'seasons': 0, 'skipped': 0}
+    for media_item in media_items:
+        txdb_id = media_item.get('db_id')
+        existing = metadata.get(txdb_id)
+        if existing is not None:
+            if media_type != 'show':
+                continue
+            # Show exists, only add the seasons it is missing
+            seasons = existing.get('seasons') or {}
+            for season in get_season_numbers(media_item):
+                if season not in seasons:
+                    print(f"Season {season} of {txdb_id} does not exist, adding")
+                    seasons[season] = {'url_poster': ''}
+                    counts['seasons'] += 1
+            if seasons:
+                existing['seasons'] = seasons
+            continue
+        
+        title = media_item.get('title') or ''
+        release_year = str(media_item.get('release_year') or '')
+        if release_year == 'Unknown':
+            release_year = ''
+        error = validate_media_item(txdb_id, media_type, release_year)
+        if error:
+            print(f"Warning: Skipping {media_type} {txdb_id} ({title}): {error}", file=sys.stderr)
+            counts['skipped'] += 1
+            continue
+        
+        print(f"Adding {media_type} {txdb_id}: {title} ({release_year})")
+        metadata[int(txdb_id)] = build_media_item(media_type, title, release_year, get_season_numbers(media_item))
+        counts['added'] += 1
+    return counts
+
+
+def ingest_payload(payload_file: Path, movie_file: Path, show_file: Path) -> dict:
+    """
+    Merge a payload into the metadata files, writing each file at most once.
+    
+    Args:
+        payload_file: Path to the JSON payload
+        movie_file: Path to movie-metadata.yml
+        show_file: Path to show-metadata.yml
+    
+    Returns:
+        Dictionary of media type -> counts from ingest_media_items()
+    
+    Raises:
+        FileNotFoundError: If the payload or a metadata file doesn't exist
+    """
+    with open(payload_file, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    
+    results = {}
+    for media_type, metadata_file in (('movie', movie_file), ('show', show_file)):
+        media_items = payload.get(f'{media_type}s') or []
+        if not media_items:
+            continue
+        if not metadata_file.exists():
+            raise FileNotFoundError(f"Metadata file not found: {metadata_file}")
+        # Only the entries the payload touches are parsed, changes are spliced into the file
+        metadata = OffsetIndexedMetadata(metadata_file)
+        results[media_type] = ingest_media_items(metadata, media_type, media_items)
+        if metadata.write():
+            print(f"✓ Updated {metadata_file}")
+    return results
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Merge a manual-metadata-sync payload into the metadata files"
+    )
+    parser.add_argument(
+        "payload",
+        help="Path to the JSON payload with 'movies' and 'shows' lists"
+    )
+    parser.add_argument(
+        "--movie-file",
+        default="movie-metadata.yml",
+        help="Path to the movie metadata file (default: movie-metadata.yml)"
+    )
+    parser.add_argument(
+        "--show-file",
+        default="show-metadata.yml",
+        help="Path to the show metadata file (default: show-metadata.yml)"
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        results = ingest_payload(Path(args.payload), Path(args.movie_file), Path(args.show_file))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    for media_type, counts in results.items():
+        print(f"{media_type.capitalize()}s: {counts['added']} added, {counts['seasons']} season(s) added to existing items,"
+              f" {counts['skipped']} skipped")
+
+
+if __name__ == "__main__":
+    main()
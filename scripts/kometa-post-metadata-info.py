@@ -1,82 +1,542 @@
 # THIS IS THE CLIENT SIDE SCRIPT
 
+import argparse
+import base64
+import functools
+import gzip
 import os
 import re
-import requests
 import json
+import queue
+import select
+import struct
+import threading
+import time
+import uuid
+from concurrent.futures import Future, wait
 from pprint import pp
 
 movie_dir = '/media/plex/movies' # Replace with the path to your movies root dir
 show_dir = '/media/plex/shows' # Replace with the path to your shows root dir
 kometa_configs_repository = 'chase-roohms/kometa-configs' # Replace with your repository
 token = 'REPLACE_ME_WITH_GH_FGPAT'
-post_data = {
-    'movies': list(),
-    'shows': list()
-}
-
-def repository_dispatch(data: dict):
-    response = requests.post(
-        url=f'https://api.github.com/repos/{kometa_configs_repository}/dispatches',
-        headers={
+scan_workers = 16 # Number of show folders whose seasons are scanned at the same time
+scan_timeout = 300 # Seconds to wait for the season folders of all shows, shows not listed by then are skipped
+state_file = 'kometa-post-metadata-state.json' # Remembers what was already posted so later runs only send changes
+state_version = 1
+settle_ns = 2_000_000_000 # Folders modified this close to the start of a scan are listed again next run
+github_api_url = 'https://api.github.com'
+dispatch_max_chars = 60000 # GitHub rejects client payloads over 65,535 characters, larger inventories are split into chunks
+dispatch_compress = True # gzip + base64 encode chunks so more items fit in each dispatch
+dispatch_retries = 5 # Retries with exponential backoff when GitHub answers 429 or 5xx
+dispatch_backoff = 2 # Seconds to wait before the first retry, doubled for each following one
+watch_debounce = 10 # --watch: seconds without new folder events before the affected folders are posted
+watch_max_delay = 120 # --watch: post at the latest this many seconds after the first event, even if events keep coming
+watch_poll_interval = 60 # --watch: seconds between scans when inotify isn't available (or with --poll)
+
+# inotify(7) event flags and the fixed part of each event read from the inotify file descriptor
+inotify_create = 0x00000100
+inotify_moved_to = 0x00000080
+inotify_queue_overflow = 0x00004000
+inotify_ignored = 0x00008000
+inotify_is_dir = 0x40000000
+inotify_event = struct.Struct('iIII')
+
+def encode_chunk(items: list[tuple[str, dict]], compress: bool) -> str | dict:
+    data = {'movies': list(), 'shows': list()}
+    for kind, item in items:
+        data[kind].append(item)
+    if not compress:
+        return data
+    return base64.b64encode(gzip.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))).decode('ascii')
+
+def chunk_payload(data: str | dict, batch: str, index: int, count: int, compress: bool) -> dict:
+    return {
+        'batch': batch,
+        'chunk': index,
+        'chunks': count,
+        'encoding': 'gzip+base64' if compress else 'json',
+        'data': data
+    }
+
+def split_items(items: list[tuple[str, dict]], max_chars: int, compress: bool, batch: str) -> list[str | dict]:
+    # Halve any chunk that doesn't fit, sized with the largest chunk numbers it could get
+    encoded = encode_chunk(items, compress)
+    payload = chunk_payload(encoded, batch, len(items), len(items), compress)
+    if len(json.dumps(payload)) <= max_chars:
+        return [encoded]
+    if len(items) == 1:
+        raise ValueError(f"'{items[0][1]['title']}' alone is larger than the {max_chars} character dispatch limit")
+    middle = len(items) // 2
+    return split_items(items[:middle], max_chars, compress, batch) + split_items(items[middle:], max_chars, compress, batch)
+
+def build_dispatch_payloads(data: dict, max_chars: int = dispatch_max_chars, compress: bool = dispatch_compress) -> list[dict]:
+    # Small inventories keep the original single {"data": ...} payload
+    if len(json.dumps({'data': data})) <= max_chars:
+        return [{'data': data}]
+    items = [('movies', movie) for movie in data['movies']] + [('shows', show) for show in data['shows']]
+    batch = uuid.uuid4().hex[:12]
+    chunks = split_items(items, max_chars, compress, batch)
+    return [chunk_payload(chunk, batch, index, len(chunks), compress) for index, chunk in enumerate(chunks)]
+
+def post_with_retry(session, url: str, body: dict, retries: int = dispatch_retries, backoff: float = dispatch_backoff):
+    import requests
+    for attempt in range(retries + 1):
+        try:
+            response = session.post(url, data=json.dumps(body), timeout=30)
+        except requests.ConnectionError as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f'Could not reach GitHub ({e}), retrying in {delay}s')
+        else:
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if attempt == retries:
+                return response
+            # Rate limited responses say how long to wait
+            retry_after = response.headers.get('Retry-After', '')
+            delay = int(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt
+            print(f'GitHub answered {response.status_code}, retrying in {delay}s')
+        time.sleep(delay)
+
+def repository_dispatch(data: dict, api_url: str = github_api_url):
+    # Imported here since runs with nothing new never post anything
+    import requests
+    payloads = build_dispatch_payloads(data)
+    url = f'{api_url}/repos/{kometa_configs_repository}/dispatches'
+    with requests.Session() as session:
+        session.headers.update({
             'Authorization': f'Bearer {token}',
             'Accept': 'Accept: application/vnd.github.v3+json',
-        },
-        data=json.dumps({
-            "event_type": "metadata_file_update",
-            "client_payload": {"data": data}
+        })
+        for payload in payloads:
+            if 'batch' in payload:
+                print(f"Posting chunk {payload['chunk'] + 1} of {payload['chunks']}")
+            response = post_with_retry(session, url, {
+                "event_type": "metadata_file_update",
+                "client_payload": payload
             })
-    )
-    if response.status_code != 204:
-        raise Exception(f'Something went wrong posting the data to GitHub\n\t\t{response.text}')
+            if response.status_code != 204:
+                raise Exception(f'Something went wrong posting the data to GitHub\n\t\t{response.text}')
+
+def folder_entry_iterator(root_dir):
+    # DirEntry.is_dir() uses the file type returned with the listing, so no extra stat per entry
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield entry
 
 def folder_iterator(root_dir):
-    for file in os.listdir(root_dir):
-        if os.path.isdir(f'{root_dir}/{file}'):
-            yield file
-
-def get_media_info(folder: str, match: re.Match[str]) -> tuple[str, str, str]:
-    db_id_str       = match.group(0)
-    db_id_str       = db_id_str.replace('{tmdb-', '')
-    db_id_str       = db_id_str.replace('{tvdb-', '')
-    db_id_str       = db_id_str.replace('}', '')
-    db_id           = int(db_id_str)
-    year_match      = re.search(r'\([0-9]{4}\)', folder)
-    year            = year_match.group(0) if year_match is not None else '(Unknown)'
-    release_year    = year.replace('(', '').replace(')', '')
-    title           = folder.replace(match.group(0), '').replace(year, '').strip()
-    title           = title.replace('(', '').replace(')', '').replace('\'', '')
-    return db_id, title, release_year
-
-for folder_name in folder_iterator(movie_dir):
-    db_match = re.search(r'{t[vm]db-[0-9]+}', folder_name)
-    if db_match:
-        db_id, title, release_year = get_media_info(folder_name, db_match)
-        post_data['movies'].append({
-            'title': title,
-            'release_year': release_year,
-            'db_id': db_id
-        })
+    for entry in folder_entry_iterator(root_dir):
+        yield entry.name
 
-for folder_name in folder_iterator(show_dir):
-    db_match = re.search(r'{t[vm]db-[0-9]+}', folder_name)
-    if db_match:
-        db_id, title, release_year = get_media_info(folder_name, db_match)
-        show_dict = {
-            'title': title,
-            'release_year': release_year,
-            'db_id': db_id,
-            'seasons': list()
+# Folder names following the TRaSH guides naming schemes, "Title (Year) {imdb-tt...} {tmdb-...} {edition-...}",
+# are parsed by a single match. The title can't contain a (year) or a tag, so anything else falls back to a token scan
+trash_folder_pattern = re.compile(
+    r'(?P<title>[^({]*(?:\((?![0-9]{4}\))[^({]*)*)'
+    r'(?:\((?P<year>[0-9]{4})\)\s*)?'
+    r'(?:\{imdb-(?P<imdb_id>tt[0-9]+)\}\s*)?'
+    r'\{(?P<provider>t[vm]db)-(?P<db_id>[0-9]+)\}\s*'
+    r'(?:\{edition-(?P<edition>[^}]*)\}\s*)?'
+)
+folder_token_pattern = re.compile(
+    r'\{(?:(?P<provider>t[vm]db)-(?P<db_id>[0-9]+)|imdb-(?P<imdb_id>tt[0-9]+)|edition-(?P<edition>[^}]*))\}'
+    r'|\((?P<year>[0-9]{4})\)'
+)
+season_folder_pattern = re.compile(r'season \s*(?P<number>[0-9]+)\s*|(?P<specials>specials)', re.IGNORECASE)
+
+def clean_title(title: str) -> str:
+    # str.replace() is much faster than str.translate() for deleting characters
+    return title.strip().replace('(', '').replace(')', '').replace('\'', '')
+
+def parse_media_folder(folder: str) -> dict | None:
+    # Returns None for folders without a {tmdb-} or {tvdb-} id
+    match = trash_folder_pattern.fullmatch(folder)
+    if match is not None:
+        title, year, imdb_id, provider, db_id, edition = match.groups()
+        return {
+            'provider': provider,
+            'db_id': int(db_id),
+            'title': clean_title(title),
+            'release_year': year or 'Unknown',
+            'imdb_id': imdb_id,
+            'edition': edition
         }
-        for inner_folder in folder_iterator(f'{show_dir}/{folder_name}'):
-            season_num = -1
-            if inner_folder.lower().startswith('season '):
-                season_num = int(inner_folder.lower().replace('season ', ''))
-            elif inner_folder.lower() == 'specials':
-                season_num = 0
-            if season_num != -1:
-                if 'seasons' not in show_dict:
-                    show_dict['seasons'] = list()
-                show_dict['seasons'].append({"number": season_num})
-        post_data['shows'].append(show_dict)
-repository_dispatch(post_data)
+    return scan_media_folder(folder)
+
+def scan_media_folder(folder: str) -> dict | None:
+    # Token scan for folder names with tags in other places, the first id and (year) win
+    provider = db_id = imdb_id = edition = year = None
+    parts = list()
+    position = 0
+    for match in folder_token_pattern.finditer(folder):
+        if match.group('year') is not None:
+            if year is None:
+                year = match.group('year')
+            elif match.group('year') != year:
+                continue # Only the release year is taken out of the title
+        elif match.group('db_id') is not None:
+            if db_id is None:
+                provider, db_id = match.group('provider'), int(match.group('db_id'))
+        elif match.group('imdb_id') is not None:
+            imdb_id = imdb_id or match.group('imdb_id')
+        else:
+            edition = edition or match.group('edition')
+        parts.append(folder[position:match.start()])
+        position = match.end()
+    if db_id is None:
+        return None
+    parts.append(folder[position:])
+    return {
+        'provider': provider,
+        'db_id': db_id,
+        'title': clean_title(''.join(parts)),
+        'release_year': year if year is not None else 'Unknown',
+        'imdb_id': imdb_id,
+        'edition': edition
+    }
+
+@functools.lru_cache(maxsize=1024)
+def parse_season_folder(folder: str) -> int | None:
+    # "Season 01" is season 1 and "Specials" is season 0, any other folder is not a season.
+    # Libraries reuse a handful of season folder names, so results are cached
+    match = season_folder_pattern.fullmatch(folder)
+    if match is None:
+        return None
+    return 0 if match.group('specials') is not None else int(match.group('number'))
+
+def get_show_seasons(show_path: str) -> list[dict]:
+    seasons = list()
+    for inner_folder in folder_iterator(show_path):
+        season_num = parse_season_folder(inner_folder)
+        if season_num is not None:
+            seasons.append({"number": season_num})
+    return seasons
+
+def scan_movies(root_dir: str, folder_names: set[str] | None = None) -> list[dict]:
+    # folder_names limits the scan to those movie folders
+    movies = list()
+    for folder_name in folder_iterator(root_dir):
+        if folder_names is not None and folder_name not in folder_names:
+            continue
+        media = parse_media_folder(folder_name)
+        if media:
+            movies.append({
+                'title': media['title'],
+                'release_year': media['release_year'],
+                'db_id': media['db_id']
+            })
+    return movies
+
+def list_show_seasons(show_paths: list[str], workers: int = scan_workers, timeout: float = scan_timeout) -> dict[str, list[dict]]:
+    # Lists the season folders of the shows concurrently and returns the seasons by show path.
+    # The workers are daemon threads, so a folder stuck on an unresponsive mount can't keep the
+    # script from exiting. Shows not listed within timeout seconds are left out
+    futures = {show_path: Future() for show_path in show_paths}
+    pending = queue.SimpleQueue()
+    for show_path, future in futures.items():
+        pending.put((show_path, future))
+
+    def worker():
+        while True:
+            try:
+                show_path, future = pending.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(get_show_seasons(show_path))
+            except BaseException as e:
+                future.set_exception(e)
+
+    for _ in range(min(workers, len(futures))):
+        threading.Thread(target=worker, daemon=True).start()
+    done, not_done = wait(futures.values(), timeout=timeout)
+    for future in not_done:
+        # Shows that weren't started yet are dropped from the queue, running ones are abandoned
+        future.cancel()
+    return {show_path: future.result() for show_path, future in futures.items() if future in done}
+
+def scan_show_folders(root_dir: str, previous: dict = None, workers: int = scan_workers, timeout: float = scan_timeout, folder_names: set[str] | None = None) -> list[tuple[str, int, dict]]:
+    # previous maps show folder names to their state from the last run, folders whose
+    # mtime hasn't changed since then reuse their seasons instead of being listed again.
+    # folder_names limits the scan to those show folders
+    previous = previous or dict()
+    shows = list()
+    for entry in folder_entry_iterator(root_dir):
+        if folder_names is not None and entry.name not in folder_names:
+            continue
+        media = parse_media_folder(entry.name)
+        if media:
+            show_dict = {
+                'title': media['title'],
+                'release_year': media['release_year'],
+                'db_id': media['db_id'],
+                'seasons': list()
+            }
+            mtime_ns = entry.stat().st_mtime_ns
+            known = previous.get(entry.name)
+            if known and known['db_id'] == media['db_id'] and known['mtime_ns'] == mtime_ns:
+                seasons = [{"number": season_num} for season_num in known['seasons']]
+            else:
+                seasons = None
+            shows.append((entry.name, mtime_ns, show_dict, seasons))
+    # Season folders are listed concurrently, results are collected in folder order
+    listed = list_show_seasons([f'{root_dir}/{folder_name}' for folder_name, _, _, seasons in shows if seasons is None], workers, timeout)
+    scanned = list()
+    for folder_name, mtime_ns, show_dict, seasons in shows:
+        if seasons is None:
+            seasons = listed.get(f'{root_dir}/{folder_name}')
+            if seasons is None:
+                print(f"Skipping '{show_dict['title']}', its seasons weren't listed within {timeout}s")
+                continue
+        show_dict['seasons'] = seasons
+        scanned.append((folder_name, mtime_ns, show_dict))
+    return scanned
+
+def scan_shows(root_dir: str, workers: int = scan_workers, timeout: float = scan_timeout) -> list[dict]:
+    return [show_dict for _, _, show_dict in scan_show_folders(root_dir, workers=workers, timeout=timeout)]
+
+def load_state(path: str) -> dict:
+    try:
+        with open(path, 'r') as file:
+            state = json.load(file)
+    except FileNotFoundError:
+        return dict()
+    except (OSError, ValueError) as e:
+        print(f'Could not read {path}, doing a full scan: {e}')
+        return dict()
+    if state.get('version') != state_version:
+        return dict()
+    return state
+
+def save_state(path: str, state: dict):
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def settled_mtime(mtime_ns: int, scan_start_ns: int) -> int | None:
+    # A folder changed right as the scan started may change again within the same mtime tick,
+    # so only trust mtimes that are old enough to be final
+    return mtime_ns if mtime_ns < scan_start_ns - settle_ns else None
+
+def scan_movie_changes(root_dir: str, previous: dict, scan_start_ns: int, folder_names: set[str] | None = None) -> tuple[list[dict], dict]:
+    # Adding, removing or renaming a movie folder changes the mtime of the movies root,
+    # so an unchanged root means there is nothing new to post
+    root_mtime_ns = os.stat(root_dir).st_mtime_ns
+    if folder_names is None and previous and previous.get('root_mtime_ns') == root_mtime_ns:
+        return list(), previous
+    posted = set(previous.get('posted', list()))
+    movies = scan_movies(root_dir, folder_names)
+    new_movies = [movie for movie in movies if movie['db_id'] not in posted]
+    return new_movies, {
+        # Only a scan of the whole root can vouch for its mtime
+        'root_mtime_ns': settled_mtime(root_mtime_ns, scan_start_ns) if folder_names is None else previous.get('root_mtime_ns'),
+        'posted': sorted(posted | {movie['db_id'] for movie in movies})
+    }
+
+def scan_show_changes(root_dir: str, previous: dict, scan_start_ns: int, folder_names: set[str] | None = None) -> tuple[list[dict], dict]:
+    # New seasons change the mtime of their show folder, so only changed show folders are listed again
+    previous_folders = previous.get('folders', dict())
+    new_shows = list()
+    folders = dict()
+    for folder_name, mtime_ns, show_dict in scan_show_folders(root_dir, previous_folders, folder_names=folder_names):
+        known = previous_folders.get(folder_name)
+        season_nums = [season['number'] for season in show_dict['seasons']]
+        if known is None or known['db_id'] != show_dict['db_id']:
+            new_shows.append(show_dict)
+        else:
+            new_seasons = [season for season in show_dict['seasons'] if season['number'] not in known['seasons']]
+            if new_seasons:
+                new_shows.append({**show_dict, 'seasons': new_seasons})
+            season_nums = sorted(set(season_nums) | set(known['seasons']))
+        folders[folder_name] = {
+            'db_id': show_dict['db_id'],
+            'mtime_ns': settled_mtime(mtime_ns, scan_start_ns),
+            'seasons': season_nums
+        }
+    # Keep what was posted for shows that weren't looked at or timed out this run
+    for folder_name, known in previous_folders.items():
+        if folder_name in folders:
+            continue
+        if (folder_names is not None and folder_name not in folder_names) or os.path.isdir(f'{root_dir}/{folder_name}'):
+            folders[folder_name] = known
+    return new_shows, {'folders': folders}
+
+def sync_changes(movie_root: str, show_root: str, state: dict, state_path: str, api_url: str, movie_folders: set[str] | None = None, show_folders: set[str] | None = None, quiet: bool = False) -> dict:
+    # Posts what changed since the state was saved, optionally only looking at the given folders,
+    # and returns the new state
+    scan_start_ns = time.time_ns()
+    movies, movie_state = scan_movie_changes(movie_root, state.get('movies', dict()), scan_start_ns, movie_folders)
+    shows, show_state = scan_show_changes(show_root, state.get('shows', dict()), scan_start_ns, show_folders)
+    post_data = {
+        'movies': movies,
+        'shows': shows
+    }
+    if movies or shows:
+        print(f'Posting {len(movies)} movie(s) and {len(shows)} show(s)')
+        repository_dispatch(post_data, api_url=api_url)
+    elif not quiet:
+        print('Nothing new since the last run')
+    # Only remember what was posted once the dispatch went through
+    state = {
+        'version': state_version,
+        'movies': movie_state,
+        'shows': show_state
+    }
+    save_state(state_path, state)
+    return state
+
+class InotifyWatcher:
+    # Minimal inotify(7) binding over libc, reporting new folders in the roots and in each show folder
+    def __init__(self, movie_root: str, show_root: str):
+        # Imported here since only --watch needs them
+        import ctypes
+        import ctypes.util
+        self.get_errno = ctypes.get_errno
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            raise OSError('libc not found')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError('inotify is not available on this system')
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self.get_errno(), 'inotify_init1 failed')
+        self.watches = dict() # Watch descriptor -> ('movies', None), ('shows', None) or ('show', folder name)
+        self.movie_root = movie_root
+        self.show_root = show_root
+        self.add_watch(movie_root, ('movies', None))
+        self.add_watch(show_root, ('shows', None))
+        for folder_name in folder_iterator(show_root):
+            self.add_watch(f'{show_root}/{folder_name}', ('show', folder_name))
+
+    def add_watch(self, path: str, target: tuple[str, str | None]):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), inotify_create | inotify_moved_to)
+        if wd < 0:
+            errno = self.get_errno()
+            raise OSError(errno, f'Could not watch {path}: {os.strerror(errno)}')
+        self.watches[wd] = target
+
+    def read_events(self, timeout: float) -> tuple[set[str], set[str], bool] | None:
+        # Returns (movie folders, show folders, overflowed) for the events read, or None if none arrived in time
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return None
+        buffer = os.read(self.fd, 65536)
+        movie_folders = set()
+        show_folders = set()
+        overflowed = False
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, name_length = inotify_event.unpack_from(buffer, offset)
+            name = os.fsdecode(buffer[offset + inotify_event.size:offset + inotify_event.size + name_length].rstrip(b'\0'))
+            offset += inotify_event.size + name_length
+            if mask & inotify_queue_overflow:
+                overflowed = True
+                continue
+            if mask & inotify_ignored:
+                self.watches.pop(wd, None) # The folder was deleted or moved away
+                continue
+            if not mask & inotify_is_dir or wd not in self.watches:
+                continue
+            kind, show_name = self.watches[wd]
+            if kind == 'movies':
+                movie_folders.add(name)
+            elif kind == 'shows':
+                show_folders.add(name)
+                self.add_watch(f'{self.show_root}/{name}', ('show', name))
+            else:
+                show_folders.add(show_name)
+        return movie_folders, show_folders, overflowed
+
+    def close(self):
+        os.close(self.fd)
+
+def watch_library(movie_root: str, show_root: str, state: dict, state_path: str, api_url: str, use_inotify: bool = True, debounce: float = watch_debounce, max_delay: float = watch_max_delay, poll_interval: float = watch_poll_interval, should_stop=lambda: False):
+    # Catch up on anything that changed while not watching
+    state = sync_changes(movie_root, show_root, state, state_path, api_url)
+    watcher = None
+    if use_inotify:
+        try:
+            watcher = InotifyWatcher(movie_root, show_root)
+        except OSError as e:
+            print(f'Falling back to polling every {poll_interval}s: {e}')
+    if watcher is None:
+        # Each poll is an incremental scan, which only lists folders whose mtime changed
+        while not should_stop():
+            time.sleep(poll_interval)
+            try:
+                state = sync_changes(movie_root, show_root, state, state_path, api_url, quiet=True)
+            except Exception as e:
+                print(f'Could not post changes, retrying next poll: {e}')
+        return
+
+    print(f'Watching {movie_root} and {show_root} for new folders')
+    movie_folders = set()
+    show_folders = set()
+    rescan = False
+    first_event = None
+    try:
+        while not should_stop():
+            # Wait for events, or once some arrived, for the debounce window to pass quietly
+            timeout = poll_interval if first_event is None else max(0, min(debounce, first_event + max_delay - time.monotonic()))
+            try:
+                events = watcher.read_events(timeout)
+            except OSError as e:
+                # Typically the inotify watch limit, see fs.inotify.max_user_watches
+                print(f'Lost track of new folders, rescanning: {e}')
+                events = (set(), set(), True)
+            if events is not None:
+                movie_folders |= events[0]
+                show_folders |= events[1]
+                rescan = rescan or events[2]
+                if first_event is None:
+                    first_event = time.monotonic()
+                if time.monotonic() < first_event + max_delay:
+                    continue
+            if first_event is None:
+                continue
+            try:
+                if rescan:
+                    # Events were dropped, so look at everything that changed by mtime
+                    state = sync_changes(movie_root, show_root, state, state_path, api_url)
+                else:
+                    state = sync_changes(movie_root, show_root, state, state_path, api_url, movie_folders, show_folders)
+            except Exception as e:
+                # Events keep queueing up in the kernel meanwhile, the pending folders are kept for the retry
+                print(f'Could not post changes, retrying in {poll_interval}s: {e}')
+                time.sleep(poll_interval)
+                continue
+            movie_folders = set()
+            show_folders = set()
+            rescan = False
+            first_event = None
+    finally:
+        watcher.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Post new movies, shows and seasons from the media folders to the metadata repository')
+    parser.add_argument('--full', action='store_true', help='Ignore the state file and post the whole library')
+    parser.add_argument('--state-file', default=state_file, help=f'File remembering what was already posted (default: {state_file})')
+    parser.add_argument('--api-url', default=github_api_url, help=f'GitHub API base URL, e.g. a local stub server for testing (default: {github_api_url})')
+    parser.add_argument('--movie-dir', default=movie_dir, help=f'Movies root directory (default: {movie_dir})')
+    parser.add_argument('--show-dir', default=show_dir, help=f'Shows root directory (default: {show_dir})')
+    parser.add_argument('--watch', action='store_true', help='Keep running and post new folders as they appear')
+    parser.add_argument('--poll', action='store_true', help='With --watch, poll instead of using inotify (inotify misses changes made on other hosts of network mounts)')
+    parser.add_argument('--debounce', type=float, default=watch_debounce, help=f'With --watch, seconds without new events before posting (default: {watch_debounce})')
+    parser.add_argument('--poll-interval', type=float, default=watch_poll_interval, help=f'With --watch, seconds between polls (default: {watch_poll_interval})')
+    args = parser.parse_args()
+
+    state = dict() if args.full else load_state(args.state_file)
+    if args.watch:
+        try:
+            watch_library(args.movie_dir, args.show_dir, state, args.state_file, args.api_url,
+                          use_inotify=not args.poll, debounce=args.debounce, poll_interval=args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+    else:
+        sync_changes(args.movie_dir, args.show_dir, state, args.state_file, args.api_url)
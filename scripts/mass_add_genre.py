@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Add a genre to genre.sync for every movie or show whose remote genres include it.
+
+This script does what functions/yaml/mass-add-genre.sh does, with the same
+--genre/--type/--env-file/--max-items/--dry-run options, but fetches the
+TMDb movie and TVDb series details concurrently. Each provider has its own
+token-bucket rate limit, and a 429/503 response with Retry-After pauses that
+provider's requests for the given time before retrying. Genre additions are
+applied in memory and each metadata file is sorted, formatted and written
+once at the end. Lookups go through the shared HTTP response cache
+(scripts/http_cache.py), --offline only uses cached responses.
+
+The API base URLs can be pointed at a local stub server with --tmdb-url and
+--tvdb-url.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+from http_cache import CacheMiss, ResponseCache, TokenBucket, parse_retry_after
+
+
+# Constants
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TMDB_API_URL = "https://api.themoviedb.org/3"
+TVDB_API_URL = "https://api4.thetvdb.com/v4"
+DEFAULT_WORKERS = 8
+DEFAULT_TMDB_RATE = 20.0  # Requests per second
+DEFAULT_TVDB_RATE = 10.0
+MAX_RETRIES = 4
+REQUEST_TIMEOUT = 30
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def load_env_file(env_file: Path) -> dict:
+    """
+    Read KEY=VALUE lines from an env file, the way `set -a; source .env` would for simple files.
+    
+    Args:
+        env_file: Path to the env file
+    
+    Returns:
+        Dictionary of variable name -> value
+    """
+    variables = {}
+    with open(env_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            name, value = line.split('=', 1)
+            name = name.strip()
+            if name.startswith('export '):
+                name = name[len('export '):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+                value = value[1:-1]
+            variables[name] = value
+    return variables
+
+
+class ProviderClient:
+    """
+    JSON API client for one provider, shared by the worker threads.
+    
+    Every request takes a token from the provider's bucket first. Rate
+    limited and server error responses are retried up to MAX_RETRIES times,
+    waiting for Retry-After when the response has one and backing off
+    exponentially otherwise. GET requests go through the response cache when
+    one is given, so fresh cached responses don't use the network at all.
+    """
+    
+    def __init__(self, name: str, base_url: str, rate: float, headers: dict = None, cache=None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.bucket = TokenBucket(rate)
+        self.headers = headers or {}
+        self.cache = cache
+        self.local = threading.local()
+    
+    def get_session(self):
+        """Get the requests session of the current thread."""
+        import requests
+        
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self.local.session = session
+        return session
+    
+    def send(self, method: str, url: str, headers: dict = None, **kwargs):
+        """
+        Make a rate limited request, retrying rate limited and failed requests.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Extra request headers
+            **kwargs: Passed on to requests
+        
+        Returns:
+            Response of the last attempt
+        
+        Raises:
+            RuntimeError: If the request can't be sent
+        """
+        import requests
+        
+        for attempt in range(MAX_RETRIES + 1):
+            self.bucket.acquire()
+            try:
+                response = self.get_session().request(method, url, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs)
+            except requests.RequestException as e:
+                if attempt == MAX_RETRIES:
+                    raise RuntimeError(f"{self.name} request failed: {e}") from e
+                time.sleep(2 ** attempt)
+                continue
+            
+            if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    self.bucket.pause(retry_after)
+                else:
+                    time.sleep(2 ** attempt)
+                continue
+            return response
+    
+    def request_json(self, method: str, path: str, params: dict = None, **kwargs):
+        """
+        Make a request and decode its JSON response.
+        
+        Args:
+            method: HTTP method
+            path: Path below the base URL
+            params: Query parameters
+            **kwargs: Passed on to requests
+        
+        Returns:
+            Decoded JSON object
+        
+        Raises:
+            RuntimeError: If the request fails or doesn't return a JSON object
+        """
+        url = f"{self.base_url}{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        if self.cache is not None and method == 'GET':
+            try:
+                response = self.cache.fetch(url, lambda headers: self.send(method, url, headers, **kwargs))
+            except CacheMiss as e:
+                raise RuntimeError(str(e)) from e
+        else:
+            response = self.send(method, url, **kwargs)
+        
+        if not 200 <= response.status_code < 300:
+            raise RuntimeError(f"{self.name} returned HTTP {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise RuntimeError(f"{self.name} returned invalid JSON") from e
+        if not isinstance(data, dict):
+            raise RuntimeError(f"{self.name} returned JSON that isn't an object")
+        return data
+
+
+def get_response_data(client: ProviderClient, response: dict) -> dict:
+    """
+    Get the 'data' object TVDb wraps its responses in.
+    
+    Args:
+        client: Client the response came from
+        response: Decoded JSON response
+    
+    Returns:
+        The 'data' object, empty if the response has none
+    
+    Raises:
+        RuntimeError: If 'data' isn't an object
+    """
+    data = response.get('data') or {}
+    if not isinstance(data, dict):
+        raise RuntimeError(f"{client.name} returned data that isn't an object")
+    return data
+
+
+def get_tvdb_auth_token(base_url: str, api_key: str) -> str:
+    """
+    Log in to TVDb like functions/tvdb/get_auth_token.sh.
+    
+    Args:
+        base_url: TVDb API base URL
+        api_key: TVDB_TOKEN from the env file
+    
+    Returns:
+        Bearer token
+    
+    Raises:
+        RuntimeError: If the login fails
+    """
+    client = ProviderClient('TVDb', base_url, DEFAULT_TVDB_RATE)
+    response = client.request_json('POST', '/login', json={'apikey': api_key})
+    token = get_response_data(client, response).get('token')
+    if not token:
+        raise RuntimeError("TVDb login response has no token")
+    return token
+
+
+def has_genre(genres, genre_lookup: str) -> bool:
+    """
+    Check whether a list of genre names or TMDb/TVDb genre objects contains a genre.
+    
+    Args:
+        genres: genre.sync list or the 'genres' list of an API response
+        genre_lookup: Lowercase genre name
+    
+    Returns:
+        True if one of the genres matches case-insensitively
+    """
+    for genre in genres or []:
+        name = genre.get('name') if isinstance(genre, dict) else genre
+        if str(name or '').lower() == genre_lookup:
+            return True
+    return False
+
+
+def fetch_remote_genres(client: ProviderClient, media_type: str, media_id) -> list:
+    """
+    Fetch the genres of a movie from TMDb or of a series from TVDb.
+    
+    Args:
+        client: Client of the provider for the media type
+        media_type: "movie" or "show"
+        media_id: TMDb or TVDb ID
+    
+    Returns:
+        List of genre objects
+    
+    Raises:
+        RuntimeError: If the request fails or the response has no genre list
+    """
+    if media_type == 'movie':
+        genres = client.request_json('GET', f"/movie/{media_id}").get('genres') or []
+    else:
+        response = client.request_json('GET', f"/series/{media_id}/extended", params={'short': 'true'})
+        genres = get_response_data(client, response).get('genres') or []
+    if not isinstance(genres, list):
+        raise RuntimeError(f"{client.name} returned genres that aren't a list")
+    return genres
+
+
+def process_items(media_type: str, metadata_file: Path, client: ProviderClient, genre: str,
+                  max_items: int, dry_run: bool, workers: int) -> bool:
+    """
+    Add the genre to the items of one metadata file whose remote genres include it.
+    
+    Args:
+        media_type: "movie" or "show"
+        metadata_file: Path to the metadata file
+        client: Client of the provider for the media type
+        genre: Genre to add
+        max_items: Only check the first N entries (0 for all)
+        dry_run: Report the additions without writing the file
+        workers: Number of concurrent requests
+    
+    Returns:
+        True if every item was checked without errors
+    """
+    from metadata_yaml import load_metadata_file, sort_metadata, write_metadata_file
+    
+    genre_lookup = genre.lower()
+    document, styles = load_metadata_file(metadata_file)
+    metadata = document['metadata']
+    media_ids = list(metadata)
+    if not media_ids:
+        print(f"No {media_type} IDs found in {metadata_file}")
+        return True
+    
+    print(f"Checking {len(media_ids)} {media_type} entries in {metadata_file.name}")
+    if max_items > 0:
+        media_ids = media_ids[:max_items]
+    
+    processed = 0
+    updated = 0
+    skipped = 0
+    errors = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Queue every lookup up front, results are reported in file order
+        lookups = {
+            media_id: executor.submit(fetch_remote_genres, client, media_type, media_id)
+            for media_id in media_ids
+            if not has_genre((metadata[media_id] or {}).get('genre.sync'), genre_lookup)
+        }
+        for media_id in media_ids:
+            item = metadata[media_id] or {}
+            processed += 1
+            label_title = item.get('label_title')
+            print(f"[{processed}] {media_type} {media_id}: {label_title}")
+            
+            if media_id not in lookups:
+                print(f"  {genre} already present")
+                skipped += 1
+                continue
+            
+            try:
+                remote_genres = lookups[media_id].result()
+            except RuntimeError as e:
+                print(f"  Error: failed to fetch remote details ({e})")
+                errors += 1
+                continue
+            
+            if not has_genre(remote_genres, genre_lookup):
+                print(f"  Remote genres do not include {genre}")
+                skipped += 1
+                continue
+            
+            if dry_run:
+                print(f"  Would add {genre} to genre.sync for {label_title} ({media_id})")
+            else:
+                print(f"  Adding {genre} to genre.sync")
+                item['genre.sync'] = sorted(set(item.get('genre.sync') or []) | {genre})
+                metadata[media_id] = item
+            updated += 1
+    
+    print(f"Summary for {media_type}s: processed={processed}, updated={updated}, skipped={skipped}, errors={errors}")
+    
+    if not dry_run and write_metadata_file(sort_metadata(document), metadata_file, styles):
+        print(f"✓ Updated {metadata_file}")
+    return errors == 0
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Add a genre to genre.sync for every movie or show whose remote genres include it"
+    )
+    parser.add_argument("--genre", required=True, help="Genre to add")
+    parser.add_argument(
+        "--type",
+        choices=("movie", "show", "all"),
+        default="all",
+        help="Media type to check (default: all)"
+    )
+    parser.add_argument(
+        "--env-file",
+        default=str(REPO_ROOT / ".env"),
+        help="Env file with TMDB_READ_TOKEN and TVDB_TOKEN (default: .env in the repository root)"
+    )
+    parser.add_argument("--max-items", type=int, default=0, help="Only check the first N entries of each file")
+    parser.add_argument("--dry-run", action="store_true", help="Report the additions without writing the files")
+    parser.add_argument(
+        "--movie-file",
+        default=str(REPO_ROOT / "movie-metadata.yml"),
+        help="Path to the movie metadata file"
+    )
+    parser.add_argument(
+        "--show-file",
+        default=str(REPO_ROOT / "show-metadata.yml"),
+        help="Path to the show metadata file"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of concurrent requests (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--tmdb-rate",
+        type=float,
+        default=DEFAULT_TMDB_RATE,
+        help=f"Maximum TMDb requests per second (default: {DEFAULT_TMDB_RATE:g})"
+    )
+    parser.add_argument(
+        "--tvdb-rate",
+        type=float,
+        default=DEFAULT_TVDB_RATE,
+        help=f"Maximum TVDb requests per second (default: {DEFAULT_TVDB_RATE:g})"
+    )
+    parser.add_argument("--tmdb-url", default=TMDB_API_URL, help="TMDb API base URL")
+    parser.add_argument("--tvdb-url", default=TVDB_API_URL, help="TVDb API base URL")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only use responses from the HTTP cache (scripts/http_cache.py), don't contact the APIs"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Don't use the HTTP cache")
+    
+    args = parser.parse_args()
+    
+    genre = args.genre.strip()
+    if not genre:
+        print("Error: --genre cannot be empty", file=sys.stderr)
+        sys.exit(1)
+    if args.max_items < 0:
+        print("Error: --max-items must be a non-negative integer", file=sys.stderr)
+        sys.exit(1)
+    if args.workers < 1 or args.tmdb_rate <= 0 or args.tvdb_rate <= 0:
+        print("Error: --workers and the rates must be positive", file=sys.stderr)
+        sys.exit(1)
+    if args.offline and args.no_cache:
+        print("Error: --offline needs the HTTP cache, it can't be combined with --no-cache", file=sys.stderr)
+        sys.exit(1)
+    
+    env_file = Path(args.env_file)
+    if not env_file.is_file():
+        print(f"Error: env file not found at '{env_file}'", file=sys.stderr)
+        sys.exit(1)
+    
+    media_types = ('movie', 'show') if args.type == 'all' else (args.type,)
+    metadata_files = {'movie': Path(args.movie_file), 'show': Path(args.show_file)}
+    for media_type in media_types:
+        if not metadata_files[media_type].is_file():
+            print(f"Error: {media_type} metadata file not found at '{metadata_files[media_type]}'", file=sys.stderr)
+            sys.exit(1)
+    
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(offline=True if args.offline else None)
+    
+    variables = load_env_file(env_file)
+    clients = {}
+    if 'movie' in media_types:
+        tmdb_token = variables.get('TMDB_READ_TOKEN')
+        if not tmdb_token:
+            print(f"Error: TMDB_READ_TOKEN is not set in '{env_file}'", file=sys.stderr)
+            sys.exit(1)
+        clients['movie'] = ProviderClient('TMDb', args.tmdb_url, args.tmdb_rate,
+                                          {'Authorization': f"Bearer {tmdb_token}"}, cache)
+    if 'show' in media_types:
+        tvdb_api_key = variables.get('TVDB_TOKEN')
+        if not tvdb_api_key:
+            print(f"Error: TVDB_TOKEN is not set in '{env_file}'", file=sys.stderr)
+            sys.exit(1)
+        tvdb_auth_token = ''
+        if cache is None or not cache.offline:
+            print("Getting TVDb auth token...")
+            try:
+                tvdb_auth_token = get_tvdb_auth_token(args.tvdb_url, tvdb_api_key)
+            except RuntimeError as e:
+                print(f"Error: failed to retrieve TVDb auth token ({e})", file=sys.stderr)
+                sys.exit(1)
+        clients['show'] = ProviderClient('TVDb', args.tvdb_url, args.tvdb_rate,
+                                         {'Authorization': f"Bearer {tvdb_auth_token}"}, cache)
+    
+    success = True
+    for media_type in media_types:
+        try:
+            success = process_items(media_type, metadata_files[media_type], clients[media_type], genre,
+                                    args.max_items, args.dry_run, args.workers) and success
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            success = False
+    
+    if not success:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Answer find-field.sh and find-missing.sh queries from a persistent field index.
+
+The first query against a metadata file loads it once and builds inverted
+indexes for the searchable keys, lists of the entries missing each key and
+the shows with missing season posters. The index is stored on disk under the
+SHA-256 of the metadata file and only rebuilt when the file content changes,
+so a workflow firing many queries parses each file once.
+
+The find-field and find-missing commands take the same arguments as the shell
+scripts and print the same JSON array / JSON lines, optionally paged with
+--limit and --offset.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+from itertools import islice
+from pathlib import Path
+
+
+# Constants
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = ".metadata-index"
+FIELD_KEYS = ("label_title", "sort_title", "release_year", "studio", "genre.sync", "url_poster", "audio_language")
+MISSING_KEYS = FIELD_KEYS + ("season_posters",)
+MEDIA_TYPES = ("movie", "show", "all")
+
+# Same character filters as the tr -cd calls of the shell scripts
+KEY_STRIP_PATTERN = re.compile(r'[^A-Za-z0-9_.]')
+VALUE_STRIP_PATTERN = re.compile(r'[^A-Za-z0-9 ._-]')
+
+
+def get_scalar_text(value):
+    """
+    Get the text a scalar is compared by, like yq comparing a node with a string.
+    
+    Args:
+        value: Parsed YAML value
+    
+    Returns:
+        Text of the scalar, or None for null, sequences and mappings
+    """
+    if value is None or isinstance(value, (list, dict)):
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def is_missing(value) -> bool:
+    """
+    Check whether a value counts as missing (null, or an empty string, sequence or mapping).
+    
+    Args:
+        value: Parsed YAML value
+    
+    Returns:
+        True if the value is missing
+    """
+    return value is None or (isinstance(value, (str, list, dict)) and len(value) == 0)
+
+
+def build_index(metadata: dict, content_hash: str) -> dict:
+    """
+    Build the field index of a metadata mapping.
+    
+    Args:
+        metadata: The 'metadata' mapping of a metadata file
+        content_hash: SHA-256 of the metadata file the mapping was loaded from
+    
+    Returns:
+        Index dictionary with the entries in file order, per-key value -> positions
+        lookups, per-key positions of entries missing the key and the shows with
+        seasons missing a poster
+    """
+    entries = []
+    fields = {key: {} for key in FIELD_KEYS}
+    missing = {key: [] for key in FIELD_KEYS}
+    season_posters = []
+    
+    for position, (txdb_id, item) in enumerate(metadata.items()):
+        item = item if isinstance(item, dict) else {}
+        entries.append((txdb_id, item))
+        
+        for key in FIELD_KEYS:
+            value = item.get(key)
+            if is_missing(value):
+                missing[key].append(position)
+            if key == 'genre.sync':
+                # Genres are matched against each item of the sequence, an entry is listed once
+                if isinstance(value, list):
+                    for genre in dict.fromkeys(text for text in map(get_scalar_text, value) if text is not None):
+                        fields[key].setdefault(genre, []).append(position)
+                continue
+            text = get_scalar_text(value)
+            if text is not None:
+                fields[key].setdefault(text, []).append(position)
+        
+        seasons = item.get('seasons')
+        if isinstance(seasons, dict) and seasons:
+            missing_seasons = [
+                season for season, season_item in seasons.items()
+                if is_missing(season_item.get('url_poster') if isinstance(season_item, dict) else None)
+            ]
+            if missing_seasons:
+                season_posters.append({
+                    'txdb_id': txdb_id,
+                    'label_title': item.get('label_title'),
+                    'release_year': item.get('release_year'),
+                    'missing_seasons': missing_seasons
+                })
+    
+    return {
+        'version': INDEX_VERSION,
+        'hash': content_hash,
+        'entries': entries,
+        'fields': fields,
+        'missing': missing,
+        'season_posters': season_posters
+    }
+
+
+def get_index_file(metadata_file: Path, content_hash: str, index_dir: Path) -> Path:
+    """
+    Get the index file of a metadata file's content.
+    
+    Args:
+        metadata_file: Path to the metadata file
+        content_hash: SHA-256 of the metadata file
+        index_dir: Directory of the field indexes
+    
+    Returns:
+        Path to the index file, named after the metadata file and its content hash
+    """
+    return index_dir / f"{metadata_file.name}-{content_hash[:16]}.pickle"
+
+
+def write_index(index_file: Path, index: dict) -> None:
+    """
+    Write a field index atomically and remove the indexes of older versions of the file.
+    
+    Args:
+        index_file: Path to the index file
+        index: Index dictionary from build_index()
+    """
+    temp_file = index_file.with_name(f".{index_file.name}.tmp")
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_file, 'wb') as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, index_file)
+        prefix = index_file.name[:-len('0123456789abcdef.pickle')]
+        for stale_file in index_file.parent.glob(f"{prefix}*.pickle"):
+            if stale_file != index_file:
+                stale_file.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Warning: Could not write field index {index_file}: {e}", file=sys.stderr)
+
+
+def load_index(metadata_file: Path, index_dir: Path = None) -> dict:
+    """
+    Load the field index of a metadata file, building it if the file changed.
+    
+    Args:
+        metadata_file: Path to the metadata file
+        index_dir: Directory of the field indexes, or None to always build in memory
+    
+    Returns:
+        Index dictionary from build_index()
+    """
+    content = metadata_file.read_bytes()
+    content_hash = hashlib.sha256(content).hexdigest()
+    
+    index_file = None
+    if index_dir is not None:
+        index_file = get_index_file(metadata_file, content_hash, index_dir)
+        try:
+            with open(index_file, 'rb') as f:
+                index = pickle.load(f)
+            if isinstance(index, dict) and index.get('version') == INDEX_VERSION and index.get('hash') == content_hash:
+                return index
+        except Exception:
+            pass
+    
+    # Imported here since queries answered from a stored index don't parse YAML
+    import yaml
+    from metadata_yaml import SafeLoader
+    
+    document = yaml.load(content.decode('utf-8'), Loader=SafeLoader) or {}
+    index = build_index(document.get('metadata') or {}, content_hash)
+    if index_file is not None:
+        write_index(index_file, index)
+    return index
+
+
+def get_metadata_files(media_type: str, movie_file: str, show_file: str) -> list:
+    """
+    Get the metadata files a query covers, movies first like the shell scripts.
+    
+    Args:
+        media_type: "movie", "show" or "all"
+        movie_file: Path to the movie metadata file
+        show_file: Path to the show metadata file
+    
+    Returns:
+        List of metadata file paths
+    """
+    if media_type == 'movie':
+        return [Path(movie_file)]
+    if media_type == 'show':
+        return [Path(show_file)]
+    return [Path(movie_file), Path(show_file)]
+
+
+def find_field(key: str, value: str, metadata_files: list, index_dir: Path = None):
+    """
+    Find the entries whose key equals a value, or whose genre.sync contains it.
+    
+    Args:
+        key: Key from FIELD_KEYS
+        value: Value to look for
+        metadata_files: Metadata files to search
+        index_dir: Directory of the field indexes
+    
+    Yields:
+        Matching entries with their txdb_id added (genre.sync matches are
+        yielded without it, like find-field.sh)
+    """
+    for metadata_file in metadata_files:
+        index = load_index(metadata_file, index_dir)
+        for position in index['fields'][key].get(value, []):
+            txdb_id, item = index['entries'][position]
+            if key == 'genre.sync':
+                yield item
+            else:
+                yield {**item, 'txdb_id': txdb_id}
+
+
+def find_missing(key: str, metadata_files: list, index_dir: Path = None):
+    """
+    Find the entries missing a value for a key, or the shows with seasons missing a poster.
+    
+    Args:
+        key: Key from MISSING_KEYS
+        metadata_files: Metadata files to search
+        index_dir: Directory of the field indexes
+    
+    Yields:
+        Entries with their txdb_id added, or for "season_posters" dictionaries
+        with txdb_id, label_title, release_year and missing_seasons
+    """
+    for metadata_file in metadata_files:
+        index = load_index(metadata_file, index_dir)
+        if key == 'season_posters':
+            yield from index['season_posters']
+            continue
+        for position in index['missing'][key]:
+            txdb_id, item = index['entries'][position]
+            yield {**item, 'txdb_id': txdb_id}
+
+
+def write_json_array(results, output) -> None:
+    """
+    Stream results as a JSON array formatted like jq -s.
+    
+    Args:
+        results: Iterable of JSON-serializable results
+        output: Text stream to write to
+    """
+    first = True
+    for result in results:
+        output.write('[\n' if first else ',\n')
+        first = False
+        output.write('\n'.join(f"  {line}" for line in json.dumps(result, indent=2, ensure_ascii=False).split('\n')))
+    output.write('[]\n' if first else '\n]\n')
+
+
+def write_json_lines(results, output) -> None:
+    """
+    Stream results as compact JSON lines formatted like jq -c.
+    
+    Args:
+        results: Iterable of JSON-serializable results
+        output: Text stream to write to
+    """
+    for result in results:
+        output.write(json.dumps(result, separators=(',', ':'), ensure_ascii=False))
+        output.write('\n')
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Answer find-field / find-missing queries from a persistent field index"
+    )
+    parser.add_argument(
+        "--index-dir",
+        default=DEFAULT_INDEX_DIR,
+        help=f"Directory of the field indexes (default: {DEFAULT_INDEX_DIR})"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Build the index in memory without reading or writing the index directory"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build_parser = subparsers.add_parser("build", help="Build the indexes of metadata files ahead of queries")
+    build_parser.add_argument("files", nargs="+", help="Metadata files to index")
+    
+    field_parser = subparsers.add_parser("find-field", help="Find entries with a key equal to a value (JSON array)")
+    field_parser.add_argument("key", help=f"Key to search, one of: {', '.join(FIELD_KEYS)}")
+    field_parser.add_argument("value", help="Value to search for")
+    
+    missing_parser = subparsers.add_parser("find-missing", help="Find entries missing a value for a key (JSON lines)")
+    missing_parser.add_argument("key", help=f"Key to check, one of: {', '.join(MISSING_KEYS)}")
+    
+    for query_parser in (field_parser, missing_parser):
+        query_parser.add_argument("type", help="Media type: movie, show or all")
+        query_parser.add_argument("movie_file", help="Path to the movie metadata file")
+        query_parser.add_argument("show_file", help="Path to the show metadata file")
+        query_parser.add_argument("--limit", type=int, default=None, help="Maximum number of results")
+        query_parser.add_argument("--offset", type=int, default=0, help="Number of results to skip (default: 0)")
+    
+    args = parser.parse_args()
+    
+    index_dir = None if args.no_index else Path(args.index_dir)
+    
+    if args.command == 'build':
+        for file in args.files:
+            try:
+                index = load_index(Path(file), index_dir)
+            except Exception as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"✓ Indexed {len(index['entries'])} entries of {file}")
+        return
+    
+    if (args.limit is not None and args.limit < 0) or args.offset < 0:
+        parser.error("--limit and --offset must not be negative")
+    
+    # Validation messages go to stdout like the shell scripts
+    key = KEY_STRIP_PATTERN.sub('', args.key)
+    allowed_keys = FIELD_KEYS if args.command == 'find-field' else MISSING_KEYS
+    if args.type not in MEDIA_TYPES:
+        print(f"Invalid type: {args.type}. Must be movie, show, or all.")
+        sys.exit(1)
+    if key not in allowed_keys:
+        print(f"Invalid key: {key}. Allowed keys are: {' '.join(allowed_keys)}")
+        sys.exit(1)
+    if key == 'season_posters' and args.type == 'movie':
+        print("season_posters key is only valid for shows, not movies.")
+        sys.exit(1)
+    
+    metadata_files = get_metadata_files(args.type, args.movie_file, args.show_file)
+    stop = None if args.limit is None else args.offset + args.limit
+    try:
+        if args.command == 'find-field':
+            value = VALUE_STRIP_PATTERN.sub('', args.value)
+            write_json_array(islice(find_field(key, value, metadata_files, index_dir), args.offset, stop), sys.stdout)
+        else:
+            write_json_lines(islice(find_missing(key, metadata_files, index_dir), args.offset, stop), sys.stdout)
+    except BrokenPipeError:
+        # The reader (e.g. head) stopped early, silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Point lookups and in-place entry updates for metadata files via a byte-offset index.
+
+A line scan over the memory-mapped metadata file records where each top-level
+entry under 'metadata:' starts and ends. Reading one entry then only parses
+its own block, and replacing or inserting an entry splices its block into the
+file without re-serializing the other ~3,000 entries. When the file doesn't
+have the layout the scan expects, or it changed since it was indexed, updates
+fall back to a full load and rewrite.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from pathlib import Path
+
+
+# Top-level lines: "metadata:" and other unindented lines, entry keys indented
+# by two spaces and anything else that isn't part of an entry's body
+SCAN_LINE_PATTERN = re.compile(rb'^(?:  )?(?! )[^\n]*', re.MULTILINE)
+ENTRY_KEY_PATTERN = re.compile(rb'  (?:(?P<number>[0-9]+)|(?P<name>[A-Za-z][^:#\n]*?)):[ \t]*')
+# Plain keys that YAML reads as something other than a string
+NON_STRING_KEYS = {b'true', b'false', b'yes', b'no', b'on', b'off', b'null'}
+METADATA_LINE = b'metadata:'
+
+
+def build_offset_index(data) -> dict:
+    """
+    Scan a metadata file for the byte offsets of its entries.
+    
+    Args:
+        data: File content (bytes or a memory map)
+    
+    Returns:
+        Dictionary with 'entries' (txdb_id -> (start, end) of its block),
+        'metadata_end' (where a new entry would be appended) and 'size', or
+        None if the file doesn't have the expected layout
+    """
+    entries = {}
+    metadata_end = None
+    current = None
+    in_metadata = False
+    for match in SCAN_LINE_PATTERN.finditer(data):
+        line = match.group()
+        if not line.strip():
+            continue
+        if line[0] != 0x20:
+            if in_metadata:
+                if line.startswith(b'#'):
+                    # A comment between entries, not the end of the mapping
+                    return None
+                metadata_end = match.start()
+                break
+            if line.rstrip() == METADATA_LINE:
+                in_metadata = True
+                continue
+            if line.startswith(b'#'):
+                return None
+            continue
+        if not in_metadata:
+            return None
+        key_match = ENTRY_KEY_PATTERN.fullmatch(line)
+        if key_match is None or (key_match.group('name') or b'').lower() in NON_STRING_KEYS:
+            # Inline values, quoted keys or comments: leave those to the full rewrite
+            return None
+        if current is not None:
+            entries[current[0]] = (current[1], match.start())
+        if key_match.group('number') is not None:
+            txdb_id = int(key_match.group('number'))
+        else:
+            txdb_id = key_match.group('name').decode('utf-8')
+        current = (txdb_id, match.start())
+        if current[0] in entries:
+            return None
+    if not in_metadata:
+        return None
+    if metadata_end is None:
+        metadata_end = len(data)
+    if current is not None:
+        entries[current[0]] = (current[1], metadata_end)
+    return {'entries': entries, 'metadata_end': metadata_end, 'size': len(data)}
+
+
+class OffsetIndexedMetadata:
+    """
+    Dictionary-like access to the entries of a metadata file through its offset index.
+    
+    Entries are parsed on first access and cached, so callers can change them
+    in place. write() splices the blocks of changed and new entries into the
+    file, or rewrites the whole file when the index is missing or stale.
+    """
+    
+    def __init__(self, metadata_file):
+        self.metadata_file = Path(metadata_file)
+        self.loaded = {}  # txdb_id -> (entry, styles, original block text)
+        self.added = {}  # txdb_id -> entry, in insertion order
+        self.document = None
+        self.styles = None
+        self.stat = self.metadata_file.stat()
+        with open(self.metadata_file, 'rb') as f:
+            if self.stat.st_size == 0:
+                self.data = b''
+            else:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = build_offset_index(self.data)
+        if self.index is None:
+            self.load_document()
+    
+    def load_document(self) -> None:
+        """Fall back to loading the whole file."""
+        from metadata_yaml import parse_metadata
+        
+        self.document, self.styles = parse_metadata(bytes(self.data).decode('utf-8'))
+    
+    def __contains__(self, txdb_id) -> bool:
+        if txdb_id in self.added:
+            return True
+        if self.document is not None:
+            return txdb_id in self.document['metadata']
+        return txdb_id in self.index['entries']
+    
+    def get_block(self, txdb_id) -> str:
+        """
+        Get the YAML text of an entry's block without parsing it.
+        
+        Args:
+            txdb_id: Key of the entry
+        
+        Returns:
+            Block text, or None if the entry doesn't exist or the index isn't available
+        """
+        if self.index is None or txdb_id not in self.index['entries']:
+            return None
+        start, end = self.index['entries'][txdb_id]
+        return self.data[start:end].decode('utf-8')
+    
+    def get(self, txdb_id, default=None):
+        """
+        Get an entry, parsing only its own block.
+        
+        Args:
+            txdb_id: Key of the entry
+            default: Value returned when the entry doesn't exist
+        
+        Returns:
+            Entry mapping (cached, so in-place changes are written back by write())
+        """
+        if txdb_id in self.added:
+            return self.added[txdb_id]
+        if self.document is not None:
+            return self.document['metadata'].get(txdb_id, default)
+        if txdb_id in self.loaded:
+            return self.loaded[txdb_id][0]
+        block = self.get_block(txdb_id)
+        if block is None:
+            return default
+        
+        from metadata_yaml import parse_metadata
+        
+        document, styles = parse_metadata(f"metadata:\n{block}")
+        entry = document['metadata'].get(txdb_id)
+        if entry is None:
+            entry = {}
+        self.loaded[txdb_id] = (entry, styles, block)
+        return entry
+    
+    def __getitem__(self, txdb_id):
+        entry = self.get(txdb_id, KeyError)
+        if entry is KeyError:
+            raise KeyError(txdb_id)
+        return entry
+    
+    def __setitem__(self, txdb_id, entry: dict) -> None:
+        if self.document is not None:
+            self.document['metadata'][txdb_id] = entry
+        elif txdb_id in self.index['entries']:
+            self.get(txdb_id)
+            _, styles, block = self.loaded[txdb_id]
+            self.loaded[txdb_id] = (entry, styles, block)
+        else:
+            self.added[txdb_id] = entry
+    
+    def is_stale(self) -> bool:
+        """Check whether the file changed since it was indexed."""
+        stat = self.metadata_file.stat()
+        return stat.st_size != self.stat.st_size or stat.st_mtime_ns != self.stat.st_mtime_ns
+    
+    def rewrite(self) -> bool:
+        """
+        Apply the changes to a full load of the current file and rewrite it.
+        
+        Returns:
+            True if the file content changed
+        """
+        from metadata_yaml import load_metadata_file, write_metadata_file
+        
+        document, styles = load_metadata_file(self.metadata_file)
+        for txdb_id, (entry, _, _) in self.loaded.items():
+            document['metadata'][txdb_id] = entry
+        for txdb_id, entry in self.added.items():
+            document['metadata'][txdb_id] = entry
+        return write_metadata_file(document, self.metadata_file, styles)
+    
+    def write(self) -> bool:
+        """
+        Write changed and new entries back to the file.
+        
+        Only the blocks of entries whose serialization changed are replaced and
+        new entries are appended to the metadata mapping. The whole file is
+        rewritten instead when the index isn't available or the file changed
+        since it was indexed.
+        
+        Returns:
+            True if the file was written
+        """
+        if self.document is not None:
+            from metadata_yaml import write_metadata_file
+            
+            for txdb_id, entry in self.added.items():
+                self.document['metadata'][txdb_id] = entry
+            return write_metadata_file(self.document, self.metadata_file, self.styles)
+        
+        from metadata_yaml import dump_entry
+        
+        splices = []
+        for txdb_id, (entry, styles, block) in self.loaded.items():
+            new_block = dump_entry(txdb_id, entry, styles)
+            if new_block != block:
+                start, end = self.index['entries'][txdb_id]
+                splices.append((start, end, new_block))
+        if self.added:
+            appended = ''.join(dump_entry(txdb_id, entry) for txdb_id, entry in self.added.items())
+            end = self.index['metadata_end']
+            # The last entry may not end with a newline
+            if end > 0 and self.data[end - 1:end] != b'\n':
+                appended = '\n' + appended
+            splices.append((end, end, appended))
+        if not splices:
+            return False
+        if self.is_stale():
+            self.close()
+            return self.rewrite()
+        
+        splices.sort(key=lambda splice: splice[0])
+        parts = []
+        position = 0
+        for start, end, text in splices:
+            parts.append(self.data[position:start])
+            parts.append(text.encode('utf-8'))
+            position = end
+        parts.append(self.data[position:])
+        content = b''.join(parts)
+        self.close()
+        
+        temp_file = self.metadata_file.with_name(f".{self.metadata_file.name}.tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(content)
+        os.replace(temp_file, self.metadata_file)
+        return True
+    
+    def close(self) -> None:
+        """Release the memory map."""
+        if isinstance(self.data, mmap.mmap) and not self.data.closed:
+            # Keep a copy in case entries are read after closing
+            data = self.data[:]
+            self.data.close()
+            self.data = data
+
+
+def parse_txdb_id(text: str):
+    """Metadata keys are numbers, anything else is looked up as a string."""
+    return int(text) if text.isdigit() else text
+
+
+def format_value(value) -> str:
+    """
+    Format a value the way yq eval prints it.
+    
+    Args:
+        value: Parsed YAML value
+    
+    Returns:
+        Strings as-is, null as "null", other scalars in YAML form and
+        collections as YAML blocks
+    """
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    import yaml
+    
+    return yaml.safe_dump(value, sort_keys=False, allow_unicode=True).rstrip('\n')
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Point lookups and single-entry updates of metadata files"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    has_parser = subparsers.add_parser("has", help="Exit with 0 if the entry exists, 1 otherwise")
+    has_parser.add_argument("file", help="Metadata file")
+    has_parser.add_argument("txdb_id", help="Key of the entry")
+    
+    get_parser = subparsers.add_parser("get", help="Print an entry or one of its fields (null if missing)")
+    get_parser.add_argument("file", help="Metadata file")
+    get_parser.add_argument("txdb_id", help="Key of the entry")
+    get_parser.add_argument("field", nargs="?", help="Field to print instead of the whole entry")
+    get_parser.add_argument("--json", action="store_true", help="Print the value as JSON")
+    
+    set_parser = subparsers.add_parser("set", help="Set a string field of an existing entry")
+    set_parser.add_argument("file", help="Metadata file")
+    set_parser.add_argument("txdb_id", help="Key of the entry")
+    set_parser.add_argument("field", help="Field to set")
+    set_parser.add_argument("value", help="New string value")
+    
+    args = parser.parse_args()
+    
+    txdb_id = parse_txdb_id(args.txdb_id)
+    try:
+        metadata = OffsetIndexedMetadata(args.file)
+        if args.command == 'has':
+            sys.exit(0 if txdb_id in metadata else 1)
+        
+        entry = metadata.get(txdb_id)
+        if args.command == 'get':
+            if args.field is None:
+                value = entry
+            else:
+                value = entry.get(args.field) if isinstance(entry, dict) else None
+            block = metadata.get_block(txdb_id)
+            if args.json:
+                print(json.dumps(value, ensure_ascii=False))
+            elif args.field is None and block is not None:
+                # The entry's fields, dedented like yq prints a mapping
+                print('\n'.join(line[4:] for line in block.rstrip('\n').split('\n')[1:]))
+            else:
+                print(format_value(value))
+            return
+        
+        if entry is None:
+            print(f"Error: {args.txdb_id} not found in {args.file}", file=sys.stderr)
+            sys.exit(1)
+        entry[args.field] = args.value
+        metadata.write()
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
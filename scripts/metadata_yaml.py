@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Read and write movie-metadata.yml and show-metadata.yml in the repository's style.
+
+The metadata files are loaded once with the libyaml loader and written back
+with an emitter that reproduces the formatting left behind by
+sort-metadata-file.sh and format-metadata-file.sh (two-space indentation,
+indented sequences and their quoting rules), so files written from Python
+diff cleanly against files maintained with yq. sort_metadata() applies the
+ordering and pruning rules of sort-metadata-file.sh.
+"""
+
+import re
+
+import yaml
+
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+# Constants
+LEADING_ARTICLES = ("a ", "an ", "the ")
+# Characters Unidecode transliterates differently from glibc's iconv //TRANSLIT
+ICONV_TRANSLITERATIONS = str.maketrans({'·': '.', '¢': 'c'})
+MEDIA_TYPES = ("movie", "show")
+RELEASE_YEAR_PATTERN = re.compile(r'[0-9]{4}')
+TXDB_ID_PATTERN = re.compile(r'[0-9]+')
+
+# Plain scalars can't start with an indicator character or contain ": " / " #"
+PLAIN_UNSAFE_START = set('-?:,[]{}#&*!|>\'"%@`')
+PLAIN_UNSAFE_PATTERN = re.compile(r': |:$| #|[\x00-\x1f\x7f]|^\s|\s$')
+RESOLVER = yaml.resolver.Resolver()
+
+# Field order of a metadata entry, fields missing from the list are dropped when sorting
+ITEM_FIELDS = (
+    "label_title", "sort_title", "release_year", "url_poster", "url_background", "tpdb_search",
+    "audio_language", "summary", "studio", "episode_ordering", "genre.sync", "seasons"
+)
+# Fields removed from an entry when they are null, the others are kept as null
+NON_REQUIRED_FIELDS = ("studio", "audio_language", "episode_ordering", "seasons", "url_background", "summary")
+# Zero-pad standalone numbers of up to 5 digits to 6 digits so "Part 2" sorts before "Part 10"
+SORT_NUMBER_PADDING = tuple(
+    (re.compile(rf'\b([0-9]{{{digits}}})\b', re.ASCII), '0' * (6 - digits)) for digits in range(1, 6)
+)
+
+
+def collect_quote_styles(node, path: tuple, styles: dict) -> None:
+    """
+    Record the quoting style of every quoted scalar under a node.
+    
+    Args:
+        node: Composed YAML node
+        path: Key path of the node, with keys as written in the file
+        styles: Dictionary of path -> style character (' or ") to fill
+    """
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            collect_quote_styles(value_node, path + (key_node.value,), styles)
+    elif isinstance(node, yaml.SequenceNode):
+        # Items are keyed by their text so styles survive sorting the sequence
+        for item_node in node.value:
+            collect_quote_styles(item_node, path + (item_node.value,), styles)
+    elif node.style in ("'", '"'):
+        styles[path] = node.style
+
+
+def parse_metadata(stream) -> tuple:
+    """
+    Parse metadata YAML, remembering how its strings were quoted.
+    
+    The format scripts only enforce quoting for a few fields, every other
+    string keeps the style it was written with, so the styles are needed to
+    write the file back unchanged.
+    
+    Args:
+        stream: YAML text or open file
+    
+    Returns:
+        Tuple of (document, styles) where document has a 'metadata' mapping
+        (empty if there is none) and styles maps key paths of quoted strings
+        to their quote character
+    """
+    styles = {}
+    loader = SafeLoader(stream)
+    try:
+        node = loader.get_single_node()
+        document = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+    if node is not None:
+        collect_quote_styles(node, (), styles)
+    document = document or {}
+    if document.get('metadata') is None:
+        document['metadata'] = {}
+    return document, styles
+
+
+def load_metadata_file(metadata_file) -> tuple:
+    """
+    Load a metadata file, remembering how its strings were quoted.
+    
+    Args:
+        metadata_file: Path to movie-metadata.yml or show-metadata.yml
+    
+    Returns:
+        Tuple of (document, styles) as returned by parse_metadata()
+    """
+    with open(metadata_file, 'r', encoding='utf-8') as f:
+        return parse_metadata(f)
+
+
+def get_sort_title(title: str) -> str:
+    """
+    Derive the sort title the way functions/media/get-sort-title.sh does.
+    
+    Leading articles are dropped and the title is transliterated to ASCII
+    (Unidecode stands in for glibc's iconv //TRANSLIT, the few characters
+    they disagree on are mapped first). Characters without a transliteration,
+    like emoji, are dropped as tests/media/get-sort-title.bats expects.
+    
+    Args:
+        title: Label title of the media item
+    
+    Returns:
+        Sort title
+    """
+    from unidecode import unidecode
+    
+    sort_title = title
+    lower_title = title.lower()
+    for article in LEADING_ARTICLES:
+        if lower_title.startswith(article):
+            sort_title = title[len(article):]
+            break
+    return unidecode(sort_title.translate(ICONV_TRANSLITERATIONS)).rstrip()
+
+
+def get_tpdb_search(title: str, media_type: str) -> str:
+    """
+    Build the ThePosterDB search URL the way functions/media/get-tpdb-search.sh does.
+    
+    Args:
+        title: Label title of the media item
+        media_type: "movie" or "show"
+    
+    Returns:
+        Search URL for the title
+    """
+    encoded_title = title.replace(' ', '+').replace('&', '%26')
+    return f"https://theposterdb.com/search?term={encoded_title}&section={media_type}s"
+
+
+def is_plain_safe(value: str) -> bool:
+    """
+    Check whether a string can be written as a plain (unquoted) YAML scalar.
+    
+    Args:
+        value: String to check
+    
+    Returns:
+        True if the string reads back as the same string without quotes
+    """
+    if not value or value[0] in PLAIN_UNSAFE_START or PLAIN_UNSAFE_PATTERN.search(value):
+        return False
+    return RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == RESOLVER.DEFAULT_SCALAR_TAG
+
+
+def single_quote(value: str) -> str:
+    """Quote a string in YAML single-quoted style."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def double_quote(value: str) -> str:
+    """Quote a string in YAML double-quoted style."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def format_scalar(key, value, style: str = None, level: str = 'item') -> str:
+    """
+    Format a scalar value the way format-metadata-file.sh leaves it.
+    
+    - release_year is always single quoted
+    - An empty url_poster of an item or season is single quoted
+    - label_title, sort_title and tpdb_search with an apostrophe are double quoted
+    - label_title and sort_title with a colon are single quoted
+    - Anything else keeps the style it was loaded with, or is plain when
+      possible and single quoted otherwise
+    
+    Args:
+        key: Mapping key the value belongs to
+        value: Scalar value
+        style: Quote character the value was loaded with, if any
+        level: 'item', 'season' or 'episode', the level the value belongs to
+    
+    Returns:
+        YAML text for the value
+    """
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if level == 'item' and key == 'release_year':
+        return single_quote(str(value))
+    if not isinstance(value, str):
+        return str(value)
+    if level == 'item':
+        if key in ('label_title', 'sort_title', 'tpdb_search') and "'" in value:
+            return double_quote(value)
+        if key in ('label_title', 'sort_title') and ':' in value:
+            return single_quote(value)
+    if key == 'url_poster' and value == '' and level != 'episode':
+        return single_quote(value)
+    if style == '"' or (style is None and '\n' in value):
+        return double_quote(value)
+    if style == "'" or not is_plain_safe(value):
+        return single_quote(value)
+    return value
+
+
+def emit_mapping(mapping: dict, path: tuple, indent: int, lines: list, styles: dict, level: str) -> None:
+    """
+    Append the YAML lines of a block mapping.
+    
+    Args:
+        mapping: Mapping to emit
+        path: Key path of the mapping, with keys as written in the file
+        indent: Indentation of its keys
+        lines: Output lines to append to
+        styles: Quote styles from load_metadata_file()
+        level: 'item', 'season' or 'episode', the level the mapping's values belong to
+    """
+    prefix = ' ' * indent
+    for key, value in mapping.items():
+        key_text = format_scalar(None, key)
+        key_path = path + (str(key),)
+        if isinstance(value, dict):
+            if not value:
+                lines.append(f"{prefix}{key_text}: {{}}")
+                continue
+            lines.append(f"{prefix}{key_text}:")
+            if key == 'seasons' and level == 'item':
+                emit_numbered_mapping(value, key_path, indent + 2, lines, styles, 'season')
+            elif key == 'episodes' and level == 'season':
+                emit_numbered_mapping(value, key_path, indent + 2, lines, styles, 'episode')
+            else:
+                emit_mapping(value, key_path, indent + 2, lines, styles, level)
+        elif isinstance(value, list):
+            if not value:
+                lines.append(f"{prefix}{key_text}: []")
+                continue
+            lines.append(f"{prefix}{key_text}:")
+            for item in value:
+                lines.append(f"{prefix}  - {format_scalar(key, item, styles.get(key_path + (str(item),)), level)}")
+        else:
+            lines.append(f"{prefix}{key_text}: {format_scalar(key, value, styles.get(key_path), level)}")
+
+
+def emit_numbered_mapping(mapping: dict, path: tuple, indent: int, lines: list, styles: dict, level: str) -> None:
+    """
+    Append the YAML lines of a mapping of season or episode numbers.
+    
+    Args:
+        mapping: Mapping of number -> season or episode
+        path: Key path of the mapping, with keys as written in the file
+        indent: Indentation of the numbers
+        lines: Output lines to append to
+        styles: Quote styles from load_metadata_file()
+        level: 'season' or 'episode', the level of the numbered mappings
+    """
+    for number, child in mapping.items():
+        if isinstance(child, dict) and child:
+            lines.append(f"{' ' * indent}{format_scalar(None, number)}:")
+            emit_mapping(child, path + (str(number),), indent + 2, lines, styles, level)
+        else:
+            emit_mapping({number: child}, path, indent, lines, styles, level)
+
+
+def dump_entry(txdb_id, item: dict, styles: dict = None) -> str:
+    """
+    Serialize a single metadata entry as it appears under 'metadata:'.
+    
+    Args:
+        txdb_id: Key of the entry
+        item: Entry mapping
+        styles: Quote styles from parse_metadata(), if the entry was loaded from a file
+    
+    Returns:
+        YAML text of the entry ending with a newline
+    """
+    lines = [f"  {format_scalar(None, txdb_id)}:"]
+    emit_mapping(item or {}, ('metadata', str(txdb_id)), 4, lines, styles or {}, 'item')
+    return '\n'.join(lines) + '\n'
+
+
+def dump_metadata(document: dict, styles: dict = None) -> str:
+    """
+    Serialize a metadata document in the repository's style.
+    
+    Args:
+        document: Document with a 'metadata' mapping of id -> item
+        styles: Quote styles from load_metadata_file(), if the document was loaded from a file
+    
+    Returns:
+        YAML text ending with a newline
+    """
+    styles = styles or {}
+    parts = []
+    for key, value in document.items():
+        if key == 'metadata':
+            if not value:
+                parts.append("metadata: {}\n")
+                continue
+            parts.append("metadata:\n")
+            parts.extend(dump_entry(txdb_id, item, styles) for txdb_id, item in value.items())
+        else:
+            lines = []
+            emit_mapping({key: value}, (), 0, lines, styles, 'top')
+            parts.append('\n'.join(lines) + '\n')
+    return ''.join(parts)
+
+
+def write_metadata_file(document: dict, metadata_file, styles: dict = None) -> bool:
+    """
+    Write a metadata document, leaving the file untouched if nothing changed.
+    
+    Args:
+        document: Document with a 'metadata' mapping
+        metadata_file: Path to write to
+        styles: Quote styles from load_metadata_file()
+    
+    Returns:
+        True if the file was written, False if it already had this content
+    """
+    content = dump_metadata(document, styles)
+    try:
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(metadata_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+
+def get_sort_key(sort_title) -> str:
+    """
+    Build the natural sort key sort-metadata-file.sh orders entries by.
+    
+    The title is lowercased and standalone numbers are zero-padded one width at
+    a time (1, then 2, ... then 5 digits), like the chained sub() calls of the yq script.
+    
+    Args:
+        sort_title: Sort title of the entry
+    
+    Returns:
+        Sort key
+    """
+    key = str(sort_title or '').lower()
+    for pattern, padding in SORT_NUMBER_PADDING:
+        key = pattern.sub(lambda match: padding + match.group(1), key)
+    return key
+
+
+def sort_metadata(document: dict) -> dict:
+    """
+    Sort and normalize the entries of a metadata document in one pass.
+    
+    Applies the rules of sort-metadata-file.sh:
+    - Entries are ordered by get_sort_key() of their sort_title (stable)
+    - Fields are put in ITEM_FIELDS order, other fields are dropped
+    - Seasons are ordered by number
+    - genre.sync is sorted and defaults to an empty list
+    - NON_REQUIRED_FIELDS that are null are removed
+    
+    Args:
+        document: Document with a 'metadata' mapping, updated in place
+    
+    Returns:
+        The document
+    """
+    entries = sorted(document['metadata'].items(), key=lambda entry: get_sort_key((entry[1] or {}).get('sort_title')))
+    metadata = {}
+    for txdb_id, item in entries:
+        item = item or {}
+        sorted_item = {}
+        for field in ITEM_FIELDS:
+            value = item.get(field)
+            if value is None and field in NON_REQUIRED_FIELDS:
+                continue
+            if field == 'genre.sync':
+                value = sorted(value or [])
+            elif field == 'seasons' and value:
+                value = dict(sorted(value.items(), key=lambda season: int(season[0])))
+            sorted_item[field] = value
+        metadata[txdb_id] = sorted_item
+    document['metadata'] = metadata
+    return document
+
+
+def validate_media_item(txdb_id, media_type: str, release_year: str) -> str:
+    """
+    Apply the argument checks of functions/yaml/insert-media-item.sh.
+    
+    Args:
+        txdb_id: TMDb (movies) or TVDb (shows) id
+        media_type: "movie" or "show"
+        release_year: Release year of the item
+    
+    Returns:
+        Error message, or an empty string if the item is valid
+    """
+    if not TXDB_ID_PATTERN.fullmatch(str(txdb_id)):
+        return "txdb_id must contain only numbers."
+    if media_type not in MEDIA_TYPES:
+        return "type must be either 'movie' or 'show'."
+    if not RELEASE_YEAR_PATTERN.fullmatch(str(release_year)):
+        return "release_year must be a valid year (4 digits)."
+    return ''
+
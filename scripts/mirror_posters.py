@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Mirror every poster referenced by the metadata and config files to a local directory.
+
+This script does for all posters at once what functions/tpdb/download_tpdb_image.sh
+does for one: it collects every url_poster (seasons included) from
+movie-metadata.yml, show-metadata.yml and metadata/one-pace.yml and every
+url_poster_<id> from config.yml's url_poster_mappings in a single pass over
+each file, drops duplicate URLs and downloads them concurrently with the same
+User-Agent, at most --per-host requests to one host at a time.
+
+Files are stored by the SHA-256 of their content under objects/ in the mirror
+directory, so the same image behind several URLs is stored once, and
+manifest.json maps each URL to its file along with the ETag and Last-Modified
+it was served with. The manifest is saved while the mirror runs (and when it
+is interrupted), so a rerun resumes where the last one stopped: URLs checked
+within --max-age are skipped without a request and older ones are
+revalidated with If-None-Match/If-Modified-Since, a 304 keeping the file.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from http_cache import REQUEST_TIMEOUT, get_ttl, parse_retry_after
+
+
+# Constants
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCES = (
+    REPO_ROOT / "movie-metadata.yml",
+    REPO_ROOT / "show-metadata.yml",
+    REPO_ROOT / "metadata" / "one-pace.yml",
+    REPO_ROOT / "config.yml",
+)
+DEFAULT_MIRROR_DIR = REPO_ROOT / ".poster-mirror"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 4
+MAX_RETRIES = 4
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024
+SAVE_EVERY = 50  # Completed URLs between manifest saves
+# Same User-Agent as download_tpdb_image.sh, TPDb doesn't serve assets to unknown clients
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/114.0.0.0 Safari/537.36")
+POSTER_KEY_PATTERN = re.compile(r'^url_poster(?:_\w+)?$')
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+
+
+def collect_poster_urls(node, urls: dict, source: str) -> None:
+    """
+    Collect the poster URLs of a parsed YAML document, at any depth.
+    
+    Args:
+        node: Parsed YAML node
+        urls: Dictionary of URL -> first source file, updated in place
+        source: Name of the file the node was parsed from
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(value, str) and POSTER_KEY_PATTERN.match(str(key)):
+                url = value.strip()
+                if url.startswith(('http://', 'https://')):
+                    urls.setdefault(url, source)
+            else:
+                collect_poster_urls(value, urls, source)
+    elif isinstance(node, list):
+        for value in node:
+            collect_poster_urls(value, urls, source)
+
+
+def load_poster_urls(sources) -> dict:
+    """
+    Load the poster URLs of the source files.
+    
+    Args:
+        sources: Paths of the YAML files to read
+    
+    Returns:
+        Dictionary of URL -> first source file, in the order the URLs appear
+    
+    Raises:
+        FileNotFoundError: If a source file doesn't exist
+    """
+    import yaml
+    
+    # Use the libyaml C loader when PyYAML was built with it
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    
+    urls = {}
+    for source in sources:
+        with open(source, 'r', encoding='utf-8') as f:
+            collect_poster_urls(yaml.load(f, Loader=SafeLoader), urls, str(source))
+    return urls
+
+
+def get_extension(url: str, content_type: str) -> str:
+    """
+    Get the file extension of a downloaded poster.
+    
+    Args:
+        url: Poster URL
+        content_type: Content-Type of the response
+    
+    Returns:
+        Extension from the content type, or from the URL path if the type is unknown
+    """
+    extension = CONTENT_TYPE_EXTENSIONS.get((content_type or '').split(';')[0].strip().lower())
+    if extension:
+        return extension
+    suffix = Path(urlsplit(url).path).suffix.lower()
+    return suffix if re.fullmatch(r'\.[a-z0-9]{1,5}', suffix) else ''
+
+
+class PosterMirror:
+    """
+    Content-addressed poster store with a manifest of the URLs mirrored into it.
+    
+    Worker threads share one instance. Each thread has its own requests
+    session, each host has a semaphore limiting its concurrent requests, and
+    manifest updates happen under a lock.
+    """
+    
+    def __init__(self, mirror_dir, per_host: int = DEFAULT_PER_HOST, max_age: float = None):
+        self.mirror_dir = Path(mirror_dir)
+        self.tmp_dir = self.mirror_dir / "tmp"
+        self.manifest_path = self.mirror_dir / MANIFEST_NAME
+        self.per_host = per_host
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.host_slots = {}
+        self.local = threading.local()
+        self.manifest = self.load_manifest()
+    
+    def load_manifest(self) -> dict:
+        """
+        Load the manifest of a previous run.
+        
+        Returns:
+            Dictionary of URL -> entry, empty if there is no readable manifest
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('urls', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+    
+    def save_manifest(self) -> None:
+        """Write the manifest atomically, so an interrupted save leaves the previous one."""
+        with self.lock:
+            data = json.dumps({'urls': self.manifest}, indent=2, sort_keys=True)
+        self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+        os.replace(tmp_path, self.manifest_path)
+    
+    def get_session(self):
+        """Get the requests session of the current thread."""
+        import requests
+        
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            self.local.session = session
+        return session
+    
+    def get_host_slot(self, url: str) -> threading.Semaphore:
+        """Get the semaphore limiting the concurrent requests to the host of a URL."""
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+        return slot
+    
+    def get_entry(self, url: str):
+        """Get the manifest entry of a URL whose file is still in the mirror, or None."""
+        with self.lock:
+            entry = self.manifest.get(url)
+        if entry and (self.mirror_dir / entry.get('path', '')).is_file():
+            return entry
+        return None
+    
+    def is_fresh(self, url: str, entry: dict) -> bool:
+        """Check whether a mirrored URL was checked recently enough to skip it."""
+        max_age = get_ttl(url) if self.max_age is None else self.max_age
+        return time.time() - entry.get('checked', 0) < max_age
+    
+    def send(self, url: str, headers: dict):
+        """
+        Request a poster, retrying rate limited and failed requests.
+        
+        The host's slot is held for the whole download, so a Retry-After
+        wait also holds back the other requests to that host.
+        
+        Args:
+            url: Poster URL
+            headers: Conditional request headers
+        
+        Returns:
+            Streamed response of the last attempt
+        
+        Raises:
+            RuntimeError: If the request can't be sent
+        """
+        import requests
+        
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = self.get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
+            except requests.RequestException as e:
+                if attempt == MAX_RETRIES:
+                    raise RuntimeError(f"request failed: {e}") from e
+                time.sleep(2 ** attempt)
+                continue
+            
+            if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                response.close()
+                time.sleep(retry_after if retry_after is not None else 2 ** attempt)
+                continue
+            return response
+    
+    def store(self, url: str, response) -> dict:
+        """
+        Stream a response into the mirror under the hash of its content.
+        
+        Args:
+            url: Poster URL
+            response: Streamed 200 response
+        
+        Returns:
+            New manifest entry
+        """
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = self.tmp_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.part"
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            sha256 = digest.hexdigest()
+            content_type = response.headers.get('Content-Type', '')
+            path = Path("objects") / sha256[:2] / f"{sha256}{get_extension(url, content_type)}"
+            object_path = self.mirror_dir / path
+            if object_path.is_file():
+                # Another URL already brought the same image
+                tmp_path.unlink()
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, object_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        
+        return {
+            'sha256': sha256,
+            'path': path.as_posix(),
+            'size': size,
+            'content_type': content_type,
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            'checked': time.time(),
+        }
+    
+    def mirror(self, url: str) -> str:
+        """
+        Mirror one poster.
+        
+        Args:
+            url: Poster URL
+        
+        Returns:
+            'fresh' (skipped, checked within the maximum age), 'unchanged'
+            (304 response), 'updated' (the URL now serves a different file)
+            or 'downloaded' (first download of the URL)
+        
+        Raises:
+            RuntimeError: If the poster can't be downloaded
+        """
+        entry = self.get_entry(url)
+        if entry is not None and self.is_fresh(url, entry):
+            return 'fresh'
+        
+        conditional_headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                conditional_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = entry['last_modified']
+        
+        with self.get_host_slot(url):
+            response = self.send(url, conditional_headers)
+            with response:
+                if response.status_code == 304 and entry is not None:
+                    with self.lock:
+                        entry['checked'] = time.time()
+                    return 'unchanged'
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP status code: {response.status_code}")
+                new_entry = self.store(url, response)
+        
+        with self.lock:
+            self.manifest[url] = new_entry
+        if entry is None:
+            return 'downloaded'
+        return 'unchanged' if entry.get('sha256') == new_entry['sha256'] else 'updated'
+    
+    def clean_partial_downloads(self) -> int:
+        """
+        Delete the partial downloads an interrupted run left behind.
+        
+        Returns:
+            Number of files deleted
+        """
+        deleted = 0
+        for path in self.tmp_dir.glob('*.part') if self.tmp_dir.is_dir() else ():
+            path.unlink()
+            deleted += 1
+        return deleted
+
+
+def mirror_posters(mirror: PosterMirror, urls, workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Mirror posters concurrently, saving the manifest as they complete.
+    
+    Args:
+        mirror: Poster mirror to download into
+        urls: Poster URLs
+        workers: Number of concurrent downloads across all hosts
+    
+    Returns:
+        Dictionary of result (see PosterMirror.mirror(), plus 'failed') -> count
+    """
+    counts = {'downloaded': 0, 'updated': 0, 'unchanged': 0, 'fresh': 0, 'failed': 0}
+    completed = 0
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(mirror.mirror, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error: Failed to download {url}: {e}", file=sys.stderr)
+                result = 'failed'
+            counts[result] += 1
+            if result in ('downloaded', 'updated'):
+                print(f"{result.capitalize()} {url}")
+            completed += 1
+            if completed % SAVE_EVERY == 0:
+                mirror.save_manifest()
+    finally:
+        # On Ctrl+C, drop the queued downloads and save what is done before waiting
+        # for the running ones, so a second Ctrl+C doesn't lose the whole run
+        executor.shutdown(wait=False, cancel_futures=True)
+        mirror.save_manifest()
+        executor.shutdown(wait=True)
+        mirror.save_manifest()
+    return counts
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Mirror every poster referenced by the metadata and config files"
+    )
+    parser.add_argument(
+        "sources",
+        nargs="*",
+        help="YAML files to collect url_poster URLs from "
+             "(default: movie-metadata.yml, show-metadata.yml, metadata/one-pace.yml and config.yml)"
+    )
+    parser.add_argument(
+        "--mirror-dir",
+        default=os.environ.get('POSTER_MIRROR_DIR', str(DEFAULT_MIRROR_DIR)),
+        help="Directory to mirror the posters into (default: $POSTER_MIRROR_DIR or .poster-mirror)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of concurrent downloads (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Maximum concurrent downloads from one host (default: {DEFAULT_PER_HOST})"
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        help="Seconds a mirrored poster is used without revalidating it, 0 revalidates all "
+             "(default: the provider's TTL from http_cache.py)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only show how many posters each host would be asked for"
+    )
+    
+    args = parser.parse_args()
+    
+    if args.workers < 1 or args.per_host < 1:
+        print("Error: --workers and --per-host must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        urls = load_poster_urls([Path(source) for source in args.sources] or DEFAULT_SOURCES)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Found {len(urls)} unique poster URLs")
+    
+    if args.dry_run:
+        hosts = {}
+        for url in urls:
+            host = urlsplit(url).netloc.lower()
+            hosts[host] = hosts.get(host, 0) + 1
+        for host, count in sorted(hosts.items(), key=lambda item: (-item[1], item[0])):
+            print(f"  {host}: {count}")
+        return
+    
+    mirror = PosterMirror(args.mirror_dir, per_host=args.per_host, max_age=args.max_age)
+    mirror.clean_partial_downloads()
+    try:
+        counts = mirror_posters(mirror, urls, workers=args.workers)
+    except KeyboardInterrupt:
+        print("\nInterrupted, rerun to resume", file=sys.stderr)
+        sys.exit(130)
+    
+    print(f"\n✓ Mirrored posters into {args.mirror_dir}")
+    print(f"  Downloaded: {counts['downloaded']}")
+    print(f"  Updated:    {counts['updated']}")
+    print(f"  Unchanged:  {counts['unchanged']}")
+    print(f"  Fresh:      {counts['fresh']}")
+    print(f"  Failed:     {counts['failed']}")
+    if counts['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
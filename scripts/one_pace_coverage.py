@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Query which One Pace seasons and episodes cover anime episodes or manga chapters.
+
+This script reads the generated metadata/one-pace.yml, parses the anime episode
+and manga chapter ranges of every episode once into interval sets, and answers
+lookups through a reverse index. It can also report gaps and overlaps between arcs.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+import yaml
+
+from generate_one_pace_metadata import (
+    COVERAGE_FIELDS,
+    build_coverage_index,
+    find_coverage,
+    find_coverage_issues,
+    get_episode_coverage,
+    union_interval_sets
+)
+
+
+FIELD_LABELS = {
+    'anime_episodes': 'anime episode',
+    'manga_chapters': 'manga chapter'
+}
+
+
+def load_seasons(metadata_file: Path) -> dict:
+    """
+    Load the seasons from a generated One Pace metadata file.
+    
+    Args:
+        metadata_file: Path to the metadata YAML file
+    
+    Returns:
+        Dictionary mapping season numbers to their season metadata
+    """
+    with open(metadata_file, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    return data['metadata']['One Pace'].get('seasons') or {}
+
+
+def format_range(start: int, end: int) -> str:
+    """
+    Format a numeric range the same way the metadata summaries do.
+    
+    Args:
+        start: First number in the range
+        end: Last number in the range
+    
+    Returns:
+        "start" for a single number, otherwise "start - end"
+    """
+    return str(start) if start == end else f"{start} - {end}"
+
+
+def main():
+    """Main entry point for the script."""
+    parser = argparse.ArgumentParser(
+        description="Find which One Pace episodes cover anime episodes or manga chapters"
+    )
+    parser.add_argument(
+        "--metadata",
+        default="metadata/one-pace.yml",
+        help="Generated One Pace metadata file (default: metadata/one-pace.yml)"
+    )
+    parser.add_argument(
+        "--episode",
+        type=int,
+        action="append",
+        default=[],
+        help="Anime episode number to look up (can be repeated)"
+    )
+    parser.add_argument(
+        "--chapter",
+        type=int,
+        action="append",
+        default=[],
+        help="Manga chapter number to look up (can be repeated)"
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Report gaps and overlaps in anime episode and manga chapter coverage across arcs"
+    )
+    
+    args = parser.parse_args()
+    
+    if not args.episode and not args.chapter and not args.report:
+        parser.error("nothing to do, pass --episode, --chapter and/or --report")
+    
+    metadata_file = Path(args.metadata)
+    if not metadata_file.exists():
+        print(f"Error: Metadata file not found: {metadata_file}", file=sys.stderr)
+        sys.exit(1)
+    
+    seasons = load_seasons(metadata_file)
+    coverage = {season_num: get_episode_coverage(season.get('episodes') or {})
+                for season_num, season in seasons.items()}
+    
+    lookups = {'anime_episodes': args.episode, 'manga_chapters': args.chapter}
+    for field in COVERAGE_FIELDS:
+        if not lookups[field]:
+            continue
+        episode_index = build_coverage_index({
+            (season_num, episode_num): episode_coverage[field]
+            for season_num, season_coverage in coverage.items()
+            for episode_num, episode_coverage in season_coverage.items()
+        })
+        for number in lookups[field]:
+            matches = find_coverage(episode_index, number)
+            if not matches:
+                print(f"{FIELD_LABELS[field].capitalize()} {number}: not covered")
+                continue
+            print(f"{FIELD_LABELS[field].capitalize()} {number}:")
+            for season_num, episode_num in matches:
+                season = seasons[season_num]
+                title = season['episodes'][episode_num].get('title', '')
+                print(f"  Season {season_num} ({season.get('title', '')}), episode {episode_num}: {title}")
+    
+    if args.report:
+        for field in COVERAGE_FIELDS:
+            season_index = build_coverage_index({
+                season_num: union_interval_sets(episode_coverage[field] for episode_coverage in season_coverage.values())
+                for season_num, season_coverage in coverage.items()
+            })
+            gaps, overlaps = find_coverage_issues(season_index)
+            print(f"\n{FIELD_LABELS[field].capitalize()} coverage: {len(gaps)} gap(s), {len(overlaps)} overlap(s)")
+            for start, end in gaps:
+                print(f"  Gap: {format_range(start, end)}")
+            for start, end, season_nums in overlaps:
+                print(f"  Overlap: {format_range(start, end)} in seasons {', '.join(str(n) for n in season_nums)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Read .xlsx workbook sheets the way pandas.read_excel() sees them, without pandas.
+
+Cells are converted like pandas' openpyxl reader converts them (empty cells
+become '', error cells NaN and whole-number floats ints), trailing empty cells
+and rows are trimmed, rows are padded to the widest one and the header row is
+named and de-duplicated like pandas names DataFrame columns ("Unnamed: <index>"
+for blank headers, ".<n>" suffixes for repeated ones). Both
+convert_xlsx_to_csvs.py and generate_one_pace_metadata.py read workbooks
+through these helpers.
+"""
+
+import math
+
+
+def convert_cell(cell):
+    """
+    Convert a workbook cell the way pandas' openpyxl reader does.
+    
+    Args:
+        cell: openpyxl cell (from a read-only workbook opened with data_only=True)
+    
+    Returns:
+        '' for empty cells, NaN for error cells, an int for whole numbers and
+        the cell value otherwise
+    """
+    value = cell.value
+    if value is None:
+        return ''
+    if cell.data_type == 'e':
+        return math.nan
+    if cell.data_type == 'n':
+        if value == int(value):
+            return int(value)
+        return float(value)
+    return value
+
+
+def read_sheet_data(worksheet) -> list:
+    """
+    Read the converted cell values of a sheet.
+    
+    Args:
+        worksheet: openpyxl worksheet (ideally from a read-only workbook)
+    
+    Returns:
+        List of rows, without trailing empty cells and rows and padded to the
+        width of the widest row
+    """
+    # Read-only sheets trust the dimensions stored in the file, which can
+    # include formatted but empty cells
+    if hasattr(worksheet, 'reset_dimensions'):
+        worksheet.reset_dimensions()
+    
+    data = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(worksheet.rows):
+        values = [convert_cell(cell) for cell in row]
+        while values and values[-1] == '':
+            values.pop()
+        if values:
+            last_row_with_data = row_number
+        data.append(values)
+    data = data[:last_row_with_data + 1]
+    
+    width = max((len(values) for values in data), default=0)
+    for values in data:
+        values.extend([''] * (width - len(values)))
+    return data
+
+
+def get_sheet_headers(header_row: list) -> list:
+    """
+    Name the columns of a sheet from its header row like pandas does.
+    
+    Args:
+        header_row: First row from read_sheet_data()
+    
+    Returns:
+        Column names, with "Unnamed: <index>" for blank headers and ".<n>"
+        suffixes for repeated ones (given names are kept before blank ones are
+        renamed)
+    """
+    headers = []
+    unnamed = []
+    for index, value in enumerate(header_row):
+        if value == '':
+            headers.append(f"Unnamed: {index}")
+            unnamed.append(index)
+        else:
+            headers.append(value)
+    
+    counts = {}
+    for index in [index for index in range(len(headers)) if index not in unnamed] + unnamed:
+        header = original = headers[index]
+        count = counts.get(header, 0)
+        while count > 0:
+            counts[original] = count + 1
+            header = f"{original}.{count}"
+            count = count + 1 if header in headers else counts.get(header, 0)
+        headers[index] = header
+        counts[header] = count + 1
+    return headers
+
+
+def format_cell_value(value) -> str:
+    """
+    Convert a workbook cell value to the text it has in an exported CSV.
+    
+    Args:
+        value: Cell value read by openpyxl or convert_cell()
+    
+    Returns:
+        Cell text, with empty and error cells as '' and whole-number floats without '.0'
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_sheet_rows(worksheet):
+    """
+    Iterate the rows of a workbook sheet, the same way iter_csv_rows() would for its CSV export.
+    
+    Args:
+        worksheet: openpyxl worksheet (ideally from a read-only workbook)
+    
+    Yields:
+        Row dictionaries keyed by column header (see get_sheet_headers())
+    """
+    data = read_sheet_data(worksheet)
+    if not data:
+        return
+    
+    headers = [format_cell_value(header) for header in get_sheet_headers(data[0])]
+    for row in data[1:]:
+        yield dict(zip(headers, [format_cell_value(value) for value in row]))
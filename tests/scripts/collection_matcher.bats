@@ -0,0 +1,66 @@
+#!/usr/bin/env bats
+
+function setup() {
+    export PYTHONPATH="scripts"
+}
+
+function match() {
+    python3 -c 'import sys; from collection_matcher import match_collections; name, score = match_collections([sys.argv[1]], sys.argv[2:])[sys.argv[1]]; print(f"{name} {score:.2f}")' "$@"
+}
+
+@test "collection matcher, matches names with suffixes and accents" {
+  run match "Amelie" "Amélie Collection" "Alien Collection"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Amélie Collection 1.00" ]
+}
+
+@test "collection matcher, doesn't match numbered sequels" {
+  run match "Toy Story 2" "Toy Story Collection"
+  [ "$status" -eq 0 ]
+  [ "$output" = "None 0.00" ]
+}
+
+@test "collection matcher, matches names with the same numbers" {
+  run match "28 Days/Weeks Later" "28 Days/Weeks/Years Later Collection" "28 Years Later"
+  [ "$status" -eq 0 ]
+  [ "$output" = "28 Days/Weeks/Years Later Collection 0.86" ]
+}
+
+@test "collection matcher, scores names sharing only frequent n-grams" {
+  run python3 -c '
+from collection_matcher import CollectionMatcher, MAX_POSTING_LENGTH
+names = [f"Zz{i:03d} Story" for i in range(MAX_POSTING_LENGTH + 1)] + ["Toy Story"]
+matcher = CollectionMatcher(names)
+print(matcher.match("Story"))
+'
+  [ "$status" -eq 0 ]
+  [ "$output" = "('Toy Story', 0.7142857142857143)" ]
+}
+
+@test "collection matcher, skips names below the threshold" {
+  run python3 -c '
+from collection_matcher import CollectionMatcher
+matcher = CollectionMatcher(["Toy Story", "Story"])
+print(matcher.match("Toy Stories", 0.7), matcher.match("Toy Stories", 0.8))
+'
+  [ "$status" -eq 0 ]
+  [ "$output" = "('Toy Story', 0.7) (None, 0.0)" ]
+}
+
+@test "collection matcher, lists near matches with unmatched names" {
+  run python3 -c '
+from collection_matcher import find_unmatched_collections
+print(find_unmatched_collections(["Alien", "Toy Stories", "Heat"], ["Alien Collection", "Toy Story Collection"]))
+'
+  [ "$status" -eq 0 ]
+  [ "$output" = "{'Toy Stories': ('Toy Story Collection', 0.7), 'Heat': (None, 0.0)}" ]
+}
+
+@test "collection matcher, indexed matches equal all pairs" {
+  run python3 scripts/benchmark_collection_matcher.py --count 500 --repeat 1
+  [ "$status" -eq 0 ]
+  [ "${lines[-1]}" = "✓ Both paths found the same closest names and scores" ]
+  run python3 scripts/benchmark_collection_matcher.py --count 500 --repeat 1 --threshold 0
+  [ "$status" -eq 0 ]
+  [ "${lines[-1]}" = "✓ Both paths found the same closest names and scores" ]
+}
@@ -0,0 +1,78 @@
+#!/usr/bin/env bats
+
+function setup() {
+    script="scripts/convert_xlsx_to_csvs.py"
+    tmp_dir="$(mktemp -d)"
+    workbook="$tmp_dir/workbook.xlsx"
+    # Sheets with the cells pandas types, trims and renames: whole numbers next
+    # to blanks, missing value markers, dates, duplicate and blank headers,
+    # formatted empty cells after the data and trailing blank rows
+    python3 - "$workbook" <<'PYTHON'
+import datetime
+import sys
+
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+workbook = Workbook()
+arcs = workbook.active
+arcs.title = "Arcs"
+arcs.append(["Arc", "Episodes", "Episodes", None, "Released", "Chapters", "Flag"])
+arcs.append(["Romance Dawn", 4, "1-4", "x", datetime.datetime(2020, 1, 1), "1-7", True])
+arcs.append(["Orange Town", None, "5-8", None, datetime.datetime(2020, 2, 1), "8, 9,", "TRUE"])
+arcs.append(["Syrup Village", 18.0, "N/A", None, None, "NA", 1])
+arcs.append([None, None, None, None, None, None, None])
+arcs["J1"].font = Font(bold=True)
+arcs["A9"].font = Font(bold=True)
+
+episodes = workbook.create_sheet("Episodes")
+episodes.append(["Episode", "Length", "Aired"])
+episodes.append(["1", 1.5, datetime.datetime(2021, 3, 4, 18, 30)])
+episodes.append([" 2", 2, datetime.datetime(2021, 3, 5)])
+
+workbook.create_sheet("Empty")
+workbook.save(sys.argv[1])
+PYTHON
+}
+
+function teardown() {
+    rm -rf "$tmp_dir"
+}
+
+@test "convert xlsx to csvs, missing args" {
+  run python3 "$script"
+  [ "$status" -eq 2 ]
+}
+
+@test "convert xlsx to csvs, missing input file" {
+  run python3 "$script" "$tmp_dir/missing.xlsx" "$tmp_dir/csv"
+  [ "$status" -eq 1 ]
+  [ "$output" = "Error: Input file not found: $tmp_dir/missing.xlsx" ]
+}
+
+@test "convert xlsx to csvs, streaming matches pandas" {
+  run python3 "$script" "$workbook" "$tmp_dir/pandas"
+  [ "$status" -eq 0 ]
+  run python3 "$script" --streaming "$workbook" "$tmp_dir/streaming"
+  [ "$status" -eq 0 ]
+  run diff -r "$tmp_dir/pandas" "$tmp_dir/streaming"
+  [ "$status" -eq 0 ]
+  [ "$(ls "$tmp_dir/streaming" | wc -l)" -eq 3 ]
+}
+
+@test "convert xlsx to csvs, streaming with jobs matches pandas" {
+  run python3 "$script" "$workbook" "$tmp_dir/pandas"
+  [ "$status" -eq 0 ]
+  run python3 "$script" --streaming --jobs 2 "$workbook" "$tmp_dir/streaming"
+  [ "$status" -eq 0 ]
+  run diff -r "$tmp_dir/pandas" "$tmp_dir/streaming"
+  [ "$status" -eq 0 ]
+}
+
+@test "convert xlsx to csvs, streaming leaves pandas exports unchanged" {
+  run python3 "$script" "$workbook" "$tmp_dir/csv"
+  [ "$status" -eq 0 ]
+  run python3 "$script" --streaming "$workbook" "$tmp_dir/csv"
+  [ "$status" -eq 0 ]
+  [ "${lines[-1]}" = "Successfully converted 3 sheet(s) to CSV files in $tmp_dir/csv (0 written, 3 unchanged)" ]
+}
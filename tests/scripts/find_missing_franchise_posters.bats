@@ -0,0 +1,86 @@
+#!/usr/bin/env bats
+
+load stub_server
+
+function setup() {
+    script="$PWD/scripts/find_missing_franchise_posters.py"
+    tmp_dir="$(mktemp -d)"
+    routes_file="$tmp_dir/routes.json"
+    export HTTP_CACHE_DIR="$tmp_dir/cache"
+    # Section 1 has two pages of collections, section 4 is a second movie
+    # library and section 3 isn't a movie or show library
+    python3 - "$routes_file" <<'PYTHON'
+import json, sys
+
+def page(key, titles, start, size=200):
+    items = titles[start:start + size]
+    path = f"GET /library/sections/{key}/all?type=18&X-Plex-Container-Start={start}&X-Plex-Container-Size={size}"
+    container = {'size': len(items), 'totalSize': len(titles), 'offset': start,
+                 'Metadata': [{'type': 'collection', 'title': title} for title in items]}
+    return path, [{'status': 200, 'body': {'MediaContainer': container}}]
+
+sections = {'MediaContainer': {'size': 4, 'Directory': [
+    {'key': '1', 'type': 'movie', 'title': 'Movies'},
+    {'key': '2', 'type': 'show', 'title': 'TV Shows'},
+    {'key': '3', 'type': 'artist', 'title': 'Music'},
+    {'key': '4', 'type': 'movie', 'title': 'Movies 4K'},
+]}}
+movies = [f"Franchise {i}" for i in range(250)]
+routes = dict([
+    ('GET /library/sections', [{'status': 200, 'body': sections}]),
+    page('1', movies, 0),
+    page('1', movies, 200),
+    page('2', ['Mapped Show', 'Unmapped Show'], 0),
+    page('4', ['Franchise 3', 'Mapped Movie Trilogy'], 0),
+])
+with open(sys.argv[1], 'w') as f:
+    json.dump(routes, f)
+PYTHON
+    cat > "$tmp_dir/config.yml" <<'YAML'
+url_poster_mappings:
+  franchise_movie_posters:
+    url_poster_10: https://example.com/10.jpg
+    url_poster_11: https://example.com/11.jpg
+  franchise_show_posters:
+    url_poster_20: https://example.com/20.jpg
+YAML
+    cat > "$tmp_dir/tmdb-collection-names.json" <<'JSON'
+{"movie": {"10": "Franchise 1 Collection", "11": "Mapped Movie Collection"}, "show": {"20": "Mapped Show"}}
+JSON
+    start_stub_server "$routes_file"
+}
+
+function teardown() {
+    stop_stub_server
+    rm -rf "$tmp_dir"
+}
+
+function find_missing() {
+    cd "$tmp_dir" && python3 "$script" "$stub_url" plex-token tmdb-key --offline
+}
+
+@test "find missing franchise posters, wrong number of args" {
+  run python3 "$script" "$stub_url" plex-token
+  [ "$status" -eq 1 ]
+  [ "$output" = "Usage: python plex.py <plex_url> <plex_token> <tmdb_api_token> [--offline]" ]
+}
+
+@test "find missing franchise posters, pages through collections" {
+  run find_missing
+  [ "$status" -eq 0 ]
+  grep -q "^251 Plex Movie Collections Found$" <<< "$output"
+  grep -q "^2 Plex Show Collections Found$" <<< "$output"
+  [ "$(grep -c 'sections/1/all' "$stub_log")" -eq 2 ]
+  grep -q "X-Plex-Container-Start=200&" "$stub_log"
+  grep -q "^- \[Franchise 249\]" "$tmp_dir/missing_movie_collections.md"
+  [ "$(grep -c "^- \[Franchise 1\]" "$tmp_dir/missing_movie_collections.md")" -eq 0 ]
+}
+
+@test "find missing franchise posters, scans every section of a type" {
+  run find_missing
+  [ "$status" -eq 0 ]
+  grep -q "sections/4/all" "$stub_log"
+  [ "$(grep -c "sections/3/all" "$stub_log")" -eq 0 ]
+  [ "$(grep -c "Mapped Movie Trilogy" "$tmp_dir/missing_movie_collections.md")" -eq 0 ]
+  [ "$(cat "$tmp_dir/missing_show_collections.md")" = "- [Unmapped Show](https://www.themoviedb.org/search?query=Unmapped+Show+Collection) - closest: [Mapped Show](https://www.themoviedb.org/tv/20) (0.83)" ]
+}
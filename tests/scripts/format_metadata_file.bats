@@ -0,0 +1,125 @@
+#!/usr/bin/env bats
+
+function setup() {
+    script="scripts/format_metadata_file.py"
+    tmp_dir="$(mktemp -d)"
+    metadata_file="$tmp_dir/metadata.yml"
+    cat > "$metadata_file" <<'YAML'
+metadata:
+  300:
+    sort_title: Movie 10
+    label_title: Movie 10
+    release_year: 2010
+    url_poster: ""
+    tpdb_search: https://theposterdb.com/search?term=Movie+10&section=movies
+    studio: null
+    genre.sync:
+      - Drama
+      - Action
+  200:
+    label_title: "Movie: Two"
+    sort_title: Movie 2
+    release_year: '2002'
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=Movie:+Two&section=movies
+    summary: null
+  100:
+    label_title: It's
+    sort_title: It's
+    release_year: 2001
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=It's&section=shows
+    seasons:
+      10:
+        url_poster: ""
+      2:
+        url_poster: ""
+YAML
+}
+
+function teardown() {
+    rm -rf "$tmp_dir"
+}
+
+# Output of functions/yaml/sort-metadata-file.sh and format-metadata-file.sh for the file from setup()
+function expected_output() {
+    cat <<'YAML'
+metadata:
+  100:
+    label_title: "It's"
+    sort_title: "It's"
+    release_year: '2001'
+    url_poster: ''
+    tpdb_search: "https://theposterdb.com/search?term=It's&section=shows"
+    genre.sync: []
+    seasons:
+      2:
+        url_poster: ''
+      10:
+        url_poster: ''
+  200:
+    label_title: 'Movie: Two'
+    sort_title: Movie 2
+    release_year: '2002'
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=Movie:+Two&section=movies
+    genre.sync: []
+  300:
+    label_title: Movie 10
+    sort_title: Movie 10
+    release_year: '2010'
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=Movie+10&section=movies
+    genre.sync:
+      - Action
+      - Drama
+YAML
+}
+
+@test "format metadata file, missing args" {
+  run python3 "$script"
+  [ "$status" -eq 2 ]
+}
+
+@test "format metadata file, missing file" {
+  run python3 "$script" "$tmp_dir/missing.yml"
+  [ "$status" -eq 1 ]
+  [ "$output" = "Error: File not found: $tmp_dir/missing.yml" ]
+}
+
+@test "format metadata file, sorts and formats" {
+  run python3 "$script" "$metadata_file"
+  [ "$status" -eq 0 ]
+  [ "$output" = "  ✓ Sorted and formatted $metadata_file" ]
+  [ "$(cat "$metadata_file")" = "$(expected_output)" ]
+}
+
+@test "format metadata file, already formatted" {
+  expected_output > "$metadata_file"
+  run python3 "$script" "$metadata_file"
+  [ "$status" -eq 0 ]
+  [ "$output" = "  = $metadata_file is already sorted and formatted" ]
+  [ "$(cat "$metadata_file")" = "$(expected_output)" ]
+}
+
+@test "format metadata file, check doesn't write" {
+  cp "$metadata_file" "$tmp_dir/original.yml"
+  run python3 "$script" --check "$metadata_file"
+  [ "$status" -eq 1 ]
+  [ "${lines[0]}" = "  ✗ $metadata_file is not sorted and formatted" ]
+  cmp "$metadata_file" "$tmp_dir/original.yml"
+}
+
+@test "format metadata file, repository metadata files are already formatted" {
+  run python3 "$script" --check movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+}
+
+@test "format metadata file, matches shell scripts" {
+  yq --version 2>/dev/null | grep -q mikefarah || skip "needs mikefarah/yq"
+  cp "$metadata_file" "$tmp_dir/shell.yml"
+  bash functions/yaml/sort-metadata-file.sh "$tmp_dir/shell.yml"
+  bash functions/yaml/format-metadata-file.sh "$tmp_dir/shell.yml"
+  python3 "$script" "$metadata_file"
+  diff "$tmp_dir/shell.yml" "$metadata_file"
+}
@@ -0,0 +1,59 @@
+#!/usr/bin/env bats
+
+load stub_server
+
+function setup() {
+    script="scripts/http_cache.py"
+    tmp_dir="$(mktemp -d)"
+    cache_dir="$tmp_dir/cache"
+    routes_file="$tmp_dir/routes.json"
+    cat > "$routes_file" <<'JSON'
+{
+  "GET /3/movie/1": [{"status": 200, "headers": {"ETag": "\"v1\""}, "body": {"id": 1}},
+                     {"status": 304, "headers": {"ETag": "\"v1\""}}]
+}
+JSON
+    start_stub_server "$routes_file"
+}
+
+function teardown() {
+    stop_stub_server
+    rm -rf "$tmp_dir"
+}
+
+@test "http cache, fresh response is served from the cache" {
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/1"
+  [ "$status" -eq 0 ]
+  [ "$output" = '{"id": 1}' ]
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/1"
+  [ "$status" -eq 0 ]
+  [ "$output" = '{"id": 1}' ]
+  [ "$(wc -l < "$stub_log")" -eq 1 ]
+}
+
+@test "http cache, stale response is revalidated with its etag" {
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/1"
+  [ "$status" -eq 0 ]
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/1" --ttl 0 -o "$tmp_dir/body.json"
+  [ "$status" -eq 0 ]
+  [ "$output" = "200" ]
+  [ "$(cat "$tmp_dir/body.json")" = '{"id": 1}' ]
+  [ "$(cut -d' ' -f2- < "$stub_log")" = "$(printf 'GET /3/movie/1 -\nGET /3/movie/1 "v1"')" ]
+}
+
+@test "http cache, offline serves stale responses" {
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/1"
+  [ "$status" -eq 0 ]
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/1" --ttl 0 --offline
+  [ "$status" -eq 0 ]
+  [ "$output" = '{"id": 1}' ]
+  [ "$(wc -l < "$stub_log")" -eq 1 ]
+}
+
+@test "http cache, offline miss" {
+  run python3 "$script" --cache-dir "$cache_dir" fetch "$stub_url/3/movie/2" --offline -o "$tmp_dir/body.json"
+  [ "$status" -eq 1 ]
+  [ "${lines[0]}" = "Error: $stub_url/3/movie/2 is not cached (offline)" ]
+  [ "${lines[1]}" = "000" ]
+  [ ! -e "$stub_log" ]
+}
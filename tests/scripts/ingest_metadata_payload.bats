@@ -0,0 +1,231 @@
+#!/usr/bin/env bats
+
+# Runs the cases of tests/media/get-sort-title.bats and get-tpdb-search.bats
+# through the Python ingest path. The special letter and number cases expect
+# glibc's iconv transliteration, which the workflows run with, where
+# get-sort-title.bats expects libiconv's ("'o", "^3").
+
+function setup() {
+    script="scripts/ingest_metadata_payload.py"
+    index="scripts/metadata_offset_index.py"
+    tmp_dir="$(mktemp -d)"
+    payload_file="$tmp_dir/payload.json"
+    movie_file="$tmp_dir/movie-metadata.yml"
+    show_file="$tmp_dir/show-metadata.yml"
+    emoji="🦊"
+    number="³"
+    number_translated="3"
+    letter="ó"
+    letter_translated="o"
+}
+
+function teardown() {
+    rm -rf "$tmp_dir"
+}
+
+# Ingest a single item with the given title into empty metadata files and print one of its fields
+function ingest_field() {
+    local title="$1" media_type="$2" field="$3"
+    printf 'metadata:\n' > "$movie_file"
+    printf 'metadata:\n' > "$show_file"
+    python3 -c 'import json, sys; print(json.dumps({f"{sys.argv[2]}s": [{"db_id": 1, "title": sys.argv[1], "release_year": "2020"}]}))' \
+        "$title" "$media_type" > "$payload_file"
+    python3 "$script" "$payload_file" --movie-file "$movie_file" --show-file "$show_file" > /dev/null
+    if [ "$media_type" = "movie" ]; then
+        python3 "$index" get "$movie_file" 1 "$field"
+    else
+        python3 "$index" get "$show_file" 1 "$field"
+    fi
+}
+
+function sort_title() {
+    ingest_field "$1" movie sort_title
+}
+
+function tpdb_search() {
+    ingest_field "$1" "$2" tpdb_search
+}
+
+@test "ingest metadata payload, missing args" {
+  run python3 "$script"
+  [ "$status" -eq 2 ]
+}
+
+@test "ingest metadata payload, sort title, uppercase, no articles" {
+  run sort_title "QUICK BROWN FOX"
+  [ "$status" -eq 0 ]
+  [ "$output" = "QUICK BROWN FOX" ]
+}
+
+@test "ingest metadata payload, sort title, lowercase, no articles" {
+  run sort_title "quick brown fox"
+  [ "$status" -eq 0 ]
+  [ "$output" = "quick brown fox" ]
+}
+
+@test "ingest metadata payload, sort title, mixed case, no articles" {
+  run sort_title "QuIcK bRoWn FoX"
+  [ "$status" -eq 0 ]
+  [ "$output" = "QuIcK bRoWn FoX" ]
+}
+
+@test "ingest metadata payload, sort title, emoji, no articles" {
+  run sort_title "Quick Brown Fox $emoji"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Brown Fox" ]
+}
+
+@test "ingest metadata payload, sort title, special letter, no articles" {
+  run sort_title "Quick Br${letter}wn F${letter}x"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Br${letter_translated}wn F${letter_translated}x" ]
+}
+
+@test "ingest metadata payload, sort title, special number, no articles" {
+  run sort_title "Quick Brown Fox${number}"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Brown Fox${number_translated}" ]
+}
+
+@test "ingest metadata payload, sort title, uppercase, article" {
+  run sort_title "THE QUICK BROWN FOX"
+  [ "$status" -eq 0 ]
+  [ "$output" = "QUICK BROWN FOX" ]
+}
+
+@test "ingest metadata payload, sort title, lowercase, article" {
+  run sort_title "the quick brown fox"
+  [ "$status" -eq 0 ]
+  [ "$output" = "quick brown fox" ]
+}
+
+@test "ingest metadata payload, sort title, mixed case, article" {
+  run sort_title "ThE QuIcK bRoWn FoX"
+  [ "$status" -eq 0 ]
+  [ "$output" = "QuIcK bRoWn FoX" ]
+}
+
+@test "ingest metadata payload, sort title, emoji, article" {
+  run sort_title "The Quick Brown Fox $emoji"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Brown Fox" ]
+}
+
+@test "ingest metadata payload, sort title, special letter, article" {
+  run sort_title "The Quick Br${letter}wn F${letter}x"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Br${letter_translated}wn F${letter_translated}x" ]
+}
+
+@test "ingest metadata payload, sort title, special number, article" {
+  run sort_title "The Quick Brown Fox${number}"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Brown Fox${number_translated}" ]
+}
+
+@test "ingest metadata payload, sort title, multiple articles" {
+  run sort_title "The Quick Brown Fox Jumped Over The Lazy Dog"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Quick Brown Fox Jumped Over The Lazy Dog" ]
+}
+
+@test "ingest metadata payload, sort title, all numbers" {
+  run sort_title "1234567890"
+  [ "$status" -eq 0 ]
+  [ "$output" = "1234567890" ]
+}
+
+@test "ingest metadata payload, sort title, empty string" {
+  run sort_title ""
+  [ "$status" -eq 0 ]
+  [ "$output" = "" ]
+}
+
+@test "ingest metadata payload, sort title, transliterations unidecode disagrees on" {
+  run sort_title "WALL·E"
+  [ "$status" -eq 0 ]
+  [ "$output" = "WALL.E" ]
+  run sort_title "Ri¢hie Ri¢h"
+  [ "$status" -eq 0 ]
+  [ "$output" = "Richie Rich" ]
+}
+
+@test "ingest metadata payload, sort title, matches shell function" {
+  iconv --version 2>/dev/null | grep -q GLIBC || skip "needs glibc iconv"
+  for title in "QUICK BROWN FOX" "ThE QuIcK bRoWn FoX" "The Quick Br${letter}wn F${letter}x" "The Quick Brown Fox${number}" \
+      "The Quick Brown Fox Jumped Over The Lazy Dog" "1234567890" "" "WALL·E" "Ri¢hie Ri¢h"; do
+    [ "$(sort_title "$title")" = "$(LC_ALL=C.UTF-8 bash functions/media/get-sort-title.sh "$title")" ]
+  done
+}
+
+@test "ingest metadata payload, tpdb search, movie type, simple title" {
+  run tpdb_search "Avatar" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Avatar&section=movies" ]
+}
+
+@test "ingest metadata payload, tpdb search, show type, simple title" {
+  run tpdb_search "Avatar" "show"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Avatar&section=shows" ]
+}
+
+@test "ingest metadata payload, tpdb search, movie type, title with spaces" {
+  run tpdb_search "The Dark Knight" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=The+Dark+Knight&section=movies" ]
+}
+
+@test "ingest metadata payload, tpdb search, show type, title with spaces" {
+  run tpdb_search "Breaking Bad" "show"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Breaking+Bad&section=shows" ]
+}
+
+@test "ingest metadata payload, tpdb search, movie type, title with ampersand" {
+  run tpdb_search "Fast & Furious" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Fast+%26+Furious&section=movies" ]
+}
+
+@test "ingest metadata payload, tpdb search, show type, title with ampersand" {
+  run tpdb_search "Law & Order" "show"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Law+%26+Order&section=shows" ]
+}
+
+@test "ingest metadata payload, tpdb search, movie type, title with spaces and ampersand" {
+  run tpdb_search "Ice Age: Dawn of the Dinosaurs & More" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Ice+Age:+Dawn+of+the+Dinosaurs+%26+More&section=movies" ]
+}
+
+@test "ingest metadata payload, tpdb search, movie type, empty title" {
+  run tpdb_search "" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=&section=movies" ]
+}
+
+@test "ingest metadata payload, tpdb search, show type, empty title" {
+  run tpdb_search "" "show"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=&section=shows" ]
+}
+
+@test "ingest metadata payload, tpdb search, movie type, title with special characters" {
+  run tpdb_search "Spider-Man: Into the Spider-Verse" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=Spider-Man:+Into+the+Spider-Verse&section=movies" ]
+}
+
+@test "ingest metadata payload, tpdb search, show type, title with numbers" {
+  run tpdb_search "24" "show"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=24&section=shows" ]
+}
+
+@test "ingest metadata payload, tpdb search, movie type, title with parentheses" {
+  run tpdb_search "The Lord of the Rings (2001)" "movie"
+  [ "$status" -eq 0 ]
+  [ "$output" = "https://theposterdb.com/search?term=The+Lord+of+the+Rings+(2001)&section=movies" ]
+}
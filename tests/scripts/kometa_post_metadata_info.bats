@@ -0,0 +1,174 @@
+#!/usr/bin/env bats
+
+load stub_server
+
+dispatch_route="POST /repos/chase-roohms/kometa-configs/dispatches"
+
+function setup() {
+    script="$PWD/scripts/kometa-post-metadata-info.py"
+    tmp_dir="$(mktemp -d)"
+    mkdir -p "$tmp_dir/movies" "$tmp_dir/shows"
+}
+
+function teardown() {
+    if [ -n "$watch_pid" ]; then
+        kill "$watch_pid" 2>/dev/null || true
+        wait "$watch_pid" 2>/dev/null || true
+    fi
+    stop_stub_server
+    rm -rf "$tmp_dir"
+}
+
+# Serve the dispatch endpoint with the responses in $1 (a JSON list)
+function serve_dispatches() {
+    jq -n --arg route "$dispatch_route" --argjson responses "$1" '{($route): $responses}' > "$tmp_dir/routes.json"
+    start_stub_server "$tmp_dir/routes.json"
+}
+
+# Add movie folders 1 to $1 with random titles, so their chunks don't compress away
+function add_movies() {
+    python3 - "$tmp_dir/movies" "$1" <<'PYTHON'
+import os, sys, uuid
+for db_id in range(1, int(sys.argv[2]) + 1):
+    os.mkdir(f"{sys.argv[1]}/Movie {uuid.uuid4().hex} (2001) {{tmdb-{db_id}}}")
+PYTHON
+}
+
+function post_metadata() {
+    python3 "$script" --api-url "$stub_url" --movie-dir "$tmp_dir/movies" --show-dir "$tmp_dir/shows" --state-file "$tmp_dir/state.json"
+}
+
+# Start watching the library with the options in $@, once the catch-up scan is done
+function start_watch() {
+    python3 -u "$script" --api-url "$stub_url" --movie-dir "$tmp_dir/movies" --show-dir "$tmp_dir/shows" --state-file "$tmp_dir/state.json" --watch "$@" > "$tmp_dir/watch.log" 2>&1 &
+    watch_pid=$!
+    wait_for grep -q "Nothing new since the last run" "$tmp_dir/watch.log"
+}
+
+# Wait up to 10 seconds for the command in $@ to succeed
+function wait_for() {
+    for _ in $(seq 100); do
+        "$@" && return 0
+        sleep 0.1
+    done
+    return 1
+}
+
+function dispatch_count() {
+    [ -f "$stub_body_log" ] && wc -l < "$stub_body_log" || echo 0
+}
+
+function dispatched() {
+    [ "$(dispatch_count)" -ge 1 ]
+}
+
+# Post a library of one movie and one show with a season, then forget the dispatch
+function post_library() {
+    mkdir -p "$tmp_dir/movies/Alien (1979) {tmdb-348}" "$tmp_dir/shows/Dark (2017) {tvdb-334824}/Season 01"
+    serve_dispatches '[{"status": 204}]'
+    post_metadata > /dev/null
+    rm "$stub_body_log"
+}
+
+# The new movie and season folders were posted in exactly one dispatch
+function assert_single_dispatch() {
+    wait_for dispatched
+    # A few more seconds, in case a later scan posts them again
+    sleep 2.5
+    [ "$(dispatch_count)" -eq 1 ]
+    [ "$(jq -c '.client_payload.data.movies' "$stub_body_log")" = '[{"title":"Aliens","release_year":"1986","db_id":679}]' ]
+    [ "$(jq -c '.client_payload.data.shows' "$stub_body_log")" = '[{"title":"Dark","release_year":"2017","db_id":334824,"seasons":[{"number":2}]}]' ]
+}
+
+@test "kometa post metadata info, small inventory in a single dispatch" {
+  add_movies 3
+  mkdir -p "$tmp_dir/shows/Dark (2017) {tvdb-334824}/Season 01"
+  serve_dispatches '[{"status": 204}]'
+  run post_metadata
+  [ "$status" -eq 0 ]
+  [ "$(wc -l < "$stub_body_log")" -eq 1 ]
+  [ "$(jq -r '.event_type' "$stub_body_log")" = "metadata_file_update" ]
+  [ "$(jq -c '.client_payload | keys' "$stub_body_log")" = '["data"]' ]
+  [ "$(jq -c '.client_payload.data.movies | map(.db_id) | sort' "$stub_body_log")" = "[1,2,3]" ]
+  [ "$(jq -c '.client_payload.data.shows' "$stub_body_log")" = '[{"title":"Dark","release_year":"2017","db_id":334824,"seasons":[{"number":1}]}]' ]
+}
+
+@test "kometa post metadata info, large inventory split into chunks" {
+  add_movies 5000
+  serve_dispatches '[{"status": 204}]'
+  run post_metadata
+  [ "$status" -eq 0 ]
+  chunks=$(wc -l < "$stub_body_log")
+  [ "$chunks" -gt 1 ]
+  [ "$(grep -c '^Posting chunk' <<< "$output")" -eq "$chunks" ]
+  # Every chunk fits the dispatch limit and belongs to the same batch
+  while read -r body; do
+    [ "$(jq -c '.client_payload' <<< "$body" | wc -c)" -le 60000 ]
+  done < "$stub_body_log"
+  [ "$(jq -r '.client_payload.batch' "$stub_body_log" | sort -u | wc -l)" -eq 1 ]
+  [ "$(jq -r '.client_payload.chunk' "$stub_body_log" | paste -sd,)" = "$(seq -s, 0 $((chunks - 1)))" ]
+  [ "$(jq -r '.client_payload.chunks' "$stub_body_log" | sort -u)" = "$chunks" ]
+  [ "$(jq -r '.client_payload.encoding' "$stub_body_log" | sort -u)" = "gzip+base64" ]
+  # Decode and merge the chunks the way manual-metadata-sync.yml does
+  i=0
+  while read -r body; do
+    jq -r '.client_payload.data' <<< "$body" | base64 -d | gunzip > "$tmp_dir/chunk-$i.json"
+    i=$((i + 1))
+  done < "$stub_body_log"
+  jq -s '{movies: map(.movies[]), shows: map(.shows[])}' $(for ((i = 0; i < chunks; i++)); do echo "$tmp_dir/chunk-$i.json"; done) > "$tmp_dir/merged.json"
+  [ "$(jq '.movies | length' "$tmp_dir/merged.json")" -eq 5000 ]
+  [ "$(jq -c '[.movies[].db_id] | sort == [range(1; 5001)]' "$tmp_dir/merged.json")" = "true" ]
+  [ "$(jq -c '.shows' "$tmp_dir/merged.json")" = "[]" ]
+}
+
+@test "kometa post metadata info, retries server errors" {
+  add_movies 1
+  serve_dispatches '[{"status": 500, "body": {"message": "Server Error"}}, {"status": 204}]'
+  run post_metadata
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"GitHub answered 500, retrying in 2s"* ]]
+  [ "$(wc -l < "$stub_log")" -eq 2 ]
+  [ "$(wc -l < "$stub_body_log")" -eq 2 ]
+  [ -f "$tmp_dir/state.json" ]
+}
+
+@test "kometa post metadata info, waits for Retry-After when rate limited" {
+  add_movies 1
+  serve_dispatches '[{"status": 429, "headers": {"Retry-After": "1"}, "body": {"message": "Rate limited"}}, {"status": 204}]'
+  run post_metadata
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"GitHub answered 429, retrying in 1s"* ]]
+  [ "$(wc -l < "$stub_log")" -eq 2 ]
+  # The retry waited for the second given in Retry-After
+  [ "$(awk 'NR == 1 { first = $1 } NR == 2 { print ($1 - first >= 1) }' "$stub_log")" -eq 1 ]
+}
+
+@test "kometa post metadata info, fails once the retries run out" {
+  add_movies 1
+  serve_dispatches '[{"status": 502, "headers": {"Retry-After": "0"}, "body": {"message": "Bad Gateway"}}]'
+  run post_metadata
+  [ "$status" -eq 1 ]
+  [[ "$output" == *"Something went wrong posting the data to GitHub"* ]]
+  # The first attempt and dispatch_retries (5) retries
+  [ "$(wc -l < "$stub_log")" -eq 6 ]
+  # Nothing is remembered as posted, so the next run sends the movie again
+  [ ! -f "$tmp_dir/state.json" ]
+}
+
+@test "kometa post metadata info, watch by polling posts new folders" {
+  post_library
+  start_watch --poll --poll-interval 1
+  mkdir "$tmp_dir/movies/Aliens (1986) {tmdb-679}" "$tmp_dir/shows/Dark (2017) {tvdb-334824}/Season 02"
+  assert_single_dispatch
+}
+
+@test "kometa post metadata info, watch with inotify posts new folders" {
+  post_library
+  start_watch --debounce 1 --poll-interval 1
+  wait_for grep -q -e "^Watching" -e "^Falling back" "$tmp_dir/watch.log"
+  if grep -q "^Falling back" "$tmp_dir/watch.log"; then
+    skip "inotify isn't available"
+  fi
+  mkdir "$tmp_dir/movies/Aliens (1986) {tmdb-679}" "$tmp_dir/shows/Dark (2017) {tvdb-334824}/Season 02"
+  assert_single_dispatch
+}
@@ -0,0 +1,96 @@
+#!/usr/bin/env bats
+
+load stub_server
+
+function setup() {
+    script="scripts/mass_add_genre.py"
+    tmp_dir="$(mktemp -d)"
+    env_file="$tmp_dir/.env"
+    movie_file="$tmp_dir/movie-metadata.yml"
+    routes_file="$tmp_dir/routes.json"
+    printf 'TMDB_READ_TOKEN=token\nTVDB_TOKEN=key\n' > "$env_file"
+    cat > "$movie_file" <<'YAML'
+metadata:
+  1:
+    label_title: One
+    sort_title: One
+    release_year: '2001'
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=One&section=movies
+    genre.sync: []
+  2:
+    label_title: Two
+    sort_title: Two
+    release_year: '2002'
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=Two&section=movies
+    genre.sync: []
+  3:
+    label_title: Three
+    sort_title: Three
+    release_year: '2003'
+    url_poster: ''
+    tpdb_search: https://theposterdb.com/search?term=Three&section=movies
+    genre.sync:
+      - War
+YAML
+}
+
+function teardown() {
+    stop_stub_server
+    rm -rf "$tmp_dir"
+}
+
+function add_war_genre() {
+    python3 "$script" --genre War --type movie --env-file "$env_file" --movie-file "$movie_file" \
+        --no-cache --workers 1 --tmdb-url "$stub_url/3"
+}
+
+@test "mass add genre, retry after pauses requests and the file is written once" {
+  cat > "$routes_file" <<'JSON'
+{
+  "GET /3/movie/1": [{"status": 429, "headers": {"Retry-After": "2"}, "body": {}},
+                     {"status": 200, "body": {"genres": [{"id": 10752, "name": "War"}]}}],
+  "GET /3/movie/2": [{"status": 200, "body": {"genres": [{"id": 10752, "name": "War"}]}}]
+}
+JSON
+  start_stub_server "$routes_file"
+  run add_war_genre
+  [ "$status" -eq 0 ]
+  [ "$(grep -c '✓ Updated' <<< "$output")" -eq 1 ]
+  [ "$(grep -c 'Adding War to genre.sync' <<< "$output")" -eq 2 ]
+  [ "$(grep -c '^      - War$' "$movie_file")" -eq 3 ]
+  # Every request after the 429 waited for the Retry-After
+  awk 'NR == 1 { paused_until = $1 + 1.9 } NR > 1 && $1 < paused_until { exit 1 }' "$stub_log"
+  [ "$(wc -l < "$stub_log")" -eq 3 ]
+}
+
+@test "mass add genre, responses that aren't objects fail their item only" {
+  cat > "$routes_file" <<'JSON'
+{
+  "GET /3/movie/1": [{"status": 200, "body": ["War"]}],
+  "GET /3/movie/2": [{"status": 200, "body": {"genres": [{"id": 10752, "name": "War"}]}}]
+}
+JSON
+  start_stub_server "$routes_file"
+  run add_war_genre
+  [ "$status" -eq 1 ]
+  grep -q "Error: failed to fetch remote details (TMDb returned JSON that isn't an object)" <<< "$output"
+  grep -q "processed=3, updated=1, skipped=1, errors=1" <<< "$output"
+  [ "$(grep -c '^      - War$' "$movie_file")" -eq 2 ]
+}
+
+@test "mass add genre, null response fails its item only" {
+  cat > "$routes_file" <<'JSON'
+{
+  "GET /3/movie/1": [{"status": 200, "body": null}],
+  "GET /3/movie/2": [{"status": 200, "body": {"genres": "War"}}]
+}
+JSON
+  start_stub_server "$routes_file"
+  run add_war_genre
+  [ "$status" -eq 1 ]
+  grep -q "TMDb returned JSON that isn't an object" <<< "$output"
+  grep -q "TMDb returned genres that aren't a list" <<< "$output"
+  grep -q "processed=3, updated=0, skipped=1, errors=2" <<< "$output"
+}
@@ -0,0 +1,189 @@
+#!/usr/bin/env bats
+
+function setup() {
+    script="$PWD/scripts/metadata_field_index.py"
+    find_field="$PWD/functions/yaml/find-field.sh"
+    find_missing="$PWD/functions/yaml/find-missing.sh"
+    tmp_dir="$(mktemp -d)"
+    cat > "$tmp_dir/movie-metadata.yml" <<'YAML'
+metadata:
+  10:
+    label_title: -Up-
+    sort_title: -Up-
+    release_year: '2009'
+    url_poster: https://example.com/10.jpg
+    genre.sync:
+      - --help
+YAML
+    printf 'metadata:\n' > "$tmp_dir/show-metadata.yml"
+}
+
+function add_library() {
+    cat > "$tmp_dir/movie-metadata.yml" <<'YAML'
+metadata:
+  1:
+    label_title: Alien
+    sort_title: Alien
+    release_year: '1979'
+    url_poster: https://example.com/1.jpg
+    studio: 20th Century Fox
+    genre.sync:
+      - Horror
+      - Science Fiction
+  2:
+    label_title: Aliens
+    sort_title: Aliens
+    release_year: '1986'
+    url_poster: ''
+    studio: null
+    genre.sync: []
+  3:
+    label_title: Heat
+    sort_title: Heat
+    release_year: '1995'
+    url_poster: https://example.com/3.jpg
+    genre.sync:
+      - Crime
+YAML
+    cat > "$tmp_dir/show-metadata.yml" <<'YAML'
+metadata:
+  100:
+    label_title: Dark
+    sort_title: Dark
+    release_year: '2017'
+    url_poster: https://example.com/100.jpg
+    genre.sync:
+      - Science Fiction
+    seasons:
+      1:
+        url_poster: https://example.com/100-1.jpg
+      2:
+        url_poster: ''
+      3:
+  200:
+    label_title: Fargo
+    sort_title: Fargo
+    release_year: '2014'
+    url_poster:
+    genre.sync:
+      - Crime
+    seasons:
+      1:
+        url_poster: https://example.com/200-1.jpg
+YAML
+}
+
+function teardown() {
+    rm -rf "$tmp_dir"
+}
+
+# The index directory is relative to the working directory, keep it in the temp directory
+function in_tmp_dir() {
+    cd "$tmp_dir" && "$@"
+}
+
+@test "metadata field index, find field value starting with a dash" {
+  run in_tmp_dir bash "$find_field" label_title "-Up-" movie movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c 'map(.txdb_id)' <<< "$output")" = "[10]" ]
+}
+
+@test "metadata field index, find field value that looks like an option" {
+  run in_tmp_dir bash "$find_field" genre.sync "--help" movie movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c 'map(.label_title)' <<< "$output")" = '["-Up-"]' ]
+}
+
+@test "metadata field index, find missing key that looks like an option" {
+  run in_tmp_dir bash "$find_missing" "--help" movie movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 1 ]
+  [ "$output" = "Invalid key: help. Allowed keys are: label_title sort_title release_year studio genre.sync url_poster audio_language season_posters" ]
+}
+
+@test "metadata field index, find field" {
+  add_library
+  run in_tmp_dir python3 "$script" find-field release_year 1986 all movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c 'map([.txdb_id, .label_title])' <<< "$output")" = '[[2,"Aliens"]]' ]
+}
+
+@test "metadata field index, find field genre.sync without txdb_id" {
+  add_library
+  run in_tmp_dir python3 "$script" find-field genre.sync "Science Fiction" all movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c 'map(.label_title)' <<< "$output")" = '["Alien","Dark"]' ]
+  [ "$(jq -c 'map(has("txdb_id"))' <<< "$output")" = '[false,false]' ]
+}
+
+@test "metadata field index, find field without matches" {
+  add_library
+  run in_tmp_dir python3 "$script" find-field studio Pixar movie movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$output" = "[]" ]
+}
+
+@test "metadata field index, find missing counts empty, null and missing values" {
+  add_library
+  run in_tmp_dir python3 "$script" find-missing url_poster all movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c '.txdb_id' <<< "$output" | paste -sd,)" = "2,200" ]
+  run in_tmp_dir python3 "$script" find-missing studio movie movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c '.txdb_id' <<< "$output" | paste -sd,)" = "2,3" ]
+  run in_tmp_dir python3 "$script" find-missing genre.sync all movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$(jq -c '.txdb_id' <<< "$output" | paste -sd,)" = "2" ]
+}
+
+@test "metadata field index, find missing season posters" {
+  add_library
+  run in_tmp_dir python3 "$script" find-missing season_posters show movie-metadata.yml show-metadata.yml
+  [ "$status" -eq 0 ]
+  [ "$output" = '{"txdb_id":100,"label_title":"Dark","release_year":"2017","missing_seasons":[2,3]}' ]
+}
+
+@test "metadata field index, limit and offset" {
+  add_library
+  run in_tmp_dir python3 "$script" find-missing url_poster all movie-metadata.yml show-metadata.yml --limit 1 --offset 1
+  [ "$status" -eq 0 ]
+  [ "$(jq -c '.txdb_id' <<< "$output")" = "200" ]
+  run in_tmp_dir python3 "$script" find-field genre.sync Crime all movie-metadata.yml show-metadata.yml --limit 1
+  [ "$status" -eq 0 ]
+  [ "$(jq -c 'map(.label_title)' <<< "$output")" = '["Heat"]' ]
+  run in_tmp_dir python3 "$script" find-field genre.sync Crime all movie-metadata.yml show-metadata.yml --offset 5
+  [ "$status" -eq 0 ]
+  [ "$output" = "[]" ]
+}
+
+@test "metadata field index, negative limit" {
+  run in_tmp_dir python3 "$script" find-missing url_poster all movie-metadata.yml show-metadata.yml --limit -1
+  [ "$status" -eq 2 ]
+  [ "${lines[-1]}" = "metadata_field_index.py: error: --limit and --offset must not be negative" ]
+}
+
+@test "metadata field index, invalid type" {
+  run in_tmp_dir bash -c 'python3 "$0" find-field label_title Alien bogus movie-metadata.yml show-metadata.yml 2> /dev/null' "$script"
+  [ "$status" -eq 1 ]
+  [ "$output" = "Invalid type: bogus. Must be movie, show, or all." ]
+}
+
+@test "metadata field index, invalid key" {
+  run in_tmp_dir bash -c 'python3 "$0" find-field summary Alien all movie-metadata.yml show-metadata.yml 2> /dev/null' "$script"
+  [ "$status" -eq 1 ]
+  [ "$output" = "Invalid key: summary. Allowed keys are: label_title sort_title release_year studio genre.sync url_poster audio_language" ]
+}
+
+@test "metadata field index, season posters of movies" {
+  run in_tmp_dir bash -c 'python3 "$0" find-missing season_posters movie movie-metadata.yml show-metadata.yml 2> /dev/null' "$script"
+  [ "$status" -eq 1 ]
+  [ "$output" = "season_posters key is only valid for shows, not movies." ]
+}
+
+@test "metadata field index, index is rebuilt when the file changes" {
+  run in_tmp_dir python3 "$script" find-field label_title Heat movie movie-metadata.yml show-metadata.yml
+  [ "$output" = "[]" ]
+  add_library
+  run in_tmp_dir python3 "$script" find-field label_title Heat movie movie-metadata.yml show-metadata.yml
+  [ "$(jq -c 'map(.txdb_id)' <<< "$output")" = "[3]" ]
+  [ "$(ls "$tmp_dir/.metadata-index" | grep -c '^movie-metadata.yml-')" -eq 1 ]
+}
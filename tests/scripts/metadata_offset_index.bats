@@ -0,0 +1,77 @@
+#!/usr/bin/env bats
+
+function setup() {
+    script="scripts/metadata_offset_index.py"
+    ingest="scripts/ingest_metadata_payload.py"
+    tmp_dir="$(mktemp -d)"
+    metadata_file="$tmp_dir/show-metadata.yml"
+    payload_file="$tmp_dir/payload.json"
+    printf 'metadata:\n  1:\n    label_title: A\n  2:\n    label_title: B\n' > "$metadata_file"
+}
+
+function teardown() {
+    rm -rf "$tmp_dir"
+}
+
+function add_comment_between_entries() {
+    printf 'metadata:\n  1:\n    label_title: A\n# note\n  2:\n    label_title: B\n' > "$metadata_file"
+}
+
+@test "metadata offset index, has existing entry" {
+  run python3 "$script" has "$metadata_file" 2
+  [ "$status" -eq 0 ]
+}
+
+@test "metadata offset index, has missing entry" {
+  run python3 "$script" has "$metadata_file" 3
+  [ "$status" -eq 1 ]
+}
+
+@test "metadata offset index, get field" {
+  run python3 "$script" get "$metadata_file" 2 label_title
+  [ "$status" -eq 0 ]
+  [ "$output" = "B" ]
+}
+
+@test "metadata offset index, get missing field" {
+  run python3 "$script" get "$metadata_file" 2 url_poster
+  [ "$status" -eq 0 ]
+  [ "$output" = "null" ]
+}
+
+@test "metadata offset index, set field" {
+  run python3 "$script" set "$metadata_file" 1 label_title "A2"
+  [ "$status" -eq 0 ]
+  [ "$(cat "$metadata_file")" = "$(printf 'metadata:\n  1:\n    label_title: A2\n  2:\n    label_title: B')" ]
+}
+
+@test "metadata offset index, set missing entry" {
+  run python3 "$script" set "$metadata_file" 3 label_title "C"
+  [ "$status" -eq 1 ]
+  [ "$output" = "Error: 3 not found in $metadata_file" ]
+}
+
+@test "metadata offset index, has entry after comment" {
+  add_comment_between_entries
+  run python3 "$script" has "$metadata_file" 2
+  [ "$status" -eq 0 ]
+}
+
+@test "metadata offset index, get entry after comment" {
+  add_comment_between_entries
+  run python3 "$script" get "$metadata_file" 2 label_title
+  [ "$status" -eq 0 ]
+  [ "$output" = "B" ]
+}
+
+@test "metadata offset index, ingest existing entry after comment" {
+  add_comment_between_entries
+  echo '{"shows": [{"db_id": 2, "title": "C", "release_year": "2020", "seasons": [{"number": 1}]}]}' > "$payload_file"
+  run python3 "$ingest" "$payload_file" --movie-file "$tmp_dir/none.yml" --show-file "$metadata_file"
+  [ "$status" -eq 0 ]
+  [ "$(grep -c '^  2:' "$metadata_file")" -eq 1 ]
+  run python3 "$script" get "$metadata_file" 2 label_title
+  [ "$output" = "B" ]
+  run python3 "$script" get "$metadata_file" 2 seasons --json
+  [ "$output" = '{"1": {"url_poster": ""}}' ]
+}
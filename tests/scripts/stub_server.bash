@@ -0,0 +1,21 @@
+# Start tests/scripts/stub_server.py with the routes in $1, setting stub_url,
+# stub_pid, stub_log and stub_body_log. Call stop_stub_server in teardown.
+function start_stub_server() {
+    local routes_file="$1"
+    stub_log="$tmp_dir/requests.log"
+    stub_body_log="$tmp_dir/request-bodies.log"
+    python3 "$BATS_TEST_DIRNAME/stub_server.py" "$routes_file" "$tmp_dir/port" "$stub_log" "$stub_body_log" &
+    stub_pid=$!
+    for _ in $(seq 50); do
+        [ -s "$tmp_dir/port" ] && break
+        sleep 0.1
+    done
+    stub_url="http://127.0.0.1:$(cat "$tmp_dir/port")"
+}
+
+function stop_stub_server() {
+    if [ -n "$stub_pid" ]; then
+        kill "$stub_pid" 2>/dev/null || true
+        wait "$stub_pid" 2>/dev/null || true
+    fi
+}
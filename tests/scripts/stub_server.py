@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Serve canned JSON responses to the Python scripts under test.
+
+Usage: stub_server.py <routes.json> <port-file> <request-log> [body-log]
+
+routes.json maps "METHOD /path?query" (or "METHOD /path" for any query
+string) to a list of responses like {"status": 429, "headers":
+{"Retry-After": "1"}, "body": {...}}, which are returned in turn, the last
+one for every later request. Unknown routes get a 404. The server listens
+on a free local port, writes it to port-file once it accepts requests and
+appends a line per request to request-log with the request time, method,
+path and If-None-Match header. Request bodies are appended to body-log, one
+per line, when it is given.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer requests from the routes of the server."""
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        
+        server = self.server
+        with server.lock:
+            key = f"{self.command} {self.path}"
+            if key not in server.routes:
+                key = f"{self.command} {self.path.split('?', 1)[0]}"
+            responses = server.routes.get(key)
+            if responses:
+                count = server.counts.get(key, 0)
+                server.counts[key] = count + 1
+                response = responses[min(count, len(responses) - 1)]
+            else:
+                response = {'status': 404, 'body': {}}
+            with open(server.log_path, 'a', encoding='utf-8') as f:
+                f.write(f"{time.time():.3f} {self.command} {self.path} {self.headers.get('If-None-Match', '-')}\n")
+            if server.body_log_path and body:
+                with open(server.body_log_path, 'a', encoding='utf-8') as f:
+                    f.write(body.decode('utf-8') + '\n')
+        
+        content = b'' if response['status'] in (204, 304) else json.dumps(response.get('body')).encode()
+        self.send_response(response['status'])
+        for name, value in response.get('headers', {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+    
+    do_GET = handle_request
+    do_POST = handle_request
+    do_PUT = handle_request
+
+
+def main():
+    """Main entry point for the script."""
+    routes_path, port_path, log_path = sys.argv[1:4]
+    body_log_path = sys.argv[4] if len(sys.argv) > 4 else None
+    with open(routes_path, 'r', encoding='utf-8') as f:
+        routes = json.load(f)
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.routes = routes
+    server.counts = {}
+    server.lock = threading.Lock()
+    server.log_path = log_path
+    server.body_log_path = body_log_path
+    
+    with open(f"{port_path}.tmp", 'w', encoding='utf-8') as f:
+        f.write(str(server.server_address[1]))
+    os.replace(f"{port_path}.tmp", port_path)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()